@@ -1,6 +1,7 @@
 from pytest import fixture
 from random import choice, sample, randint
 
+from wordle_autosolver.common import encode_response
 from wordle_autosolver.data import load_all_data
 from wordle_autosolver.solver import SessionInfo, solve_wordle
 from wordle_autosolver.auto import open_website, quit_driver
@@ -79,21 +80,16 @@ def random_response():
 @fixture
 def random_saved_best(random_response, sample_words):
     def random_word(): return choice(sample_words)
-    return {random_word(): {random_response: {random_word(): {}}}}
+    return {random_word(): {encode_response(random_response): {
+        random_word(): {}}}}
 
 
 @fixture
-def random_response_data(random_response, sample_words):
-    def random_word(): return choice(sample_words)
-    return {random_word(): {random_word(): random_response}}
-
-
-@fixture
-def random_data(random_saved_best, random_response_data, sample_words):
+def random_data(random_saved_best, sample_words):
     def random_words(amount): return sample(sample_words, amount)
     return (random_words(4), random_words(4), random_words(4),
             dict((word, float(randint(1, 9))) for word in random_words(4)),
-            random_saved_best, random_response_data)
+            random_saved_best)
 
 
 @fixture
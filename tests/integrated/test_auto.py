@@ -1,6 +1,8 @@
+from pytest import raises
+
 import wordle_autosolver.driver as driver
 import wordle_autosolver.auto as auto
-from wordle_autosolver.common import GameMode
+from wordle_autosolver.common import GameMode, encode_response
 from wordle_autosolver.solver import solve_wordle
 
 
@@ -12,6 +14,12 @@ def test_driver(monkeypatch):
     auto.quit_driver()
 
 
+def test_response_code():
+    assert(auto._response_code('O+...', 2) == encode_response('O+...'))
+    with raises(SystemExit):  # a row which was still being revealed
+        auto._response_code('O+', 2)
+
+
 def test_auto_solver__wordle(default_session):
     mode = GameMode()
     (addr, num_boards, _, mode.master, mode.liar,
@@ -1,3 +1,7 @@
+import random
+
+import numpy as np
+
 import wordle_autosolver.common as common
 
 
@@ -221,29 +225,36 @@ def test_master_response__duplicate_letters():
 
 def test_get_response__all_easy():
     assert(common.get_response("ratio", "mucus", use_cache=False)
-           == ".....")
+           == common.encode_response("....."))
     assert(common.get_response("ratio", "macho", use_cache=False)
-           == ".O..O")
+           == common.encode_response(".O..O"))
     assert(common.get_response("amber", "rhyme", use_cache=False)
-           == ".+.++")
+           == common.encode_response(".+.++"))
     assert(common.get_response("hater", "bathe", use_cache=False)
-           == "+OO+.")
+           == common.encode_response("+OO+."))
     assert(common.get_response("added", "diced", use_cache=False)
-           == ".+.OO")
+           == common.encode_response(".+.OO"))
+
+
+def test_get_response__liar():
+    liar = common.GameMode(common.GameMode.LIAR)
+    assert(common.get_response("crown", "crown", liar) == common.ALL_RIGHT)
+    assert(common.get_response("crown", "croon", liar)
+           in common.liar_alternatives(common.get_response("crown", "croon")))
 
 
 def test_get_response__all_master():
     mode = common.GameMode(common.GameMode.MASTER)
     assert(common.get_response("ratio", "mucus", mode, use_cache=False)
-           == ".....")
+           == common.encode_response("....."))
     assert(common.get_response("ratio", "macho", mode, use_cache=False)
-           == "OO...")
+           == common.encode_response("OO..."))
     assert(common.get_response("amber", "rhyme", mode, use_cache=False)
-           == "+++..")
+           == common.encode_response("+++.."))
     assert(common.get_response("hater", "bathe", mode, use_cache=False)
-           == "OO++.")
+           == common.encode_response("OO++."))
     assert(common.get_response("added", "diced", mode, use_cache=False)
-           == "OO+..")
+           == common.encode_response("OO+.."))
 
 
 ###############################################################################
@@ -253,19 +264,19 @@ def test_get_response__all_master():
 
 def test_filter_remaining__easy(example_guess_remaining):
     guess, remaining = example_guess_remaining
-    assert(common.filter_remaining(remaining, guess, "OOOOO",
+    assert(common.filter_remaining(remaining, guess, common.ALL_RIGHT,
                                    use_cache=False) == [guess])
-    response = common._get_easy_response(guess, "heart")
+    response = common.get_response(guess, "heart", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response,
                                    use_cache=False)
            == ['other', 'after', 'water', 'later', 'heart', 'court', 'north',
                'earth'])
-    response = common._get_easy_response(guess, "child")
+    response = common.get_response(guess, "child", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response,
                                    use_cache=False)
            == ['which', 'being', 'while', 'going', 'child', 'voice', 'doing',
                'china'])
-    response = common._get_easy_response(guess, "sound")
+    response = common.get_response(guess, "sound", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response,
                                    use_cache=False)
            == ['house', 'small', 'shall', 'sense', 'close', 'whose', 'shown',
@@ -275,20 +286,20 @@ def test_filter_remaining__easy(example_guess_remaining):
 def test_filter_remaining__master(example_guess_remaining):
     mode = common.GameMode(common.GameMode.MASTER)
     guess, remaining = example_guess_remaining
-    response = common._get_master_response(guess, "heart")
+    response = common.get_response(guess, "heart", mode, use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['other', 'after', 'might', 'state', 'since', 'power', 'water',
                'until', 'later', 'night', 'study', 'light', 'heart', 'least',
                'court', 'space', 'south', 'stood', 'north', 'earth', 'paper',
                'music', 'speak', 'issue', 'stage', 'basic', 'share', 'river'])
-    response = common._get_master_response(guess, "child")
+    response = common.get_response(guess, "child", mode, use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['which', 'being', 'while', 'going', 'order', 'table', 'child',
                'voice', 'taken', 'doing', 'class', 'today', 'total', 'focus',
                'wrong', 'green', 'china', 'happy'])
-    response = common._get_master_response(guess, "sound")
+    response = common.get_response(guess, "sound", mode, use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['about', 'where', 'world', 'never', 'again', 'under', 'place',
@@ -302,7 +313,7 @@ def test_filter_remaining__master(example_guess_remaining):
 def test_filter_remaining__liar(example_guess_remaining):
     mode = common.GameMode(common.GameMode.LIAR)
     guess, remaining = example_guess_remaining
-    response = common._get_easy_response(guess, "heart")
+    response = common.get_response(guess, "heart", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['there', 'about', 'where', 'right', 'world', 'never', 'under',
@@ -310,7 +321,7 @@ def test_filter_remaining__liar(example_guess_remaining):
                'heard', 'front', 'party', 'short', 'clear', 'story', 'major',
                'force', 'start', 'lower', 'mouth', 'range', 'ready', 'floor',
                'round', 'meant'])
-    response = common._get_easy_response(guess, "child")
+    response = common.get_response(guess, "child", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['would', 'could', 'think', 'again', 'found', 'human', 'women',
@@ -319,7 +330,7 @@ def test_filter_remaining__liar(example_guess_remaining):
                'above', 'began', 'local', 'money', 'quite', 'blood', 'leave',
                'field', 'alone', 'maybe', 'bible', 'bring', 'image', 'legal',
                'below', 'media', 'smile', 'final'])
-    response = common._get_easy_response(guess, "sound")
+    response = common.get_response(guess, "sound", use_cache=False)
     assert(common.filter_remaining(remaining, guess, response, mode,
                                    use_cache=False)
            == ['would', 'could', 'these', 'those', 'state', 'found', 'since',
@@ -338,15 +349,15 @@ def test_filter_remaining__liar(example_guess_remaining):
 
 def test_count_remaining__easy(example_guess_remaining):
     guess, remaining = example_guess_remaining
-    response = common._get_easy_response(guess, "heart")
+    response = common.get_response(guess, "heart", use_cache=False)
     assert(common.count_remaining(remaining, guess, response,
                                   use_cache=False)
            == 8)
-    response = common._get_easy_response(guess, "child")
+    response = common.get_response(guess, "child", use_cache=False)
     assert(common.count_remaining(remaining, guess, response,
                                   use_cache=False)
            == 8)
-    response = common._get_easy_response(guess, "sound")
+    response = common.get_response(guess, "sound", use_cache=False)
     assert(common.count_remaining(remaining, guess, response,
                                   use_cache=False)
            == 9)
@@ -355,15 +366,15 @@ def test_count_remaining__easy(example_guess_remaining):
 def test_count_remaining__master(example_guess_remaining):
     mode = common.GameMode(common.GameMode.MASTER)
     guess, remaining = example_guess_remaining
-    response = common._get_master_response(guess, "heart")
+    response = common.get_response(guess, "heart", mode, use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 28)
-    response = common._get_master_response(guess, "child")
+    response = common.get_response(guess, "child", mode, use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 18)
-    response = common._get_master_response(guess, "sound")
+    response = common.get_response(guess, "sound", mode, use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 39)
@@ -372,20 +383,34 @@ def test_count_remaining__master(example_guess_remaining):
 def test_count_remaining__liar(example_guess_remaining):
     mode = common.GameMode(common.GameMode.LIAR)
     guess, remaining = example_guess_remaining
-    response = common._get_easy_response(guess, "heart")
+    response = common.get_response(guess, "heart", use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 30)
-    response = common._get_easy_response(guess, "child")
+    response = common.get_response(guess, "child", use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 39)
-    response = common._get_easy_response(guess, "sound")
+    response = common.get_response(guess, "sound", use_cache=False)
     assert(common.count_remaining(remaining, guess, response, mode,
                                   use_cache=False)
            == 44)
 
 
+def test_get_partition_sizes(example_guess_remaining, small_sample_words):
+    _, remaining = example_guess_remaining
+    sizes = common.get_partition_sizes(small_sample_words, remaining,
+                                       use_cache=False)
+    assert(sizes.shape == (len(small_sample_words), common.NUM_RESPONSES))
+    assert((sizes.sum(axis=1) == len(remaining)).all())
+    for guess, row in zip(small_sample_words[::5], sizes[::5]):
+        for answer in remaining[::11]:
+            response = common.get_response(guess, answer, use_cache=False)
+            assert(row[response]
+                   == common.count_remaining(remaining, guess, response,
+                                             use_cache=False))
+
+
 ###############################################################################
 #                              TEST BEST GUESSES                              #
 ###############################################################################
@@ -445,6 +470,109 @@ def test_best_guess__return_all():
     assert(worst_case['croup'] == 3)
 
 
+def test_best_guess__bounded(monkeypatch, sample_words):
+    monkeypatch.setattr(common, '_RANKED_GUESSES', 8)
+    monkeypatch.setattr(common, '_RANKED_BATCH', 4)
+    monkeypatch.setattr(common, '_ANSWER_BLOCK', 5)
+    for answers in (sample_words[::2], sample_words[3:20], sample_words[:2]):
+        sizes = common.get_partition_sizes(sample_words, answers,
+                                           use_cache=False)
+        worst = sizes.max(axis=1)
+        expected = set(w for w, x in zip(sample_words, worst)
+                       if x == worst.min())
+        if len(expected & set(answers)) > 0:
+            expected &= set(answers)
+        assert(set(common.best_guesses(answers, sample_words,
+                                       use_cache=False)) == expected)
+        limit = int(worst.min()) + 1
+        assert(common.best_guesses(answers, sample_words, max_limit=limit,
+                                   return_all=True, use_cache=False)
+               == dict((w, min(int(x), limit + 1))
+                       for w, x in zip(sample_words, worst)))
+
+
+def test_best_guess__no_answers():
+    guesses = ['crane', 'slate']
+    assert(sorted(common.best_guesses([], guesses, use_cache=False))
+           == guesses)
+    assert(common.best_guesses([], guesses, common.GameMode(
+        common.GameMode.MASTER), return_all=True, use_cache=False)
+           == {'crane': 0, 'slate': 0})
+
+
+def test_useful_guesses(small_sample_words):
+    answers = ['crown', 'croup', 'crony', 'croon']
+    useful = common.useful_guesses(small_sample_words, answers, use_cache=False)
+    assert(set(answers) & set(small_sample_words) <= set(useful))
+    assert(len(useful) < len(small_sample_words))
+    for guess in set(small_sample_words) - set(useful):
+        assert(common.count_remaining(
+            answers, guess, common.get_response(guess, answers[0],
+                                                use_cache=False),
+            use_cache=False) == len(answers))
+    assert(set(common.best_guesses(answers, useful, use_cache=False))
+           == set(common.best_guesses(answers, small_sample_words,
+                                      use_cache=False)))
+    assert(common.useful_guesses(small_sample_words, answers[:1])
+           == small_sample_words)
+    liar = common.GameMode(common.GameMode.LIAR)
+    assert(common.useful_guesses(small_sample_words, answers, liar)
+           == small_sample_words)
+
+
+def test_lower_bound():
+    assert(common._lower_bound(0, common.GameMode()) == 1)
+    assert(common._lower_bound(243, common.GameMode()) == 1)
+    assert(common._lower_bound(244, common.GameMode()) == 2)
+    assert(common._lower_bound(41, common.GameMode(common.GameMode.MASTER))
+           == 3)
+
+
+def test_rank_guesses():
+    order = common._rank_guesses(['fuzzy', 'tears', 'mamma', 'rates'],
+                                 ['tears', 'rates', 'stare', 'aster'])
+    assert(set(order[:2].tolist()) == set([1, 3]))
+    assert(order[-1] == 0)
+
+
+def test_best_guess__workers(monkeypatch, sample_words):
+    monkeypatch.setattr(common, '_MIN_PARALLEL_GUESSES', 1)
+    common.set_response_matrix(common.ResponseMatrix(sample_words,
+                                                     sample_words))
+    for answers in (sample_words[::2], sample_words[5:12]):
+        assert(set(common.best_guesses(answers, sample_words, workers=2))
+               == set(common.best_guesses(answers, sample_words)))
+        assert(common.best_guesses(answers, sample_words, return_all=True,
+                                   workers=2)
+               == common.best_guesses(answers, sample_words,
+                                      return_all=True))
+    matrix = common.get_response_matrix()
+    list(common.map_workers(common.raise_shared_bound, [5], 2, bound=-3))
+    common.best_guesses(sample_words[::2], sample_words, workers=2)
+    assert(common._get_pool(2, matrix)[2].value == 5)  # kept apart
+    common._close_pool()
+    common.set_response_matrix()
+
+
+def _context_task(index):
+    return common.worker_context()[index]
+
+
+def test_map_workers__context(sample_words):
+    common.set_response_matrix(common.ResponseMatrix(sample_words,
+                                                     sample_words))
+    assert(common.worker_context() is None)
+    context = ('a', 'b', 'c')
+    assert(list(common.map_workers(_context_task, [2, 0, 1], 2,
+                                   context=context)) == ['c', 'a', 'b'])
+    pool = common._get_pool(2, common.get_response_matrix(), context)[0]
+    assert(common._get_pool(2, common.get_response_matrix())[0] is pool)
+    assert(list(common.map_workers(_context_task, [0], 2,
+                                   context=('d',))) == ['d'])
+    common._close_pool()
+    common.set_response_matrix()
+
+
 ###############################################################################
 #                            TEST AVERAGE GUESSES                             #
 ###############################################################################
@@ -510,10 +638,10 @@ def test_rec_build_best_tree__simple(default_guesses):
     assert(common.rec_build_best_tree(answers, default_guesses, 'crown',
                                       depth=1, show=False)
            == {'crown': {
-                'OOO..': {'croup': {}},
-                'OOO.+': {'crony': {}},
-                'OOOOO': {'crown': {}},
-                'OOO.O': {'croon': {}}
+                common.encode_response('OOO..'): {'croup': {}},
+                common.encode_response('OOO.+'): {'crony': {}},
+                common.encode_response('OOOOO'): {'crown': {}},
+                common.encode_response('OOO.O'): {'croon': {}}
                 }})
 
 
@@ -530,10 +658,91 @@ def test_rec_build_best_tree__good(small_sample_words, default_guesses):
            != {})
 
 
+def test_rec_build_best_tree__table(small_sample_words, default_guesses):
+    table = {}
+    tree = common.rec_build_best_tree(small_sample_words, default_guesses,
+                                      'roate', depth=2, show=False,
+                                      table=table)
+    assert(len(table) > 0)
+    assert(all(depth == 1 for _, depth in table.keys()))
+    for response, subtree in tree['roate'].items():
+        remaining = common.filter_remaining(small_sample_words, 'roate',
+                                            response)
+        if len(remaining) > 1:
+            assert(table[(common.fingerprint(remaining), 1)] is subtree)
+    # the same table returns the same tree without searching again
+    table = dict((key, {'xxxxx': {}} if len(value) > 0 else value)
+                 for key, value in table.items())
+    reused = common.rec_build_best_tree(small_sample_words, default_guesses,
+                                        'roate', depth=2, show=False,
+                                        table=table)
+    assert(any(subtree == {'xxxxx': {}}
+               for subtree in reused['roate'].values()))
+
+
+def test_deepen_best_tree(small_sample_words, default_guesses):
+    table = {}
+    results = list(common.deepen_best_tree(small_sample_words,
+                                           default_guesses, 'roate',
+                                           min_depth=1, show=False,
+                                           table=table))
+    assert([depth for depth, _, _ in results] == [1, 2])
+    assert(results[0][1] == {})
+    assert(results[1][1] == common.rec_build_best_tree(
+        small_sample_words, default_guesses, 'roate', depth=2, show=False))
+    assert(all(seconds >= 0 for _, _, seconds in results))
+    # a tree found with less depth is reused for any greater depth
+    assert(common.rec_build_best_tree(small_sample_words, default_guesses,
+                                      'roate', depth=3, show=False,
+                                      table=table)
+           == results[1][1])
+    assert([(depth, tree) for depth, tree, _ in common.deepen_best_tree(
+        small_sample_words, default_guesses, 'fuzzy', max_depth=2, show=False
+    )] == [(2, {})])
+
+
+def test_rec_build_best_tree__workers(small_sample_words, default_guesses):
+    common.set_response_matrix(common.ResponseMatrix(default_guesses,
+                                                     small_sample_words))
+    for depth in (1, 2):
+        table = {}
+        assert(common.rec_build_best_tree(small_sample_words, default_guesses,
+                                          'roate', depth=depth, show=False,
+                                          table=table, workers=2)
+               == common.rec_build_best_tree(small_sample_words,
+                                             default_guesses, 'roate',
+                                             depth=depth, show=False))
+    assert(len(table) > 0)
+    table, serial_table = {}, {}
+    assert(common.rec_build_best_tree(small_sample_words, default_guesses,
+                                      'fuzzy', depth=3, show=False,
+                                      table=table, workers=2)
+           == common.rec_build_best_tree(small_sample_words, default_guesses,
+                                         'fuzzy', depth=3, show=False,
+                                         table=serial_table))
+    assert(table == serial_table)  # entries found by the workers are kept
+    assert(any(depth < 2 for _, depth in table))
+    assert(common.rec_build_best_tree(small_sample_words, default_guesses,
+                                      'fuzzy', depth=2, show=False,
+                                      workers=2)
+           == {})
+    common._close_pool()
+    common.set_response_matrix()
+
+
 ###############################################################################
 #                            TEST MISCELLANEOUS                               #
 ###############################################################################
 
+def test_workers():
+    common.set_workers(4)
+    assert(common.get_workers() == 4)
+    common.set_workers(0)
+    assert(common.get_workers() == 1)
+    common.set_workers()
+    assert(common.get_workers() == 1)
+
+
 def test_best_guess_updated():
     common.set_best_guess_updated()
     assert(common.get_best_guess_updated() is True)
@@ -541,30 +750,322 @@ def test_best_guess_updated():
     assert(common.get_best_guess_updated() is False)
 
 
-def test_response_data_updated():
-    common.set_response_data_updated()
-    assert(common.get_response_data_updated() is True)
-    common.set_response_data_updated(False)
-    assert(common.get_response_data_updated() is False)
-
-
-def test_response_data():
-    response_data = {'alert': {'olive': '.O+..'}}
-    common.set_response_data(response_data)
-    assert(common.get_response_data()['alert']['olive'] == '.O+..')
+def test_encode_and_decode_response():
+    assert(common.encode_response('.....') == 0)
+    assert(common.encode_response('OOOOO') == common.ALL_RIGHT)
+    assert(common.encode_response('XXXXX') is None)
+    for code in range(common.NUM_RESPONSES):
+        assert(common.encode_response(common.decode_response(code)) == code)
+
+
+def test_liar_alternatives():
+    code = common.encode_response('O+.O+')
+    alternatives = common.liar_alternatives(code)
+    assert(len(alternatives) == 10)
+    assert(common.encode_response('++.O+') in alternatives)
+    assert(common.encode_response('O+.OO') in alternatives)
+    assert(code not in alternatives)
+    assert([common.decode_response(alt) for alt in alternatives] == [
+        '++.O+', '.+.O+', 'OO.O+', 'O..O+', 'O+OO+', 'O++O+', 'O+.++',
+        'O+..+', 'O+.OO', 'O+.O.'
+    ])  # the same order as the original string-based search
+    for alt in alternatives:
+        assert(sum(a != b for a, b in zip(common.decode_response(alt),
+                                          common.decode_response(code))) == 1)
+
+
+def test_liar_scores(small_sample_words):
+    liar = common.GameMode(common.GameMode.LIAR)
+    codes = common.get_response_codes(small_sample_words[:8],
+                                      small_sample_words, liar)
+    rng = np.random.default_rng(0)
+    scores = common._liar_scores(codes, np.random.default_rng(0))
+    picks = rng.integers(0, 10, size=codes.shape)
+    for row, pick, score in zip(codes, picks, scores):
+        for code, index, count in zip(row, pick, score):
+            lie = common.liar_alternatives(int(code))[index]
+            assert(count == sum(sum(a != b for a, b in zip(
+                common.decode_response(lie), common.decode_response(other)))
+                == 1 for other in row.tolist()))
+
+
+def test_best_guess__liar(small_sample_words):
+    liar = common.GameMode(common.GameMode.LIAR)
+    random.seed(5)
+    worst = common.best_guesses(small_sample_words, mode=liar,
+                                return_all=True)
+    random.seed(5)
+    assert(common.best_guesses(small_sample_words, mode=liar,
+                               return_all=True) == worst)
+    random.seed(5)
+    best = common.best_guesses(small_sample_words, mode=liar)
+    assert(sorted(best) == sorted(guess for guess, count in worst.items()
+                                  if count == min(worst.values())))
+    average = common.best_avg_guesses(small_sample_words, mode=liar,
+                                      return_all=True)
+    assert(all(0 < value <= len(small_sample_words)
+               for value in average.values()))
+
+
+def test_count_liar_alternatives(small_sample_words):
+    liar = common.GameMode(common.GameMode.LIAR)
+    for guess in small_sample_words[:5]:
+        response = common.get_response(guess, small_sample_words[-1])
+        counts = common.count_liar_alternatives(small_sample_words, guess,
+                                                response)
+        assert(counts.tolist() == [
+            common.count_remaining(small_sample_words, guess, alt, liar)
+            for alt in common.liar_alternatives(response)])
+
+
+def test_response_matrix(sample_words):
+    matrix = common.ResponseMatrix(sample_words[:40], sample_words)
+    assert(matrix.nbytes == len(matrix.guesses) * len(sample_words))
+    for guess in sample_words[::7]:
+        for answer in sample_words:
+            code = matrix.code(guess, answer)
+            assert(common.decode_response(code)
+                   == common._get_easy_response(guess, answer))
+    assert(matrix.code('ratio', 'mucus') is None)
+    assert(matrix.lookup(['ratio'], sample_words) is None)
+
+
+def test_response_matrix__master(sample_words):
+    matrix = common.ResponseMatrix(sample_words, sample_words, master=True)
+    block = matrix.lookup(sample_words[::9], sample_words[::2])
+    assert(block.max() < common.NUM_MASTER_CODES)
+    for row, guess in zip(block, sample_words[::9]):
+        for code, answer in zip(row, sample_words[::2]):
+            assert(common.decode_response(common._MASTER_TO_CODE[code])
+                   == common._get_master_response(guess, answer))
+
+
+def test_master_codes():
+    assert(common.NUM_MASTER_CODES == 21)
+    for code in range(common.NUM_MASTER_CODES):
+        response = common.decode_response(common._MASTER_TO_CODE[code])
+        assert(common._master_code(common.encode_response(response)) == code)
+    assert(common._master_code(common.encode_response('.O+.O'))
+           == common._master_code(common.encode_response('OO+..')))
+    assert(len(set(common._CODE_TO_MASTER.tolist()))
+           == common.NUM_MASTER_CODES)
+
+
+def test_partition_sizes__master(sample_words):
+    mode = common.GameMode(common.GameMode.MASTER)
+    common.set_response_matrix(common.ResponseMatrix(sample_words,
+                                                     sample_words, True))
+    try:
+        sizes = common.get_partition_sizes(sample_words[:20], sample_words,
+                                           mode)
+        assert(sizes.shape == (20, common.NUM_MASTER_CODES))
+        for guess, row in zip(sample_words[:20], sizes):
+            for code in range(common.NUM_MASTER_CODES):
+                response = int(common._MASTER_TO_CODE[code])
+                assert(row[code] == common.count_remaining(
+                    sample_words, guess, response, mode, use_cache=False))
+        answers = common.AnswerSet.from_words(common.get_response_matrix(),
+                                              sample_words[::3])
+        response = common.get_response('roate', sample_words[0], mode)
+        assert(list(common.filter_remaining(answers, 'roate', response, mode))
+               == common.filter_remaining(list(answers), 'roate', response,
+                                          mode, use_cache=False))
+    finally:
+        common.set_response_matrix()
+
+
+def test_response_matrix__get_response(sample_words):
+    common.set_response_matrix(common.ResponseMatrix(sample_words,
+                                                     sample_words))
+    assert(common.get_response_matrix() is not None)
+    assert(common.get_response('trips', 'heart')
+           == common.encode_response('++...'))
+    assert(common.get_response('ratio', 'mucus') == 0)
+    codes = common.get_response_codes(['trips', 'heart'], sample_words)
+    assert(codes.shape == (2, len(sample_words)))
+    common.set_response_matrix()
+    assert(common.get_response_matrix() is None)
+
+
+def test_answer_set(sample_words):
+    matrix = common.ResponseMatrix(sample_words, sample_words)
+    answers = common.AnswerSet.from_words(matrix, sample_words[::3])
+    assert(list(answers) == sample_words[::3])
+    assert(len(answers) == len(sample_words[::3]))
+    assert(answers[1] == sample_words[3])
+    assert(answers[-2:] == sample_words[::3][-2:])
+    assert(sample_words[3] in answers)
+    assert(sample_words[1] not in answers)
+    assert('mucus' not in answers)
+    assert(common.AnswerSet.from_words(matrix, ['mucus']) is None)
+    assert(common.AnswerSet.from_words(None, sample_words) is None)
+
+
+def test_answer_set__filter_and_count(sample_words):
+    matrix = common.ResponseMatrix(sample_words, sample_words)
+    answers = common.AnswerSet.from_words(matrix, sample_words)
+    liar = common.GameMode(common.GameMode.LIAR)
+    for guess, answer in zip(sample_words[::5], sample_words[::-7]):
+        for mode in (common.GameMode(), liar):
+            response = common.get_response(guess, answer, use_cache=False)
+            expected = common.filter_remaining(sample_words, guess, response,
+                                               mode, use_cache=False)
+            result = common.filter_remaining(answers, guess, response, mode)
+            assert(isinstance(result, common.AnswerSet))
+            assert(list(result) == expected)
+            assert(common.count_remaining(answers, guess, response, mode)
+                   == len(expected))
+    # guesses which are not in the matrix are calculated directly
+    response = common.get_response('ratio', sample_words[0], use_cache=False)
+    assert(list(common.filter_remaining(answers, 'ratio', response))
+           == common.filter_remaining(sample_words, 'ratio', response,
+                                      use_cache=False))
+    assert(list(common.filter_remaining(answers, sample_words[4],
+                                        common.ALL_RIGHT))
+           == [sample_words[4]])
+
+
+def test_guess_cache():
+    cache = common.GuessCache(2)
+    mode = common.GameMode()
+    key = cache.key(['crown', 'croon'], ['croup'], mode)
+    play = common.GameMode(common.GameMode.PLAY_DEFAULT)
+    assert(key == common.GuessCache.key(['crown', 'croon'], ['croup'], play))
+    assert(key != cache.key(['crown', 'croon'], ['croup'],
+                            common.GameMode(common.GameMode.HARD)))
+    assert(key != cache.key(['crown', 'croon'], ['croup'], mode, 'average'))
+    assert(key != cache.key(['crown'], ['croon', 'croup'], mode))
+    assert(cache.get(key) is None)
+    cache.put(key, ['croup'])
+    cache.put('b', ['b'])
+    assert(cache.get(key) == ['croup'])
+    cache.put('c', ['c'])  # 'b' is now the least recently used entry
+    assert(cache.get('b') is None)
+    assert(list(cache.entries().keys()) == [key, 'c'])
+    assert(cache.hits == 1 and cache.misses == 2)
+    cache.get('c').append('d')
+    assert(cache.get('c') == ['c'])
+    old = common.GuessCache(4, {'a': ['a'], 'b': {'b': 1}})
+    assert(list(old.entries()) == ['a'])
+
+
+def test_cached_best_guesses(small_sample_words):
+    answers = ['crown', 'croup', 'crony', 'croon']
+    common.set_guess_cache(common.GuessCache())
+    expected = set(common.best_guesses(answers, small_sample_words,
+                                       use_cache=False))
+    calls = []
+
+    def refine():
+        calls.append(1)
+        return small_sample_words
+    for _ in range(3):
+        assert(set(common.cached_best_guesses(answers, small_sample_words,
+                                              refine=refine)) == expected)
+    assert(len(calls) == 1)
+    assert(common.get_guess_cache().hits == 2)
+    assert(common.cached_best_guesses(answers, small_sample_words,
+                                      strategy='average', return_all=True)
+           == common.best_avg_guesses(answers, small_sample_words,
+                                      return_all=True))
+    assert(len(common.get_guess_cache()) == 1)  # scores are never cached
+    worst = common.best_guesses(answers, small_sample_words, return_all=True)
+    ranked = sorted(small_sample_words, key=lambda x: worst[x])[:8]
+    for _ in range(2):
+        assert(common.cached_best_guesses(answers, small_sample_words,
+                                          ranked=8) == ranked)
+    assert(len(common.get_guess_cache()) == 2)
+    assert(common.get_guess_cache().hits == 3)
+    common.set_guess_cache()
+    assert(common.get_guess_cache() is None)
 
 
 def test_colored_response():
-    assert(common.colored_response('trips', 'O.+O.')
+    assert(common.colored_response('trips', common.encode_response('O.+O.'))
            == ("\x1b[38;5;102m\x1b[48;5;30mT\x1b[0m"
                "R"
                "\x1b[38;5;103m\x1b[48;5;30mI\x1b[0m"
                "\x1b[38;5;102m\x1b[48;5;30mP\x1b[0m"
                "S"))
-    assert(common.colored_response('trips', 'OO+..',
+    assert(common.colored_response('trips', common.encode_response('OO+..'),
                                    common.GameMode(common.GameMode.MASTER))
            == ("\x1b[38;5;102m\x1b[48;5;30mO\x1b[0m"
                "\x1b[38;5;102m\x1b[48;5;30mO\x1b[0m"
                "\x1b[38;5;103m\x1b[48;5;30m+\x1b[0m"
                "."
                "."))
+
+
+def test_packed_tree():
+    tree = {'crane': {0: {'fuzzy': {242: {}}}, 5: {}},
+            'slate': {242: {}}}
+    packed = common.PackedTree.from_dict(tree)
+    assert(len(packed) == 5)
+    assert(packed.to_dict() == tree)
+    assert(packed.guesses() == ['crane', 'slate'])
+    assert(packed.branches(0, 'crane') == {0: 1, 5: 2})
+    assert(packed.branches(0, 'fuzzy') == {})
+    assert(packed.guesses(packed.descend(0, 'crane', 0)) == ['fuzzy'])
+    assert(packed.descend(0, 'crane', 242) == -1)
+    assert(packed.descend(0, 'audio', 0) == -1)
+    view = packed.view()
+    assert(len(view) == 2 and 'slate' in view and 'fuzzy' not in view)
+    assert(list(view) == ['crane', 'slate'])
+    assert(sorted(view['crane']) == [0, 5])
+    assert(packed.to_dict(view.descend('crane', 0).node)
+           == {'fuzzy': {242: {}}})
+    assert(view.descend('slate', 0) is None)
+    assert(common.PackedTree.from_dict({}).to_dict() == {})
+
+
+def test_descend_tree():
+    tree = {'crane': {0: {'fuzzy': {}}}}
+    subtree, updated = common.descend_tree(tree, 'crane', 0)
+    assert(subtree == {'fuzzy': {}} and not updated)
+    subtree, updated = common.descend_tree(tree, 'crane', 5)
+    assert(subtree == {} and updated and tree['crane'][5] is subtree)
+    subtree, updated = common.descend_tree(tree, 'slate', 1)
+    assert(updated and tree['slate'] == {1: {}})
+    view = common.PackedTree.from_dict(tree).view()
+    subtree, updated = common.descend_tree(view, 'crane', 0)
+    assert(list(subtree) == ['fuzzy'] and not updated)
+    assert(common.descend_tree(view, 'audio', 0) == ({}, False))
+
+
+def test_lazy_tree():
+    tree = {'crane': {0: {'fuzzy': {242: {}}}, 5: {}}}
+    lazy = common.LazyTree(common.PackedTree.from_dict(tree))
+    assert(len(lazy) == 1 and list(lazy) == ['crane'])
+    assert(lazy._guesses == {})  # nothing is read until it is needed
+    assert(lazy == tree and 'crane' in lazy)
+    subtree, updated = common.descend_tree(lazy, 'crane', 0)
+    assert(list(subtree) == ['fuzzy'] and not updated)
+    assert(list(lazy._guesses) == ['crane'])
+    subtree, updated = lazy.descend('crane', 5)
+    assert(not updated)
+    subtree, updated = subtree.descend('slate', 242)
+    assert(updated and subtree == {})
+    lazy['audio'] = {1: {'pious': {}}}
+    assert(list(lazy) == ['crane', 'audio'])
+    assert(lazy.log == [('crane', 5, 'slate', 242), ('audio',),
+                        ('audio', 1), ('audio', 1, 'pious')])
+    assert(lazy == {'crane': {0: {'fuzzy': {242: {}}},
+                              5: {'slate': {242: {}}}},
+                    'audio': {1: {'pious': {}}}})
+    assert(common.LazyTree() == {})
+
+
+def test_progress_bar():
+    bar = common.progress_bar(range(3), disable=True)
+    assert(list(bar) == [0, 1, 2])
+    with common.progress_bar(total=3, disable=True) as progress:
+        progress.update(3)
+    common.set_show_progress(False)
+    try:
+        assert(isinstance(common.progress_bar(range(3)),
+                          common._NoProgress))
+    finally:
+        common.set_show_progress()
+    bar = common.progress_bar(range(3), leave=False)
+    assert(not isinstance(bar, common._NoProgress))
+    bar.close()
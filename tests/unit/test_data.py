@@ -1,4 +1,12 @@
+import os
+import json
+from pytest import raises
+
+import numpy as np
+
 import wordle_autosolver.data as data
+from wordle_autosolver.common import ResponseMatrix, encode_response
+from wordle_autosolver.common import GameMode, rec_build_best_tree
 
 
 def test_format_bytes():
@@ -14,58 +22,253 @@ def test_format_bytes():
 def test_save_and_load__easy(random_data):
     data.save_all_data(False, False, False,
                        True, random_data[4],
-                       True, random_data[5],
                        False)
     loaded_data = data.load_all_data(False, False, False, False)
     assert(loaded_data[4] == random_data[4])
-    assert(loaded_data[5] == random_data[5])
 
 
 def test_save_and_load__hard(random_data):
     data.save_all_data(True, False, False,
                        True, random_data[4],
-                       True, random_data[5],
                        False)
     loaded_data = data.load_all_data(True, False, False, False)
     assert(loaded_data[4] == random_data[4])
-    assert(loaded_data[5] == random_data[5])
 
 
 def test_save_and_load__master(random_data):
     data.save_all_data(False, True, False,
                        True, random_data[4],
-                       True, random_data[5],
                        False)
     loaded_data = data.load_all_data(False, True, False, False)
     assert(loaded_data[4] == random_data[4])
-    assert(loaded_data[5] == random_data[5])
 
 
 def test_save_and_load__liar(random_data):
     data.save_all_data(False, False, True,
                        True, random_data[4],
-                       True, random_data[5],
                        False)
     loaded_data = data.load_all_data(False, False, True, False)
     assert(loaded_data[4] == random_data[4])
-    assert(loaded_data[5] == random_data[5])
 
 
 def test_save_and_load__nyt(random_data):
     data.save_all_data(False, False, False,
                        True, random_data[4],
-                       True, random_data[5],
                        True)
     loaded_data = data.load_all_data(False, False, False, True)
     assert(loaded_data[4] == random_data[4])
-    assert(loaded_data[5] == random_data[5])
+
+
+def test_tree_json_conversion():
+    tree = {'crown': {'OOO..': {'croup': {}}, 'OOOOO': {'crown': {}}}}
+    decoded = data.tree_from_json(tree)
+    assert(decoded == {'crown': {encode_response('OOO..'): {'croup': {}},
+                                 encode_response('OOOOO'): {'crown': {}}}})
+    assert(data.tree_to_json(decoded) == tree)
+
+
+def test_load__response_matrix():
+    answers, guesses, _, _, _, matrix = data.load_all_data(
+        False, True, False, False, False)
+    assert(isinstance(matrix, ResponseMatrix))
+    assert(matrix.master)
+    assert(matrix.answers == answers)
+    assert(set(matrix.guesses) == set(guesses) | set(answers))
+
+
+def test_load_response_matrix(monkeypatch, tmp_path, sample_words):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    path = str(tmp_path) + '/responses.bin'
+    matrix = data.load_response_matrix(sample_words, sample_words[:50],
+                                       allow_print=False)
+    assert(isinstance(matrix.data, np.memmap))
+    assert(matrix.complete)
+    assert(os.path.getsize(path)
+           == data.MATRIX_OFFSET + len(sample_words) * 50)
+    for guess in sample_words[::13]:
+        for answer in sample_words[:50:7]:
+            assert(matrix.code(guess, answer) is not None)
+            assert(matrix.data[matrix.guess_ids[guess],
+                               matrix.answer_ids[answer]]
+                   == ResponseMatrix([guess], [answer]).lookup(
+                       [guess], [answer])[0, 0])
+    header = data._read_matrix_header(path)
+    assert(header[:3] == (data.MATRIX_MAGIC, data.MATRIX_VERSION, 0))
+    # reopening with the same word lists reuses the existing file
+    os.utime(path, (0, 0))
+    data.load_response_matrix(sample_words, sample_words[:50],
+                              allow_print=False)
+    assert(os.path.getmtime(path) == 0)
+    # changing the word lists rebuilds the file
+    matrix = data.load_response_matrix(sample_words, sample_words[:60],
+                                       allow_print=False)
+    assert(os.path.getmtime(path) != 0)
+    assert(data._read_matrix_header(path)[-1] == 60)
+    assert(len(matrix.answers) == 60)
+
+
+def test_load_response_matrix__master(monkeypatch, tmp_path, sample_words):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    matrix = data.load_response_matrix(sample_words, sample_words, True,
+                                       allow_print=False)
+    assert(os.path.exists(str(tmp_path) + '/responses_master.bin'))
+    assert(data._read_matrix_header(str(tmp_path) + '/responses_master.bin'
+                                    )[2] == 1)
+    assert(matrix.master)
+
+
+def test_word_pack(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    sources = {'freq': {'crane': 0.5, 'slate': 0.25, 'zzzzz': 1e-9},
+               'guesses': ['slate', 'crane', 'trace'],
+               'nordle': ['crane'], 'curated': ['trace', 'crane'],
+               'nyt': ['slate']}
+    for name, filename in data.PACK_SOURCES.items():
+        with open(str(tmp_path) + '/' + filename, 'w') as file:
+            json.dump(sources[name], file)
+    pack = data.load_word_pack(allow_print=False)
+    assert(os.path.exists(str(tmp_path) + '/' + data.PACK_FILE))
+    assert(pack['words'].tolist() == [b'crane', b'slate', b'zzzzz', b'trace'])
+    assert(pack['freq'].dtype == np.float32)
+    assert(np.allclose(pack['freq'], [0.5, 0.25, 1e-9]))
+    for name in list(data.PACK_SOURCES)[1:]:
+        assert([pack['words'][i].decode() for i in pack[name]]
+               == sources[name])
+    # a newer source file rebuilds the pack
+    with open(str(tmp_path) + '/nyt_answers.json', 'w') as file:
+        json.dump(['crane', 'trace'], file)
+    os.utime(str(tmp_path) + '/' + data.PACK_FILE, (0, 0))
+    pack = data.load_word_pack(allow_print=False)
+    assert(pack['nyt'].tolist() == [0, 3])
+
+
+def test_load_all_data__word_lists():
+    answers, guesses, nordle, freq, _, _ = data.load_all_data(
+        False, False, False, allow_print=False)
+    with open(data.DATA_PATH + 'allowed_guesses.json', 'r') as file:
+        assert(guesses == json.load(file))
+    with open(data.DATA_PATH + 'allowed_nordle.json', 'r') as file:
+        assert(nordle == json.load(file))
+    with open(data.DATA_PATH + 'curated_answers.json', 'r') as file:
+        assert(answers == json.load(file))
+    with open(data.DATA_PATH + 'freq_map.json', 'r') as file:
+        expected = json.load(file)
+    assert(list(freq) == list(expected))
+    assert(all(np.isclose(freq[w], expected[w], rtol=1e-6) for w in freq))
+
+
+def test_load_and_save_guess_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    cache = data.load_guess_cache(8, persist=True)
+    assert(len(cache) == 0)
+    cache.put('a', ['crown', 'croon'])
+    cache.put('b', ['crony'])
+    data.save_guess_cache(cache, allow_print=False)
+    assert(os.path.exists(str(tmp_path) + '/' + data.GUESS_CACHE_FILE))
+    loaded = data.load_guess_cache(8, persist=True)
+    assert(loaded.entries() == cache.entries())
+    assert(not loaded.updated)
+    assert(len(data.load_guess_cache(8)) == 0)
+    assert(len(data.load_guess_cache(1, persist=True)) == 1)
+
+
+def test_save_and_load_packed_tree(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    json_tree = {'crane': {'.....': {'fuzzy': {'OOOOO': {}}}, '..+..': {}},
+                 'slate': {'OOOOO': {}}}
+    packed = data.packed_tree_from_json(json_tree)
+    assert(data.packed_tree_to_json(packed) == json_tree)
+    data.save_packed_tree(packed, 'test.tree')
+    loaded = data.load_packed_tree('test.tree')
+    assert(isinstance(loaded.codes, np.memmap))
+    assert(data.packed_tree_to_json(loaded) == json_tree)
+    assert(loaded.descend(0, 'crane', encode_response('..+..')) == 2)
+    assert(data.load_packed_tree('missing.tree') is None)
+    with open(str(tmp_path) + '/bad.tree', 'wb') as file:
+        file.write(b'not a tree')
+    assert(data.load_packed_tree('bad.tree') is None)
+
+
+def test_load_and_save_saved_tree(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    with open(str(tmp_path) + '/best.json', 'w') as file:
+        file.write('{"crane": {".....": {"fuzzy": {}}}}')
+    tree = data.load_saved_tree('best.json')
+    assert(os.path.exists(str(tmp_path) + '/best.tree'))
+    assert(tree == {'crane': {0: {'fuzzy': {}}}})
+    tree['slate'] = {}
+    tree.descend('crane', 0)[0].descend('fuzzy', 242)
+    data.save_saved_tree(tree, 'best.json', allow_print=False)
+    with open(str(tmp_path) + '/best.delta', 'r') as file:
+        assert(file.read() == '["slate"]\n["crane", ".....", "fuzzy", '
+                              '"OOOOO"]\n')
+    size = os.path.getsize(str(tmp_path) + '/best.delta')
+    loaded = data.load_saved_tree('best.json')
+    assert(loaded == tree and loaded.saved == 2)
+    data.save_saved_tree(loaded, 'best.json', allow_print=False)
+    assert(os.path.getsize(str(tmp_path) + '/best.delta') == size)
+    monkeypatch.setattr(data, 'MAX_TREE_DELTAS', 2)
+    loaded['audio'] = {}
+    data.save_saved_tree(loaded, 'best.json', allow_print=False)
+    assert(not os.path.exists(str(tmp_path) + '/best.delta'))
+    assert(not os.path.exists(str(tmp_path) + '/best.tree'))
+    assert(data.load_saved_tree('best.json') == loaded)
+
+
+def test_tree_journal(monkeypatch, tmp_path):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    words = ['crown', 'croon', 'clown']
+    journal = data.open_tree_journal('crown', words, words, GameMode())
+    journal.interval = 3600
+    subtree = {'croon': {encode_response('.....'): {}}}
+    journal[('abc', 2)] = subtree
+    journal[('def', 1)] = {}
+    path = str(tmp_path) + '/crown_0.journal'
+    with open(path, 'r') as file:
+        assert(len(file.read().split('\n')) == 2)  # header only
+    journal.close()
+    resumed = data.open_tree_journal('crown', words, words, GameMode(),
+                                     resume=True)
+    assert(resumed == {('abc', 2): subtree, ('def', 1): {}})
+    with open(path, 'a') as file:
+        file.write('{"answers": "ghi", "dep')  # interrupted while writing
+    resumed = data.open_tree_journal('crown', words, words, GameMode(),
+                                     resume=True)
+    assert(len(resumed) == 2)
+    resumed[('ghi', 1)] = {}
+    resumed.close()  # must not be joined to the cut-off line
+    assert(len(data.open_tree_journal('crown', words, words, GameMode(),
+                                      resume=True)) == 3)
+    other = data.open_tree_journal('crown', words, words,
+                                   GameMode(GameMode.HARD), resume=True)
+    assert(len(other) == 0)
+    assert(len(data.open_tree_journal('crown', words, words, GameMode(),
+                                      resume=True)) == 3)
+    assert(len(data.open_tree_journal('crown', words[:2], words,
+                                      GameMode(), resume=True)) == 0)
+    assert(len(data.open_tree_journal('crown', words, words, GameMode(),
+                                      resume=True)) == 0)
+
+
+def test_tree_journal__build(monkeypatch, tmp_path, small_sample_words):
+    monkeypatch.setattr(data, 'DATA_PATH', str(tmp_path) + '/')
+    words = small_sample_words
+    journal = data.open_tree_journal('crown', words, words, GameMode())
+    tree = rec_build_best_tree(words, words, 'crown', GameMode(), 3,
+                               show=False, table=journal)
+    journal.close()
+    assert(len(tree) > 0 and len(journal) > 0)
+    with raises(FileExistsError):  # never silently overwrite saved subtrees
+        data.open_tree_journal('crown', words, words, GameMode())
+    resumed = data.open_tree_journal('crown', words, words, GameMode(),
+                                     resume=True)
+    assert(resumed == journal)
+    assert(rec_build_best_tree(words, words, 'crown', GameMode(), 3,
+                               show=False, table=resumed) == tree)
 
 
 def test_clean_all_data(random_data):
-    _, _, _, _, saved_best, response_data = random_data
-    data.save_all_data(False, False, False,
-                       True, saved_best,
-                       True, response_data,
-                       False)
+    _, _, _, _, saved_best = random_data
+    data.save_all_data(False, False, False, True, saved_best, False)
     assert(data.clean_all_data())
     assert(not data.clean_all_data())
@@ -0,0 +1,19 @@
+import os
+import sys
+import json
+import subprocess
+
+
+def test_import__lazy():
+    script = ('import sys, json\n'
+              'import wordle_autosolver.driver\n'
+              'print(json.dumps(["selenium" in sys.modules,\n'
+              '                  "tqdm" in sys.modules]))\n')
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.run([sys.executable, '-c', script], cwd=root, env=env,
+                            capture_output=True, text=True, check=True)
+    selenium, tqdm = json.loads(output.stdout.splitlines()[-1])
+    assert(not selenium)
+    assert(not tqdm)
@@ -1,8 +1,13 @@
 from pytest import raises
+import random
 from io import StringIO
+from json import loads
 
 import wordle_autosolver.solver as solver
-from wordle_autosolver.common import GameMode
+from wordle_autosolver.common import GameMode, encode_response
+from wordle_autosolver.common import ResponseMatrix, AnswerSet
+from wordle_autosolver.common import set_response_matrix, get_response
+from wordle_autosolver.common import count_remaining, liar_alternatives
 
 
 def test_session_info_to_str(default_session):
@@ -30,6 +35,24 @@ def test_session_info_to_str(default_session):
 ###############################################################################
 
 
+def test_get_worst_liar_response(small_sample_words):
+    liar = GameMode(GameMode.LIAR)
+    for answer in small_sample_words[:8]:
+        response = solver.get_worst_liar_response('roate', answer,
+                                                  small_sample_words)
+        counts = [count_remaining(small_sample_words, 'roate', alt, liar)
+                  for alt in liar_alternatives(get_response('roate', answer))]
+        assert(response in liar_alternatives(get_response('roate', answer)))
+        assert(count_remaining(small_sample_words, 'roate', response, liar)
+               == max(counts))
+        assert(response == liar_alternatives(get_response(
+            'roate', answer))[counts.index(max(counts))])  # first on ties
+    assert(solver.get_worst_liar_response('crown', 'crown', small_sample_words)
+           == encode_response('OOOOO'))
+    with raises(ValueError):  # every lie rules out the only remaining answer
+        solver.get_worst_liar_response('roate', 'fuzzy', ['roate'])
+
+
 def test_simulated_guess(default_session):
     for guess in default_session.guesses:
         default_session.actual_best = guess
@@ -37,16 +60,18 @@ def test_simulated_guess(default_session):
 
 
 def test_simulated_response__easy(default_session):
-    solver.simulated_answers = ['flour']
+    default_session.simulated = ['flour']
     default_session.entered = ['flare']
-    assert(solver.simulated_response(default_session) == [('OO.+.', 0)])
+    assert(solver.simulated_response(default_session)
+           == [(encode_response('OO.+.'), 0)])
 
 
 def test_simulated_response__master(default_session):
-    solver.simulated_answers = ['flour']
+    default_session.simulated = ['flour']
     default_session.entered = ['fluke']
     default_session.mode = GameMode(GameMode.MASTER)
-    assert(solver.simulated_response(default_session) == [('OO+..', 0)])
+    assert(solver.simulated_response(default_session)
+           == [(encode_response('OO+..'), 0)])
 
 
 ###############################################################################
@@ -86,7 +111,7 @@ def test_manual_response__easy(monkeypatch, default_session):
     monkeypatch.setattr('sys.stdin', input_string)
     default_session.entered = ['hater']
     response = next(solver.manual_response(default_session))
-    assert(response == ('+OO+.', 0))
+    assert(response == (encode_response('+OO+.'), 0))
 
 
 def test_manual_response__master(monkeypatch, default_session):
@@ -95,7 +120,7 @@ def test_manual_response__master(monkeypatch, default_session):
     default_session.mode = GameMode(GameMode.MASTER)
     default_session.entered = ['swarm']
     response = next(solver.manual_response(default_session))
-    assert(response == ('OO++.', 0))
+    assert(response == (encode_response('OO++.'), 0))
 
 
 def test_manual_response__invalid_input(monkeypatch, default_session):
@@ -103,7 +128,7 @@ def test_manual_response__invalid_input(monkeypatch, default_session):
     monkeypatch.setattr('sys.stdin', input_string)
     default_session.entered = ['crazy']
     response = next(solver.manual_response(default_session))
-    assert(response == ('.....', 0))
+    assert(response == (encode_response('.....'), 0))
 
 
 ###############################################################################
@@ -114,14 +139,14 @@ def test_manual_response__invalid_input(monkeypatch, default_session):
 def test_solve_wordle__bad_response(micro_session):
     micro_session.entered = ['false', 'guess']
     with raises(SystemExit) as e:
-        solver._parse_response('XXXXX', 0, solver.simulated_response,
-                               micro_session, True)
+        solver._parse_response(encode_response('OOOO+'), 0,
+                               solver.simulated_response, micro_session, True)
     assert(e.type == SystemExit)
-    assert(e.value.code == 'ERROR: BAD RESPONSE ON BOARD 1: XXXXX')
+    assert(e.value.code == 'ERROR: BAD RESPONSE ON BOARD 1: OOOO+')
 
 
 def test_solve_wordle__easy(tiny_session):
-    solver.simulated_answers = ['value']
+    tiny_session.simulated = ['value']
     result = solver.solve_wordle(
         tiny_session,
         solver.simulated_guess,
@@ -130,24 +155,42 @@ def test_solve_wordle__easy(tiny_session):
     )
     assert(result.solved == ['value'])
     assert(result.entered == ['roate', 'value'])
+    assert(len(result.candidates[0]) < len(result.guesses))
 
 
 def test_solve_wordle__hard(medium_session):
-    solver.simulated_answers = ['short']
     result = solver.solve_wordle(
-        medium_session.copy(mode=GameMode(GameMode.HARD)),
+        medium_session.copy(mode=GameMode(GameMode.HARD),
+                            simulated=['short']),
+        solver.simulated_guess,
+        solver.simulated_response,
+        True
+    )
+    assert(result.solved == ['short'])
+    assert(result.entered == ['roate', 'front', 'short'])
+
+
+def test_solve_wordle__answer_set(medium_session):
+    set_response_matrix(ResponseMatrix(medium_session.guesses,
+                                       medium_session.answers))
+    session = medium_session.copy(mode=GameMode(GameMode.HARD))
+    assert(isinstance(session.remaining[0], AnswerSet))
+    session.simulated = ['short']
+    result = solver.solve_wordle(
+        session,
         solver.simulated_guess,
         solver.simulated_response,
         True
     )
+    set_response_matrix()
     assert(result.solved == ['short'])
     assert(result.entered == ['roate', 'front', 'short'])
 
 
 def test_solve_wordle__simulate_multi(medium_session):
-    solver.simulated_answers = ["water", "light", "white", "class"]
     result = solver.solve_wordle(
-        medium_session.copy(num_boards=4),
+        medium_session.copy(num_boards=4,
+                            simulated=["water", "light", "white", "class"]),
         solver.simulated_guess,
         solver.simulated_response,
         True
@@ -157,12 +200,24 @@ def test_solve_wordle__simulate_multi(medium_session):
                               'black', 'class'])
 
 
+def test_solve_wordle__liar(mini_session):
+    session = mini_session.copy(mode=GameMode(GameMode.LIAR))
+    for answer in session.answers:
+        result = solver.solve_wordle(session.copy(simulated=[answer]),
+                                     solver.simulated_guess,
+                                     solver.simulated_response)
+        assert(result.solved == [answer])
+        assert(result.entered[-1] == answer)
+        assert(len(set(result.entered)) == len(result.entered))
+
+
 def test_solve_wordle__play_multi(monkeypatch, small_session):
-    solver.simulated_answers = ["water", "light", "white", "black", "value"]
     input_str = StringIO('roate\nflung\nwater\nlight\nwhite\nblack\nvalue\n')
     monkeypatch.setattr('sys.stdin', input_str)
     result = solver.solve_wordle(
-        small_session.copy(num_boards=5, mode=GameMode(GameMode.PLAY_DEFAULT)),
+        small_session.copy(num_boards=5, mode=GameMode(GameMode.PLAY_DEFAULT),
+                           simulated=["water", "light", "white", "black",
+                                      "value"]),
         solver.manual_guess,
         solver.simulated_response,
         True
@@ -177,6 +232,35 @@ def test_solve_wordle__play_multi(monkeypatch, small_session):
 ###############################################################################
 
 
+def test_worst_cases(small_sample_words):
+    answers = ['crown', 'croup', 'crony', 'croon']
+    worst = solver._worst_cases(small_sample_words, answers, GameMode())
+    for guess, count in zip(small_sample_words, worst.tolist()):
+        assert(count == max(count_remaining(answers, guess,
+                                            get_response(guess, answer))
+                            for answer in answers))
+
+
+def test_generate_games(small_sample_words):
+    chunks = list(solver.generate_games(small_sample_words, 2, chunk_size=100))
+    assert([len(chunk) for chunk in chunks] == [100] * 7 + [80])
+    games = [tuple(game) for chunk in chunks for game in chunk]
+    assert(len(set(games)) == 780)
+    single = [game for chunk in solver.generate_games(['aback', 'fuzzy'])
+              for game in chunk]
+    assert(single == [['fuzzy'], ['aback']])  # worst answers go first
+    sampled = list(solver.generate_games(small_sample_words, 3, 50, seed=7,
+                                         chunk_size=16))
+    assert([len(chunk) for chunk in sampled] == [16, 16, 16, 2])
+    games = [game for chunk in sampled for game in chunk]
+    assert(len(set(tuple(sorted(game)) for game in games)) == 50)
+    assert(sampled == list(solver.generate_games(small_sample_words, 3, 50,
+                                                 seed=7, chunk_size=16)))
+    games = [game for chunk in solver.generate_games(
+        small_sample_words, 2, 40, seed=1, stratified=True) for game in chunk]
+    assert(sorted(game[0] for game in games) == sorted(small_sample_words))
+
+
 def test_simulate__one_game(mini_session):
     avg, worst = solver.simulate(mini_session)
     assert(round(avg, 2) == 3.94)
@@ -210,6 +294,23 @@ def test_simulate__less_than_max__multi(mini_session):
     assert(worst >= 3)
 
 
+def test_simulate__liar(medium_session):
+    session = medium_session.copy(mode=GameMode(GameMode.LIAR))
+    avg, worst = solver.simulate(session, 24, seed=1)
+    assert(worst > -8)  # every game reached its answer
+    assert(avg > worst)
+
+
+def test_simulate__random_state(medium_session):
+    sessions = [medium_session.copy(starters=[], saved_best={})
+                for _ in range(2)]
+    random.seed(2)
+    state = random.getstate()
+    first = solver.simulate(sessions[0], 8, seed=4, show=False)
+    assert(random.getstate() == state)  # the caller's random state is kept
+    assert(solver.simulate(sessions[1], 8, seed=4, show=False) == first)
+
+
 def test_simulate__failure(medium_session):
     _, worst = solver.simulate(medium_session.copy(starters=[
         'these', 'seven', 'words', 'prove', 'fails', 'still', 'occur'
@@ -222,5 +323,84 @@ def test_simulate__return_early(medium_session):
     avg, worst = solver.simulate(medium_session.copy(starters=[
         'these', 'seven', 'words', 'prove', 'fails', 'still', 'occur'
     ]), best=BEST, return_if_worse=True)
-    assert(avg < BEST)
+    assert(avg is None)  # pruned, so no average is known
     assert(worst < BEST)
+
+
+def test_simulate__workers(capsys, micro_session, medium_session):
+    set_response_matrix(ResponseMatrix(medium_session.guesses,
+                                       medium_session.answers))
+    session = micro_session.copy(num_boards=2)
+    serial = solver.simulate(session, 20, seed=3, workers=1)
+    serial_out = capsys.readouterr().out
+    parallel = solver.simulate(session, 20, seed=3, workers=2)
+    parallel_out = capsys.readouterr().out
+    _, worst = solver.simulate(medium_session.copy(starters=[
+        'these', 'seven', 'words', 'prove', 'fails', 'still', 'occur'
+    ]), best=2, return_if_worse=True, show=False, workers=2)
+    set_response_matrix()
+    assert(serial == parallel)
+    assert(serial_out == parallel_out)
+    assert('SCORE | COUNT' in serial_out)
+    assert(worst < 2)
+
+
+def test_sweep_starters(tmp_path, micro_session):
+    set_response_matrix(ResponseMatrix(micro_session.guesses,
+                                       micro_session.answers))
+    starters = ['roate', 'fuzzy', 'heart', 'slate', 'jazzy', 'model']
+    path = str(tmp_path) + '/sweep.jsonl'
+    serial = solver.sweep_starters(micro_session, starters, workers=1,
+                                   show=False)
+    parallel = solver.sweep_starters(micro_session, starters, workers=2,
+                                     results_path=path, show=False)
+    set_response_matrix()
+    assert(serial == parallel)
+    assert(serial == (4, ['slate']))
+    with open(path, 'r') as file:
+        results = [loads(line) for line in file][1:]  # skip the header
+    assert([result['starter'] for result in results] == starters)
+    assert(max(result['worst'] for result in results) == serial[0])
+    for result in results:  # pruned starters record no partial statistics
+        assert(result.get('pruned', False) == ('average' not in result))
+        assert(not result.get('pruned', False) or result['worst'] < serial[0])
+
+
+def test_sweep_starters__pruned(tmp_path, micro_session):
+    path = str(tmp_path) + '/sweep.jsonl'
+    best = solver.sweep_starters(micro_session, ['slate', 'fuzzy'], workers=1,
+                                 results_path=path, show=False)
+    with open(path, 'r') as file:
+        results = [loads(line) for line in file][1:]  # skip the header
+    assert(best == (4, ['slate']))
+    assert(results[1] == {'starter': 'fuzzy', 'worst': results[1]['worst'],
+                          'pruned': True})
+    resumed = solver.sweep_starters(micro_session, ['slate', 'fuzzy'],
+                                    workers=1, results_path=path, resume=True,
+                                    show=False)
+    assert(resumed == best)
+
+
+def test_sweep_starters__resume(tmp_path, micro_session):
+    starters = ['roate', 'fuzzy', 'slate', 'jazzy']
+    path = str(tmp_path) + '/sweep.jsonl'
+    full = solver.sweep_starters(micro_session, starters, workers=1,
+                                 results_path=path, show=False)
+    with open(path, 'r') as file:
+        lines = file.read().split('\n')
+    assert(loads(lines[1])['starter'] == 'roate')
+    assert(loads(lines[1])['failures'] == [])
+    with open(path, 'w') as file:  # interrupted while saving 'jazzy'
+        file.write('\n'.join(lines[:4]) + '\n' + lines[4][:10])
+    resumed = solver.sweep_starters(micro_session, starters, workers=1,
+                                    results_path=path, resume=True,
+                                    show=False)
+    assert(resumed == full)
+    with open(path, 'r') as file:
+        assert(file.read() == '\n'.join(lines))
+    fresh = solver.sweep_starters(micro_session.copy(num_boards=2),
+                                  starters[:1], workers=1, results_path=path,
+                                  resume=True, show=False)
+    with open(path, 'r') as file:
+        assert(len(file.read().split('\n')) == 3)  # header and one starter
+    assert(fresh[1] == ['roate'])
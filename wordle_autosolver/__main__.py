@@ -1,3 +1,4 @@
 from driver import main  # pragma: no cover
 
-main()  # pragma: no cover
+if __name__ == '__main__':  # pragma: no cover
+    main()  # worker processes may import this module again
@@ -3,17 +3,19 @@ import time
 from math import ceil, log2
 from typing import Optional
 
-from tqdm import tqdm
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
 try:  # pragma: no cover
     from common import RIGHT, CLOSE, WRONG, PROGRESS, GameMode, IS_MS_OS
+    from common import ALL_RIGHT, encode_response, progress_bar
     from solver import SessionInfo
 except ModuleNotFoundError:  # this is only here to help pytest find the module
     from wordle_autosolver.common import RIGHT, CLOSE, WRONG, PROGRESS
     from wordle_autosolver.common import GameMode, IS_MS_OS
+    from wordle_autosolver.common import ALL_RIGHT, encode_response
+    from wordle_autosolver.common import progress_bar
     from wordle_autosolver.solver import SessionInfo
 
 
@@ -248,6 +250,17 @@ def auto_read_fibble_start() -> str:
 ###############################################################################
 
 
+def _response_code(response: str, board: int) -> int:
+    """Converts a response read from the website to its response code, and
+    stops with an error if it is not a complete response (such as a row that
+    was still being revealed)."""
+    code = encode_response(response)
+    if code is None:
+        exit('ERROR: COULD NOT READ RESPONSE ON BOARD {}: "{}"'
+             .format(board + 1, response))
+    return code
+
+
 def auto_guess_default(session: SessionInfo) -> str:
     """Enters `best` into the webpage and ignores all other arguments.
 
@@ -266,7 +279,7 @@ def auto_guess_default(session: SessionInfo) -> str:
     return session.actual_best
 
 
-def auto_response_default(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_default(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the current webpage.
 
     This is the default `auto_response` function. Currently used on the
@@ -278,15 +291,16 @@ def auto_response_default(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     responses = []
     boards = list(_driver.find_element(by=By.ID,
                                        value="box-holder-{}".format(n + 1))
                   for n in range(len(session.remaining)))
-    for board in tqdm(session.expected, ascii=PROGRESS, leave=False):
+    for board in progress_bar(session.expected, ascii=PROGRESS,
+                              leave=False):
         response = ''
         for row in boards[board].find_elements(by=By.TAG_NAME, value="tr"):
             if guess.upper() in ''.join(x.text for x in
@@ -301,7 +315,7 @@ def auto_response_default(session: SessionInfo) -> list[tuple[str, int]]:
                     else:
                         response += WRONG
                 break
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
@@ -351,7 +365,7 @@ def auto_guess_wordzy(session: SessionInfo) -> str:
     return session.actual_best
 
 
-def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_wordzy(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Wordzy website.
 
     Args:
@@ -360,8 +374,8 @@ def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     # check if game has ended
@@ -373,7 +387,7 @@ def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
         for button in stage.find_elements(by=By.TAG_NAME, value='button'):
             if (button.get_attribute('color') == 'green' and
                     'play_arrow' in button.text):
-                return [(''.join([RIGHT for _ in guess]), session.expected[0])]
+                return [(ALL_RIGHT, session.expected[0])]
     # if not, find the elements necessary to read each board's response
     responses = []
     focus_key = None
@@ -396,7 +410,8 @@ def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
                 focus_key = button
                 break
     # read the response on each board that is still expected to exist
-    for board in tqdm(session.expected, ascii=PROGRESS, leave=False):
+    for board in progress_bar(session.expected, ascii=PROGRESS,
+                              leave=False):
         validate_wordzy_game(n_games, session.mode.endless)
         # find the most recent response
         while not (focus_key.text.split()[-1]).isnumeric():
@@ -414,7 +429,7 @@ def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
         if f'grid{board}' not in focused.find_element(
             By.CLASS_NAME, 'cdk-virtual-scroll-viewport'
         ).get_attribute('class') and guess in session.remaining[board]:
-            responses.append((''.join(RIGHT for _ in guess), board))
+            responses.append((ALL_RIGHT, board))
             continue
         stuck = False
         response = ''
@@ -445,11 +460,11 @@ def auto_response_wordzy(session: SessionInfo) -> list[tuple[str, int]]:
             stuck = True
         focus_key.click()
         time.sleep(0.125)
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_wordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_wordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Wordle website.
 
     Args:
@@ -458,8 +473,8 @@ def auto_response_wordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     response = ''
     time.sleep(1)
@@ -477,10 +492,10 @@ def auto_response_wordle(session: SessionInfo) -> list[tuple[str, int]]:
             response += CLOSE
         elif evaluation == 'correct':
             response += RIGHT
-    return [(response, 0)]
+    return [(_response_code(response, 0), 0)]
 
 
-def auto_response_dordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_dordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Dordle website.
 
     Args:
@@ -489,8 +504,8 @@ def auto_response_dordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     game = _driver.find_element(by=By.XPATH, value='//*[@id="game"]')
@@ -511,11 +526,11 @@ def auto_response_dordle(session: SessionInfo) -> list[tuple[str, int]]:
                     else:
                         response += WRONG
                 break
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_quordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_quordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Quordle website.
 
     Args:
@@ -524,8 +539,8 @@ def auto_response_quordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     responses = []
@@ -546,11 +561,11 @@ def auto_response_quordle(session: SessionInfo) -> list[tuple[str, int]]:
                     else:
                         response += CLOSE
                 break
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_octordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_octordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Quordle website.
 
     Args:
@@ -559,8 +574,8 @@ def auto_response_octordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     responses = []
     for board in session.expected:
@@ -577,11 +592,11 @@ def auto_response_octordle(session: SessionInfo) -> list[tuple[str, int]]:
                 response += CLOSE
             else:
                 response += WRONG
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_duotrigordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_duotrigordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Duotrigordle website.
 
     Args:
@@ -590,12 +605,13 @@ def auto_response_duotrigordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     responses = []
     boards = list(_driver.find_elements(by=By.CLASS_NAME, value="board"))
-    for board in tqdm(session.expected, ascii=PROGRESS, leave=False):
+    for board in progress_bar(session.expected, ascii=PROGRESS,
+                              leave=False):
         response = ''
         cells = boards[board].find_elements(by=By.CLASS_NAME, value="cell")
         index = (len(session.entered) - 1) * 5
@@ -607,11 +623,11 @@ def auto_response_duotrigordle(session: SessionInfo) -> list[tuple[str, int]]:
                 response += CLOSE
             else:
                 response += WRONG
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_64ordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_64ordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the 64ordle website.
 
     Args:
@@ -620,15 +636,16 @@ def auto_response_64ordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     responses = []
     boards = list(_driver.find_element(by=By.ID,
                                        value="box-holder-{}".format(n + 1))
                   for n in range(len(session.remaining)))
-    for board in tqdm(session.expected, ascii=PROGRESS, leave=False):
+    for board in progress_bar(session.expected, ascii=PROGRESS,
+                              leave=False):
         response = ''
         for row in boards[board].find_elements(by=By.TAG_NAME, value="tr"):
             if guess.upper() in ''.join(x.text for x in
@@ -643,11 +660,11 @@ def auto_response_64ordle(session: SessionInfo) -> list[tuple[str, int]]:
                     else:
                         response += WRONG
                 break
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_nordle(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_nordle(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Nordle website.
 
     Args:
@@ -656,14 +673,15 @@ def auto_response_nordle(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     game = _driver.find_element(by=By.ID, value='words')
     columns = list(game.find_elements(by=By.CLASS_NAME, value='column'))
     responses = []
-    for board in tqdm(session.expected, ascii=PROGRESS, leave=False):
+    for board in progress_bar(session.expected, ascii=PROGRESS,
+                              leave=False):
         response = ''
         for row in columns[board].find_elements(By.CLASS_NAME, 'guess'):
             word = ''.join(cell.text[0] for cell in
@@ -677,11 +695,11 @@ def auto_response_nordle(session: SessionInfo) -> list[tuple[str, int]]:
                     else:
                         response += WRONG
                 break
-        responses.append((response, board))
+        responses.append((_response_code(response, board), board))
     return responses
 
 
-def auto_response_fibble(session: SessionInfo) -> list[tuple[str, int]]:
+def auto_response_fibble(session: SessionInfo) -> list[tuple[int, int]]:
     """Finds and returns the expected response(s) on the Fibble website.
 
     Args:
@@ -690,8 +708,8 @@ def auto_response_fibble(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     response = ''
     row = _driver.find_elements(by=By.CLASS_NAME, value='Row')[
@@ -705,7 +723,7 @@ def auto_response_fibble(session: SessionInfo) -> list[tuple[str, int]]:
             response += CLOSE
         else:
             response += WRONG
-    return [(response, 0)]
+    return [(_response_code(response, 0), 0)]
 
 
 SITE_INFO: dict[str, tuple] = {
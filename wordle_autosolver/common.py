@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import os
-from typing import Union, Optional
-from random import choice
+import time
+import atexit
+from copy import copy
+from hashlib import sha256
+import multiprocessing
+from multiprocessing import shared_memory
+from collections import OrderedDict, deque
+from collections.abc import Sequence, Mapping
+from typing import Callable, Iterator, Union, Optional
+from random import choice, getrandbits, Random
 
-from tqdm import tqdm
+import numpy as np
 
 
 RIGHT: str = 'O'
@@ -12,15 +20,50 @@ CLOSE: str = '+'
 WRONG: str = '.'
 IS_MS_OS: bool = os.name == 'nt'
 PROGRESS: Optional[str] = '__...:::!!|' if IS_MS_OS else None
-SYM_ALTS: dict[str, list[str]] = {
-    RIGHT: [CLOSE, WRONG],
-    CLOSE: [RIGHT, WRONG],
-    WRONG: [RIGHT, CLOSE]
-}
-
-_response_data: dict = {}
-_response_data_updated: bool = False
+NUM_RESPONSES: int = 3 ** 5  # each response is stored as a base-3 code
+ALL_RIGHT: int = NUM_RESPONSES - 1
+_SYMBOLS: tuple[str, str, str] = (WRONG, CLOSE, RIGHT)
+_PLACE_VALUES: np.ndarray = np.array([81, 27, 9, 3, 1], dtype=np.uint8)
+_CODE_DIGITS: np.ndarray = (np.arange(NUM_RESPONSES)[:, None]
+                            // _PLACE_VALUES % 3).astype(np.uint8)
+_CODE_TO_STR: list[str] = [''.join(_SYMBOLS[d] for d in digits)
+                           for digits in _CODE_DIGITS]
+_STR_TO_CODE: dict[str, int] = dict((s, c) for c, s in enumerate(_CODE_TO_STR))
+_MASTER_PAIRS: list[tuple[int, int]] = [(r, c) for r in range(6)
+                                        for c in range(6 - r)]
+NUM_MASTER_CODES: int = len(_MASTER_PAIRS)  # one per count of RIGHT and CLOSE
+_MASTER_IDS: np.ndarray = np.zeros((6, 6), dtype=np.uint8)
+_MASTER_IDS[tuple(np.array(_MASTER_PAIRS).T)] = np.arange(NUM_MASTER_CODES)
+_MASTER_TO_CODE: np.ndarray = np.array([
+    _STR_TO_CODE[(RIGHT * r + CLOSE * c + WRONG * 5)[:5]]
+    for r, c in _MASTER_PAIRS
+], dtype=np.uint8)
+_CODE_TO_MASTER: np.ndarray = _MASTER_IDS[(_CODE_DIGITS == 2).sum(axis=1),
+                                          (_CODE_DIGITS == 1).sum(axis=1)]
+_MASTER_RESPONSES: int = 20  # 4 RIGHT and 1 CLOSE is the only impossible pair
+_LIAR_NEIGHBORS: np.ndarray = np.array([  # codes which differ by one symbol
+    [code + (alt - digit) * int(place)  # lies are tried as RIGHT, CLOSE, WRONG
+     for place, digit in zip(_PLACE_VALUES, digits) for alt in (2, 1, 0)
+     if alt != digit] for code, digits in enumerate(_CODE_DIGITS.tolist())
+], dtype=np.uint8)
+_LIAR_MATCHES: np.ndarray = np.zeros((NUM_RESPONSES, NUM_RESPONSES),
+                                     dtype=bool)
+_LIAR_MATCHES[np.arange(NUM_RESPONSES)[:, None], _LIAR_NEIGHBORS] = True
+
+_response_matrix: Optional[ResponseMatrix] = None
 _best_guess_updated: bool = False
+_workers: int = 1
+_show_progress: bool = True
+_guess_cache: Optional[GuessCache] = None
+_pool: Optional[tuple] = None  # (key, pool, max_limit, bound, cancel, context)
+_worker_limit = None  # the shared max_limit of `best_guesses` in a worker
+_worker_bound = None  # the bound shared by `map_workers` tasks in a worker
+_worker_cancel = None  # set inside a worker process once its work is useless
+_worker_context = None  # the context given to `map_workers` in a worker
+_MIN_PARALLEL_GUESSES: int = 512  # fewer guesses are faster to score serially
+_RANKED_GUESSES: int = 256  # best-ranked guesses scored first to set the bound
+_RANKED_BATCH: int = 64
+_ANSWER_BLOCK: int = 512  # answers added to the partial counts at a time
 
 if IS_MS_OS:
     os.system('color')
@@ -146,6 +189,612 @@ class GameMode():
                 self.value |= self.ENDLESS_MASK
 
 
+class ResponseMatrix():
+    """A dense table holding the response for every guess-answer pair.
+
+    Every word is given an integer id (a row for guesses and a column for
+    answers), and every response is stored as a one-byte base-3 code in a
+    contiguous `uint8` array. Rows are only calculated the first time they are
+    needed, so creating a new matrix is cheap. If `data` is given (such as a
+    memory-mapped file), it is used as the completed table instead.
+    """
+    MAX_CACHED_MASKS: int = 512  # rows of response masks kept in memory
+
+    def __init__(self, guesses: list[str], answers: list[str],
+                 master: bool = False, *, data: Optional[np.ndarray] = None
+                 ) -> None:
+        self.master = master
+        # answers are always valid guesses, even if they are not in the list
+        self.guesses = list(dict.fromkeys(guesses + answers))
+        self.answers = list(dict.fromkeys(answers))
+        self.guess_ids = dict(zip(self.guesses, range(len(self.guesses))))
+        self.answer_ids = dict(zip(self.answers, range(len(self.answers))))
+        if data is None:
+            self.data = np.zeros((len(self.guesses), len(self.answers)),
+                                 dtype=np.uint8)
+            self._filled = np.zeros(len(self.guesses), dtype=bool)
+        else:
+            self.set_data(data)
+        self._guess_letters = _word_array(self.guesses)
+        self._answer_letters = _word_array(self.answers)
+        self._masks: OrderedDict[int, dict[int, int]] = OrderedDict()
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def set_data(self, data: np.ndarray) -> None:
+        """Replaces the table with one which is already completely filled,
+        such as a memory-mapped file."""
+        self.data = data
+        self._filled = np.ones(len(self.guesses), dtype=bool)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    @property
+    def complete(self) -> bool:
+        return bool(self._filled.all())
+
+    def fill(self, guess_ids: np.ndarray) -> None:
+        """Calculates any of the given rows which have not been filled yet."""
+        missing = np.unique(guess_ids[~self._filled[guess_ids]])
+        if len(missing) == 0:
+            return
+        self.data[missing] = _compute_codes(self._guess_letters[missing],
+                                            self._answer_letters, self.master)
+        self._filled[missing] = True
+
+    def share(self) -> str:
+        """Moves the completed table into shared memory and returns its name.
+
+        Any rows which have not been calculated yet are filled first. Other
+        processes can then use `ResponseMatrix.attach` to read the same table
+        without copying it. The shared block is removed when the program exits.
+        """
+        if self._shm is None:
+            self.fill(np.flatnonzero(~self._filled))
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=max(1, self.nbytes))
+            data = np.ndarray(self.data.shape, dtype=np.uint8, buffer=shm.buf)
+            data[:] = self.data
+            self.data = data
+            self._shm = shm
+            atexit.register(_unlink_shared_memory, shm)
+        return self._shm.name
+
+    @classmethod
+    def attach(cls, name: str, guesses: list[str], answers: list[str],
+               master: bool = False) -> ResponseMatrix:
+        """Creates a matrix which reads a table shared by another process.
+
+        Args:
+            name:
+                The name of the shared memory block returned by `share`
+            guesses:
+                The `guesses` attribute of the shared matrix
+            answers:
+                The `answers` attribute of the shared matrix
+            master:
+                The `master` attribute of the shared matrix (default: False)
+
+        Returns:
+            A new ResponseMatrix instance backed by the shared memory block.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        data = np.ndarray((len(guesses), len(answers)), dtype=np.uint8,
+                          buffer=shm.buf)
+        matrix = cls(guesses, answers, master, data=data)
+        matrix._shm = shm
+        return matrix
+
+    def code(self, guess: str, answer: str) -> Optional[int]:
+        """Returns the response code for one pair, or None if not indexed."""
+        if guess not in self.guess_ids or answer not in self.answer_ids:
+            return None
+        row = self.guess_ids[guess]
+        if not self._filled[row]:
+            self.fill(np.array([row]))
+        return int(self.data[row, self.answer_ids[answer]])
+
+    def masks(self, guess_id: int) -> dict[int, int]:
+        """Returns the bitmask of answers giving each response to one guess.
+
+        Bit `i` of a mask is set when `answers[i]` gives that response. The
+        masks for the most recently used guesses are kept in memory.
+        """
+        if guess_id in self._masks:
+            self._masks.move_to_end(guess_id)
+            return self._masks[guess_id]
+        if not self._filled[guess_id]:
+            self.fill(np.array([guess_id]))
+        row = self.data[guess_id]
+        masks = dict((int(code), _to_mask(row == code))
+                     for code in np.unique(row))
+        self._masks[guess_id] = masks
+        if len(self._masks) > self.MAX_CACHED_MASKS:
+            self._masks.popitem(last=False)
+        return masks
+
+    def lookup(self, guesses: list[str], answers: list[str]
+               ) -> Optional[np.ndarray]:
+        """Returns the block of response codes for the given words.
+
+        Args:
+            guesses:
+                The list of guesses to use as the rows of the block
+            answers:
+                The list of answers to use as the columns of the block
+
+        Returns:
+            A 2-D `uint8` array of response codes, or None if any of the given
+            words are missing from the matrix.
+        """
+        try:
+            rows = np.fromiter((self.guess_ids[w] for w in guesses),
+                               dtype=np.intp, count=len(guesses))
+            if isinstance(answers, AnswerSet) and answers.matrix is self:
+                cols = answers.ids
+            else:
+                cols = np.fromiter((self.answer_ids[w] for w in answers),
+                                   dtype=np.intp, count=len(answers))
+        except KeyError:
+            return None
+        self.fill(rows)
+        return self.data[np.ix_(rows, cols)]
+
+
+def _unlink_shared_memory(shm: shared_memory.SharedMemory) -> None:
+    """Removes a shared memory block created by `ResponseMatrix.share`."""
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _to_mask(selected: np.ndarray) -> int:
+    """Converts a boolean array to an int where bit `i` is `selected[i]`."""
+    return int.from_bytes(np.packbits(selected, bitorder='little').tobytes(),
+                          'little')
+
+
+def _popcount(mask: int) -> int:
+    """Returns the number of set bits in the given int."""
+    return bin(mask).count('1')
+
+
+class AnswerSet(Sequence):
+    """An immutable set of answers from a ResponseMatrix stored as a bitmask.
+
+    Bit `i` of `mask` is set when `matrix.answers[i]` is in the set. This can
+    be used anywhere a list of answers is expected (the answers are kept in
+    the same order as `matrix.answers`), but filtering by a guess and response
+    only takes one AND with a precomputed mask, and counting is a popcount.
+    """
+
+    def __init__(self, matrix: ResponseMatrix, mask: int) -> None:
+        self.matrix = matrix
+        self.mask = mask
+        self._ids: Optional[np.ndarray] = None
+        self._len: Optional[int] = None
+
+    @classmethod
+    def from_words(cls, matrix: Optional[ResponseMatrix], words: list[str]
+                   ) -> Optional[AnswerSet]:
+        """Creates a new AnswerSet, or returns None if any word is missing."""
+        if matrix is None:
+            return None
+        selected = np.zeros(len(matrix.answers), dtype=bool)
+        for word in words:
+            if word not in matrix.answer_ids:
+                return None
+            selected[matrix.answer_ids[word]] = True
+        return cls(matrix, _to_mask(selected))
+
+    @property
+    def ids(self) -> np.ndarray:
+        """The column of each answer in the matrix, in ascending order."""
+        if self._ids is None:
+            num_bytes = (len(self.matrix.answers) + 7) // 8
+            bits = np.unpackbits(
+                np.frombuffer(self.mask.to_bytes(num_bytes, 'little'),
+                              dtype=np.uint8),
+                count=len(self.matrix.answers), bitorder='little')
+            self._ids = np.flatnonzero(bits)
+        return self._ids
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = _popcount(self.mask)
+        return self._len
+
+    def __getitem__(self, index: Union[int, slice]
+                    ) -> Union[str, list[str]]:
+        if isinstance(index, slice):
+            return [self.matrix.answers[i] for i in self.ids[index].tolist()]
+        return self.matrix.answers[self.ids[index]]
+
+    def __iter__(self):
+        return iter([self.matrix.answers[i] for i in self.ids.tolist()])
+
+    def __contains__(self, word: str) -> bool:
+        index = self.matrix.answer_ids.get(word)
+        return index is not None and bool((self.mask >> index) & 1)
+
+    def __repr__(self) -> str:
+        return 'AnswerSet({})'.format(list(self))
+
+    def _response_mask(self, guess: str, response: int, liar: bool) -> int:
+        """Returns the mask of all answers consistent with the response. In
+        liar mode, this is the union of the masks of every code which differs
+        from `response` by exactly one symbol."""
+        responses = liar_alternatives(response) if liar else [response]
+        if self.matrix.master:
+            responses = [_master_code(code) for code in responses]
+        if guess in self.matrix.guess_ids:
+            masks = self.matrix.masks(self.matrix.guess_ids[guess])
+            mask = 0
+            for code in responses:
+                mask |= masks.get(code, 0)
+            return mask
+        # guesses outside of the matrix are calculated directly
+        codes = _compute_codes(_word_array([guess]),
+                               self.matrix._answer_letters[self.ids],
+                               self.matrix.master)[0]
+        selected = np.zeros(len(self.matrix.answers), dtype=bool)
+        selected[self.ids[np.isin(codes, responses)]] = True
+        return _to_mask(selected)
+
+    def filter_response(self, guess: str, response: int, liar: bool = False
+                        ) -> AnswerSet:
+        """Returns a new AnswerSet of answers consistent with the response."""
+        return AnswerSet(self.matrix,
+                         self.mask & self._response_mask(guess, response,
+                                                         liar))
+
+    def count_response(self, guess: str, response: int, liar: bool = False
+                       ) -> int:
+        """Counts the answers which are consistent with the response."""
+        return _popcount(self.mask & self._response_mask(guess, response,
+                                                         liar))
+
+
+def fingerprint(words: list[str]) -> str:
+    """Returns a hex digest which only depends on the given words, in order."""
+    return sha256(','.join(words).encode()).hexdigest()
+
+
+class GuessCache():
+    """A size-limited LRU cache for the lists returned by `best_guesses`.
+
+    Every entry is keyed by a fingerprint of its arguments (see `key`), so the
+    same remaining answers reached through different boards, simulations or
+    even separate runs will share one result. The counters `hits` and `misses`
+    record how often a result was or was not found. Only lists of best guesses
+    are stored, since the scores for every guess (as given by `return_all`)
+    would take up far more memory than they save.
+    """
+
+    def __init__(self, max_size: int = 4096,
+                 entries: Optional[dict[str, list[str]]] = None) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.updated = False
+        self._entries: OrderedDict[str, list[str]] = OrderedDict()
+        for key, value in ({} if entries is None else entries).items():
+            if isinstance(value, list):  # skip scores saved by older versions
+                self.put(key, value)
+        self.updated = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(answers: list[str], guesses: list[str], mode: GameMode,
+            strategy: str = 'worst', **params) -> str:
+        """Returns a stable fingerprint for a single call to `best_guesses`.
+
+        Args:
+            answers:
+                The list of all remaining possible answers
+            guesses:
+                The list of all guesses that will be scored
+            mode:
+                A GameMode class instance representing the current game mode
+            strategy:
+                The name of the scoring function, either 'worst' for
+                `best_guesses` or 'average' for `best_avg_guesses`
+                (default: 'worst')
+            params:
+                Any other keyword arguments which change the result
+
+        Returns:
+            A hex digest which only depends on the contents of the arguments.
+        """
+        return sha256('{}:{}:{}|{}|{}'.format(
+            strategy, mode.value & GameMode.MODE_MASK, sorted(params.items()),
+            fingerprint(answers), fingerprint(guesses)
+        ).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[list[str]]:
+        """Returns a copy of the cached value, or None if it is missing."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return copy(self._entries[key])
+
+    def put(self, key: str, value: list[str]) -> None:
+        """Adds a value, removing the least recently used one if needed."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = copy(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self.updated = True
+
+    def entries(self) -> dict[str, list[str]]:
+        """Returns every entry, from least to most recently used."""
+        return dict(self._entries)
+
+
+class PackedTree():
+    """A decision tree of best guesses stored in flat arrays.
+
+    This holds the same information as the nested dicts used for `saved_best`
+    (each guess maps response codes to subtrees of more guesses), but every
+    node is an integer index and every guess is an integer id into `words`.
+    Node 0 is the root. The guesses of node `n` are
+    `guess_ids[node_start[n]:node_start[n + 1]]`, and the branches of guess
+    `g` (an index into `guess_ids`) are the response `codes` and child nodes
+    `children[branch_start[g]:branch_start[g + 1]]`. Since nothing here is a
+    Python object, the arrays can be memory-mapped from a file and walked
+    without building any dicts.
+    """
+
+    def __init__(self, words: np.ndarray, node_start: np.ndarray,
+                 guess_ids: np.ndarray, branch_start: np.ndarray,
+                 codes: np.ndarray, children: np.ndarray) -> None:
+        self.words = words  # fixed-width bytes, such as dtype 'S5'
+        self.node_start = node_start
+        self.guess_ids = guess_ids
+        self.branch_start = branch_start
+        self.codes = codes
+        self.children = children
+
+    def __len__(self) -> int:
+        return len(self.node_start) - 1
+
+    @classmethod
+    def from_dict(cls, tree: dict) -> PackedTree:
+        """Creates a PackedTree with the same contents as a nested dict tree.
+
+        Args:
+            tree:
+                A dict representing a decision tree, where each guess maps
+                response codes to subtrees
+
+        Returns:
+            A new PackedTree instance, with nodes numbered in breadth-first
+            order.
+        """
+        word_ids: dict[str, int] = {}
+        node_start, guess_ids, branch_start = [0], [], [0]
+        codes, children = [], []
+        queue = [tree]
+        for node in queue:  # the queue grows while it is being read
+            for guess, branches in node.items():
+                guess_ids.append(word_ids.setdefault(guess, len(word_ids)))
+                for code, subtree in branches.items():
+                    codes.append(code)
+                    children.append(len(queue))
+                    queue.append(subtree)
+                branch_start.append(len(codes))
+            node_start.append(len(guess_ids))
+        width = max((len(word) for word in word_ids), default=1)
+        return cls(np.array(list(word_ids), dtype='S{}'.format(width)),
+                   np.array(node_start, dtype=np.uint32),
+                   np.array(guess_ids, dtype=np.uint32),
+                   np.array(branch_start, dtype=np.uint32),
+                   np.array(codes, dtype=np.uint8),
+                   np.array(children, dtype=np.uint32))
+
+    def to_dict(self, node: int = 0) -> dict:
+        """Builds the nested dict form of the subtree rooted at `node`."""
+        tree = {}
+        for index in range(self.node_start[node], self.node_start[node + 1]):
+            start, end = self.branch_start[index], self.branch_start[index + 1]
+            tree[self.words[self.guess_ids[index]].decode()] = dict(
+                (int(code), self.to_dict(child)) for code, child
+                in zip(self.codes[start:end], self.children[start:end]))
+        return tree
+
+    def guesses(self, node: int = 0) -> list[str]:
+        """Returns the guesses saved at the given node."""
+        ids = self.guess_ids[self.node_start[node]:self.node_start[node + 1]]
+        return [word.decode() for word in self.words[ids]]
+
+    def _index(self, node: int, guess: str) -> int:
+        """Returns the index of `guess` in `guess_ids`, or -1 if the guess is
+        not saved at the given node."""
+        start, end = self.node_start[node], self.node_start[node + 1]
+        found = np.flatnonzero(self.words[self.guess_ids[start:end]]
+                               == guess.encode())
+        return int(start + found[0]) if len(found) > 0 else -1
+
+    def branches(self, node: int, guess: str) -> dict[int, int]:
+        """Returns a dict mapping each saved response code for `guess` at the
+        given node to its child node."""
+        index = self._index(node, guess)
+        if index < 0:
+            return {}
+        start, end = self.branch_start[index], self.branch_start[index + 1]
+        return dict((int(code), int(child)) for code, child
+                    in zip(self.codes[start:end], self.children[start:end]))
+
+    def descend(self, node: int, guess: str, response: int) -> int:
+        """Returns the child node reached by entering `guess` at the given
+        node and seeing `response`, or -1 if that branch is not saved."""
+        index = self._index(node, guess)
+        if index < 0:
+            return -1
+        start, end = self.branch_start[index], self.branch_start[index + 1]
+        found = np.flatnonzero(self.codes[start:end] == response)
+        return int(self.children[start + found[0]]) if len(found) > 0 else -1
+
+    def view(self, node: int = 0) -> TreeView:
+        """Returns a read-only dict-like view of the given node."""
+        return TreeView(self, node)
+
+
+class TreeView(Mapping):
+    """A read-only view of one node of a PackedTree.
+
+    The view behaves like the nested dict form of the same subtree, mapping
+    each guess to a dict of response codes and child views, but it only reads
+    the parts of the tree that are actually visited.
+    """
+
+    def __init__(self, packed: PackedTree, node: int = 0) -> None:
+        self.packed = packed
+        self.node = node
+
+    def __getitem__(self, guess: str) -> dict[int, TreeView]:
+        index = self.packed._index(self.node, guess)
+        if index < 0:
+            raise KeyError(guess)
+        return dict((code, TreeView(self.packed, child)) for code, child
+                    in self.packed.branches(self.node, guess).items())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.packed.guesses(self.node))
+
+    def __len__(self) -> int:
+        return int(self.packed.node_start[self.node + 1]
+                   - self.packed.node_start[self.node])
+
+    def __contains__(self, guess: object) -> bool:
+        return (isinstance(guess, str)
+                and self.packed._index(self.node, guess) >= 0)
+
+    def __repr__(self) -> str:
+        return 'TreeView(node={}, guesses={})'.format(self.node, len(self))
+
+    def descend(self, guess: str, response: int) -> Optional[TreeView]:
+        """Returns the view reached by `guess` and `response`, or None."""
+        child = self.packed.descend(self.node, guess, response)
+        return None if child < 0 else TreeView(self.packed, child)
+
+
+class LazyTree(Mapping):
+    """A decision tree which only reads the saved subtrees that are visited.
+
+    Guesses and branches are read from a PackedTree (usually memory-mapped
+    from a file) the first time they are looked up, so the cost of opening a
+    large saved tree does not depend on its size. New guesses and branches can
+    be added with `descend` or by assigning a guess, and every addition is
+    recorded in `log` as a path of alternating guesses and response codes,
+    shared by every node of the same tree. The root's `saved` attribute counts
+    how many entries of `log` have already been written to disk.
+    """
+
+    def __init__(self, packed: Optional[PackedTree] = None, node: int = 0,
+                 path: tuple = (), log: Optional[list[tuple]] = None
+                 ) -> None:
+        self.packed = packed
+        self.node = node if packed is not None and len(packed) > 0 else -1
+        self.path = path
+        self.log = [] if log is None else log
+        self.saved = 0
+        self._guesses: dict[str, dict[int, LazyTree]] = {}  # already visited
+
+    def _branches(self, guess: str) -> Optional[dict[int, LazyTree]]:
+        """Returns the branches of `guess`, reading them from the PackedTree
+        if needed, or None if `guess` is not in the tree."""
+        branches = self._guesses.get(guess)
+        if branches is None and self.node >= 0:
+            index = self.packed._index(self.node, guess)
+            if index >= 0:
+                branches = self._guesses[guess] = dict(
+                    (code, LazyTree(self.packed, child,
+                                    self.path + (guess, code), self.log))
+                    for code, child
+                    in self.packed.branches(self.node, guess).items())
+        return branches
+
+    def __getitem__(self, guess: str) -> dict[int, LazyTree]:
+        branches = self._branches(guess)
+        if branches is None:
+            raise KeyError(guess)
+        return branches
+
+    def __setitem__(self, guess: str, branches: dict) -> None:
+        if self._branches(guess) is None:
+            self._guesses[guess] = {}
+            self.log.append(self.path + (guess,))
+        for response, subtree in branches.items():
+            child, _ = self.descend(guess, response)
+            for next_guess, next_branches in subtree.items():
+                child[next_guess] = next_branches
+
+    def __iter__(self) -> Iterator[str]:
+        saved = [] if self.node < 0 else self.packed.guesses(self.node)
+        return iter(dict.fromkeys(saved + list(self._guesses)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, guess: object) -> bool:
+        return isinstance(guess, str) and self._branches(guess) is not None
+
+    def __repr__(self) -> str:
+        return 'LazyTree(path={}, guesses={})'.format(self.path, len(self))
+
+    def descend(self, guess: str, response: int) -> tuple[LazyTree, bool]:
+        """Returns the subtree for `guess` and `response`, adding it if it is
+        missing, and a boolean value representing whether it was added."""
+        branches = self._branches(guess)
+        updated = branches is None or response not in branches
+        if branches is None:
+            branches = self._guesses[guess] = {}
+        if response not in branches:
+            branches[response] = LazyTree(None, -1, self.path
+                                          + (guess, response), self.log)
+        if updated:
+            self.log.append(self.path + (guess, response))
+        return branches[response], updated
+
+
+def descend_tree(tree: Union[dict, TreeView, LazyTree], guess: str,
+                 response: int) -> tuple[Union[dict, TreeView, LazyTree], bool]:
+    """Follows the branch of a decision tree for a guess and its response.
+
+    Missing branches are added to nested dict trees and LazyTrees. Views of a
+    PackedTree are read-only, so a missing branch leads to a new empty dict
+    instead.
+
+    Args:
+        tree:
+            A dict, TreeView, or LazyTree representing a decision tree
+        guess:
+            The guess that was entered
+        response:
+            The response code that was given for `guess`
+
+    Returns:
+        A 2-tuple containing the subtree for `guess` and `response`, and a
+        boolean value representing whether `tree` was changed.
+    """
+    if isinstance(tree, LazyTree):
+        return tree.descend(guess, response)
+    if isinstance(tree, TreeView):
+        subtree = tree.descend(guess, response)
+        return ({} if subtree is None else subtree), False
+    updated = guess not in tree or response not in tree[guess]
+    return tree.setdefault(guess, {}).setdefault(response, {}), updated
+
+
 def set_best_guess_updated(value: bool = True) -> None:
     """Sets the value of `best_guess_updated`.
 
@@ -167,58 +816,158 @@ def get_best_guess_updated() -> bool:
     return _best_guess_updated
 
 
-def set_response_data_updated(value: bool = True) -> None:
-    """Sets the value of `response_data_updated`.
+def set_response_matrix(value: Optional[ResponseMatrix] = None) -> None:
+    """Sets the value of `response_matrix`.
 
     Args:
         value:
-            The boolean value to set (default: True)
+            The new ResponseMatrix instance to use when finding responses, or
+            None to calculate every response directly (default: None)
     """
-    global _response_data_updated
-    _response_data_updated = value
+    global _response_matrix
+    _response_matrix = value
 
 
-def get_response_data_updated() -> bool:
-    """Gets the value of `best_guess_updated`.
+def get_response_matrix() -> Optional[ResponseMatrix]:
+    """Gets the value of `response_matrix`.
 
     Returns:
-        The boolean value representing whether or not the `response_data` dict
-        has been updated.
+        The ResponseMatrix instance currently used to find responses, or None
+        if no matrix has been set.
     """
-    return _response_data_updated
+    return _response_matrix
 
 
-def set_response_data(value: dict[str, dict[str, str]] = {}) -> None:
-    """Sets the value of `response_data`.
+def set_workers(value: int = 1) -> None:
+    """Sets the default number of worker processes used by `best_guesses`.
 
     Args:
         value:
-            The new dictionary to replace as the data
+            The number of processes to use, where 1 disables the process pool
+            (default: 1)
+    """
+    global _workers
+    _workers = max(1, value)
+
+
+def get_workers() -> int:
+    """Gets the default number of worker processes used by `best_guesses`.
+
+    Returns:
+        The number of processes used to score guesses in parallel.
     """
-    global _response_data
-    _response_data = value
+    return _workers
+
+
+def set_show_progress(value: bool = True) -> None:
+    """Sets whether any progress bars are shown, such as for batch runs.
+
+    Args:
+        value:
+            A boolean value representing whether to allow progress bars to be
+            shown at all (default: True)
+    """
+    global _show_progress
+    _show_progress = value
+
+
+class _NoProgress():
+    """A stand-in for a tqdm progress bar which is never shown."""
 
+    def __init__(self, iterable=None) -> None:
+        self.iterable = iterable
 
-def get_response_data() -> dict[str, dict[str, str]]:
-    """Gets the value of `response_data`.
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def __enter__(self) -> _NoProgress:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def update(self, n: int = 1) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def progress_bar(iterable=None, *, disable: bool = False, **kwargs):
+    """Creates a tqdm progress bar, only importing tqdm when a bar is shown.
+
+    Args:
+        iterable:
+            The iterable to decorate with a progress bar (default: None)
+
+    Keyword Args:
+        disable:
+            A boolean value representing whether to hide the progress bar
+            (default: False)
+        **kwargs:
+            Any other arguments accepted by tqdm
 
     Returns:
-        A dictionary mapping the guessed word to another dictionary mapping an
-        answer to the resulting response. (In other words, if the guess was
-        ALERT and the answer was OLIVE, the response would be `.O+..`, so
-        `response_data['alert']['olive'] == '.O+..'` should return `True`.)
+        A tqdm instance, or a stand-in with the same `update` and `close`
+        methods if the bar is disabled or progress bars are turned off (see
+        `set_show_progress`).
+    """
+    if disable or not _show_progress:
+        return _NoProgress(iterable)
+    from tqdm import tqdm
+    return tqdm(iterable, **kwargs)
+
+
+def set_guess_cache(value: Optional[GuessCache] = None) -> None:
+    """Sets the value of `guess_cache`.
+
+    Args:
+        value:
+            The new GuessCache instance used by `cached_best_guesses`, or None
+            to always calculate the best guesses directly (default: None)
     """
-    return _response_data
+    global _guess_cache
+    _guess_cache = value
 
 
-def colored_response(guess: str, response: str,
+def get_guess_cache() -> Optional[GuessCache]:
+    """Gets the value of `guess_cache`.
+
+    Returns:
+        The GuessCache instance currently used by `cached_best_guesses`, or
+        None if no cache has been set.
+    """
+    return _guess_cache
+
+
+def encode_response(response: str) -> Optional[int]:
+    """Converts a response string to its base-3 response code.
+
+    Args:
+        response:
+            A string made up of the symbols `RIGHT`, `CLOSE`, and `WRONG`
+
+    Returns:
+        The integer code for the response (from 0 to 242), or None if the given
+        string is not a valid response.
+    """
+    return _STR_TO_CODE.get(response)
+
+
+def decode_response(code: int) -> str:
+    """Converts a base-3 response code back to its response string."""
+    return _CODE_TO_STR[code]
+
+
+def colored_response(guess: str, response: int,
                      mode: Optional[GameMode] = None) -> str:
-    """Returns colored text to match the given guess and response"""
+    """Returns colored text to match the given guess and response code"""
     if mode is None:
         mode = GameMode()
     text = ''
-    letters = response if mode.master else guess.upper()
-    for letter, symbol in zip(letters, response):
+    symbols = _CODE_TO_STR[response]
+    letters = symbols if mode.master else guess.upper()
+    for letter, symbol in zip(letters, symbols):
         if symbol == RIGHT:
             text += "\x1b[38;5;102m\x1b[48;5;30m" + letter + "\x1b[0m"
         elif symbol == CLOSE:
@@ -279,38 +1028,120 @@ def _get_master_response(guess: str, answer: str) -> str:
     Returns:
         A string represention of the expected response.
     """
-    if guess == answer:
-        return ''.join([RIGHT for _ in answer])
-    response = ''
-    # get frequency count of each letter in the answer
-    letter_count = dict()
-    for letter in answer:
-        if letter in letter_count:
-            letter_count[letter] += 1
-        else:
-            letter_count[letter] = 1
-    # first loop counts exact matches
-    for index in range(len(answer)):
-        letter = guess[index]
-        if letter == answer[index]:
-            response += RIGHT
-            letter_count[letter] -= 1
-    # second loop counts non-exact matches
-    for index in range(len(answer)):
-        letter = guess[index]
-        if letter != answer[index]:
-            if letter in letter_count:
-                if letter_count[letter] > 0:
-                    response += CLOSE
-                    letter_count[letter] -= 1
-    # third loop fills the rest of the response with misses
-    while len(response) < len(answer):
-        response += WRONG
-    return response
+    response = _get_easy_response(guess, answer)
+    return (RIGHT * response.count(RIGHT) + CLOSE * response.count(CLOSE)
+            ).ljust(len(answer), WRONG)
+
+
+def _word_array(words: list[str]) -> np.ndarray:
+    """Converts a list of words to a 2-D array with one letter per cell."""
+    if len(words) == 0:
+        return np.zeros((0, len(_PLACE_VALUES)), dtype=np.uint8)
+    return np.frombuffer(''.join(words).encode('ascii'),
+                         dtype=np.uint8).reshape(len(words), -1)
+
+
+def _compute_codes(guesses: np.ndarray, answers: np.ndarray,
+                   master: bool = False) -> np.ndarray:
+    """Calculates the response code for every pair of guess and answer.
+
+    This follows the same rules as `_get_easy_response` (or
+    `_get_master_response` if `master` is set), but works on every pair at
+    once. A letter in the guess is marked CLOSE when the answer still has a
+    copy of it left over after every green letter and every earlier occurrence
+    in the guess has used up its own copy. Master mode responses only depend
+    on the number of RIGHT and CLOSE symbols, so they are stored as compact
+    master codes (from 0 to 20) instead of base-3 codes (see `_master_code`).
+
+    Args:
+        guesses:
+            A 2-D array of letters as given by `_word_array`
+        answers:
+            A 2-D array of letters as given by `_word_array`
+        master:
+            A boolean value representing whether to find Wordzy Master
+            responses instead of default responses (default: False)
+
+    Returns:
+        A 2-D `uint8` array where the value at `[i, j]` is the response code
+        (or master code) for the guess at index `i` and the answer at index
+        `j`.
+    """
+    codes = np.zeros((len(guesses), len(answers)), dtype=np.uint8)
+    if len(answers) == 0:
+        return codes
+    step = max(1, 2**22 // len(answers))  # bound the size of each temp array
+    alphabet = np.arange(256, dtype=np.uint8)
+    letter_count = (answers[:, :, None] == alphabet).sum(
+        axis=1, dtype=np.int8)
+    for start in range(0, len(guesses), step):
+        chunk = guesses[start:start + step]
+        green = chunk[:, None, :] == answers[None, :, :]
+        right = np.zeros(green.shape[:2], dtype=np.uint8)
+        close = np.zeros(green.shape[:2], dtype=np.uint8)
+        for i in range(chunk.shape[1]):
+            available = letter_count[:, chunk[:, i]].T
+            for j in range(chunk.shape[1]):
+                same = (chunk[:, j] == chunk[:, i])[:, None]
+                if j < i:
+                    available = available - same
+                elif j > i:
+                    available = available - (same & green[:, :, j])
+            is_close = ~green[:, :, i] & (available > 0)
+            if master:
+                right += green[:, :, i]
+                close += is_close
+            else:
+                codes[start:start + step] += _PLACE_VALUES[i] * (
+                    2 * green[:, :, i] + is_close).astype(np.uint8)
+        if master:
+            codes[start:start + step] = _MASTER_IDS[right, close]
+    return codes
+
+
+def _master_code(code: int) -> int:
+    """Converts a base-3 response code to its compact master code."""
+    return int(_CODE_TO_MASTER[code])
+
+
+def _num_codes(master: bool) -> int:
+    """Returns the number of distinct codes used by `_compute_codes`."""
+    return NUM_MASTER_CODES if master else NUM_RESPONSES
+
+
+def liar_alternatives(code: int) -> list[int]:
+    """Returns every code which differs from `code` by exactly one symbol,
+    from the first symbol to the last, with each lie in the order RIGHT, CLOSE,
+    WRONG. Ties between liar responses are broken by this order."""
+    return _LIAR_NEIGHBORS[code].tolist()
+
+
+def _liar_code(code: int) -> int:
+    """Changes one random symbol of the given response code to a lie."""
+    return choice(liar_alternatives(code))
+
+
+def _matching(codes: np.ndarray, code: int, liar: bool = False
+              ) -> np.ndarray:
+    """Returns a boolean mask of which codes are consistent with `code`."""
+    if liar:  # check that exactly one symbol in the response is wrong
+        return _LIAR_MATCHES[code][codes]
+    return codes == code
+
+
+def _liar_scores(codes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Adds a random lie to the response for every answer in each row of
+    `codes`, and counts the answers which are consistent with that lie."""
+    hist = _histogram(codes).astype(np.float32)
+    consistent = np.rint(hist @ _LIAR_MATCHES.astype(np.float32))
+    lies = _LIAR_NEIGHBORS[codes, rng.integers(0, _LIAR_NEIGHBORS.shape[1],
+                                               size=codes.shape)]
+    return np.take_along_axis(consistent.astype(np.int64),
+                              lies.astype(np.intp), axis=1)
 
 
 def get_response(guess: str, answer: str, mode: Optional[GameMode] = None,
-                 *, use_cache: bool = True) -> str:
+                 *, use_cache: bool = True) -> int:
     """Gets the expected response based on the version of Wordle being played.
 
     Args:
@@ -324,40 +1155,76 @@ def get_response(guess: str, answer: str, mode: Optional[GameMode] = None,
 
     Keyword Args:
         use_cache:
-            A boolean value representing whether to use previously-calculated
-            response data being stored by the program (default: True)
+            A boolean value representing whether to read the response from the
+            current ResponseMatrix (default: True)
 
     Returns:
-        A string represention of the expected response.
+        The base-3 code of the expected response (see `decode_response`). In
+        liar mode, one symbol is changed to a lie unless `guess == answer`.
     """
-    global _response_data, _response_data_updated
-    # Note: this use of memoization appears to speed up calculations by a
-    #       factor of 10, but it also uses between 0.4 and 1.2GB of storage
-    response = ''
-    if (use_cache and guess in _response_data
-            and answer in _response_data[guess]):
-        response = _response_data[guess][answer]
-    else:
-        if mode is None:
-            mode = GameMode()
+    if mode is None:
+        mode = GameMode()
+    code = None
+    if (use_cache and _response_matrix is not None
+            and _response_matrix.master == mode.master):
+        code = _response_matrix.code(guess, answer)
+        if code is not None and mode.master:
+            code = int(_MASTER_TO_CODE[code])
+    if code is None:
         if mode.master:
-            response = _get_master_response(guess, answer)
+            code = _STR_TO_CODE[_get_master_response(guess, answer)]
         else:
-            response = _get_easy_response(guess, answer)
-        if use_cache:
-            if guess not in _response_data:
-                _response_data[guess] = {}
-            _response_data[guess][answer] = response
-            _response_data_updated = True
-    if (mode.liar):
-        sym_idx = choice(list(range(len(response))))
-        response = (response[:sym_idx]
-                    + choice(SYM_ALTS[response[sym_idx]])
-                    + response[sym_idx + 1:])
-    return response
-
-
-def filter_remaining(remaining: list[str], guess: str, response: str,
+            code = _STR_TO_CODE[_get_easy_response(guess, answer)]
+    if mode.liar and code != ALL_RIGHT:  # a correct guess always ends the game
+        code = _liar_code(code)
+    return code
+
+
+def get_response_codes(guesses: list[str], answers: list[str],
+                       mode: Optional[GameMode] = None,
+                       *, use_cache: bool = True) -> np.ndarray:
+    """Gets the response code for every pair of guess and answer.
+
+    Unlike `get_response`, this never adds a lie to the response in liar mode,
+    and in master mode it returns compact master codes (see `_master_code`).
+
+    Args:
+        guesses:
+            The list of words which could be guessed by the player
+        answers:
+            The list of potential answer words to be tested
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        use_cache:
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+
+    Returns:
+        A 2-D `uint8` array where the value at `[i, j]` is the response code
+        for `guesses[i]` and `answers[j]`.
+    """
+    if mode is None:
+        mode = GameMode()
+    if (use_cache and _response_matrix is not None
+            and _response_matrix.master == mode.master):
+        codes = _response_matrix.lookup(guesses, answers)
+        if codes is not None:
+            return codes
+    return _compute_codes(_word_array(guesses), _word_array(answers),
+                          mode.master)
+
+
+def _usable_bitset(remaining: list[str], mode: GameMode, use_cache: bool
+                   ) -> bool:
+    """Checks if `remaining` is an AnswerSet which can be used for `mode`."""
+    return (use_cache and isinstance(remaining, AnswerSet)
+            and remaining.matrix.master == mode.master)
+
+
+def filter_remaining(remaining: list[str], guess: str, response: int,
                      mode: Optional[GameMode] = None, *, use_cache: bool = True
                      ) -> list[str]:
     """Filters a given list of answers based on the given guess and response.
@@ -368,42 +1235,40 @@ def filter_remaining(remaining: list[str], guess: str, response: str,
         guess:
             The word which was guessed by the player
         response:
-            The response from the game after `guess` was entered
+            The response code from the game after `guess` was entered
         mode:
             A GameMode class instance representing the current game mode
             (default: None)
 
     Keyword Args:
         use_cache:
-            A boolean value representing whether to use previously-calculated
-            response data being stored by the program (default: True)
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
 
     Returns:
         A new list which only includes answers that are consistent with the
-        given guess and response.
+        given guess and response. If `remaining` is an AnswerSet, the new list
+        is also an AnswerSet.
     """
     if mode is None:
         mode = GameMode()
-    filtered = []
-    if response == ''.join(RIGHT for _ in guess):
+    bitset = _usable_bitset(remaining, mode, use_cache)
+    if response == ALL_RIGHT:
+        if bitset and guess in remaining.matrix.answer_ids:
+            return AnswerSet(remaining.matrix,
+                             1 << remaining.matrix.answer_ids[guess])
         return [guess]
-    for answer in remaining:
-        if mode.liar:
-            this_response = get_response(guess, answer, GameMode(),
-                                         use_cache=use_cache)
-            # check that exactly one letter in the response is wrong
-            if 1 == sum(int(this_response[n] != response[n])
-                        for n in range(len(answer))):
-                filtered.append(answer)
-        else:
-            this_response = get_response(guess, answer, mode,
-                                         use_cache=use_cache)
-            if this_response == response:
-                filtered.append(answer)
-    return filtered
+    if bitset:
+        return remaining.filter_response(guess, response, mode.liar)
+    codes = get_response_codes([guess], remaining, mode,
+                               use_cache=use_cache)[0]
+    if mode.master:
+        response = _master_code(response)
+    keep = _matching(codes, response, mode.liar)
+    return [answer for answer, match in zip(remaining, keep) if match]
 
 
-def count_remaining(remaining: list[str], guess: str, response: str,
+def count_remaining(remaining: list[str], guess: str, response: int,
                     mode: Optional[GameMode] = None,
                     *, limit: Optional[int] = None, use_cache: bool = True
                     ) -> int:
@@ -415,7 +1280,7 @@ def count_remaining(remaining: list[str], guess: str, response: str,
         guess:
             The word which was guessed by the player
         response:
-            The response from the game after `guess` was entered
+            The response code from the game after `guess` was entered
         mode:
             A GameMode class instance representing the current game mode
             (default: None)
@@ -425,8 +1290,8 @@ def count_remaining(remaining: list[str], guess: str, response: str,
             The limit which, once exceeded, will immediately return a value;
             if not set, the limit will be ignored (default: None)
         use_cache:
-            A boolean value representing whether to use previously-calculated
-            response data being stored by the program (default: True)
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
 
     Returns:
         The number of answers consistent with the given guess and response. If
@@ -436,38 +1301,397 @@ def count_remaining(remaining: list[str], guess: str, response: str,
         mode = GameMode()
     if limit is None:
         limit = len(remaining)
-    count = 0
-    for answer in remaining:
-        if mode.liar:
-            this_response = get_response(guess, answer, GameMode(),
-                                         use_cache=use_cache)
-            # check that exactly one letter in the response is wrong
-            if 1 == sum(int(this_response[n] != response[n])
-                        for n in range(len(answer))):
-                count += 1
-        else:
-            this_response = get_response(guess, answer, mode,
-                                         use_cache=use_cache)
-            if this_response == response:
-                count += 1
-        if count > limit:
-            return count
-    return count
+    if _usable_bitset(remaining, mode, use_cache):
+        count = remaining.count_response(guess, response, mode.liar)
+        return min(count, limit + 1)
+    codes = get_response_codes([guess], remaining, mode,
+                               use_cache=use_cache)[0]
+    if mode.master:
+        response = _master_code(response)
+    count = int(_matching(codes, response, mode.liar).sum())
+    return min(count, limit + 1)
+
+
+def count_liar_alternatives(remaining: list[str], guess: str, response: int,
+                            *, use_cache: bool = True) -> np.ndarray:
+    """Counts the answers left after each possible lie in a liar response.
+
+    This gives the same counts as calling `count_remaining` in liar mode for
+    every code in `liar_alternatives(response)`, but the responses of
+    `remaining` are only looked up once and counted in a single histogram.
+
+    Args:
+        remaining:
+            The list of remaining possible answers
+        guess:
+            The word which was guessed by the player
+        response:
+            The true response code for `guess`, without any lies
+
+    Keyword Args:
+        use_cache:
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+
+    Returns:
+        An array where the value at `[i]` is the number of answers consistent
+        with the liar response `liar_alternatives(response)[i]`.
+    """
+    codes = get_response_codes([guess], remaining, use_cache=use_cache)[0]
+    hist = np.bincount(codes, minlength=NUM_RESPONSES)
+    return hist[_LIAR_NEIGHBORS[_LIAR_NEIGHBORS[response]]].sum(axis=1)
+
+
+def _histogram(codes: np.ndarray, size: int = NUM_RESPONSES) -> np.ndarray:
+    """Counts the occurrences of every response code in each row of `codes`,
+    where every code is less than `size`."""
+    offsets = np.arange(len(codes), dtype=np.intp)[:, None] * size
+    return np.bincount((codes + offsets).ravel(),
+                       minlength=len(codes) * size).reshape(len(codes), size)
+
+
+def get_partition_sizes(guesses: list[str], answers: list[str],
+                        mode: Optional[GameMode] = None, *,
+                        show: bool = False, use_cache: bool = True
+                        ) -> np.ndarray:
+    """Splits the answers into groups by response, once for every guess.
+
+    Args:
+        guesses:
+            The list of words which could be guessed by the player
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        show:
+            A boolean value representing whether a progress bar should be shown
+            (default: False)
+        use_cache:
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+
+    Returns:
+        A 2-D array where the value at `[i, code]` is the number of answers
+        which would give the response `code` after guessing `guesses[i]`. In
+        master mode, each column is a compact master code instead, so there
+        are only `NUM_MASTER_CODES` columns.
+    """
+    if mode is None:
+        mode = GameMode()
+    size = _num_codes(mode.master)
+    sizes = np.zeros((len(guesses), size), dtype=np.int64)
+    step = max(1, 2**20 // max(1, len(answers)))
+    with progress_bar(total=len(guesses), leave=False, ascii=PROGRESS,
+                      disable=not show) as progress:
+        for start in range(0, len(guesses), step):
+            codes = get_response_codes(guesses[start:start + step], answers,
+                                       mode, use_cache=use_cache)
+            sizes[start:start + step] = _histogram(codes, size)
+            progress.update(len(codes))
+    return sizes
+
+
+def useful_guesses(guesses: list[str], answers: list[str],
+                   mode: Optional[GameMode] = None, *, use_cache: bool = True
+                   ) -> list[str]:
+    """Removes every guess which gives the same response for all answers.
+
+    Such a guess cannot tell any of the answers apart, and it cannot tell any
+    smaller set of these answers apart either. Any answer in a list of two or
+    more always has a better worst-case count, so removing these guesses will
+    never change the result of `best_guesses`. This allows the list of guesses
+    to be refined alongside the remaining answers after each response.
+
+    This only prunes the guesses. No partitions are kept between calls, so
+    the remaining guesses are still scored against every remaining answer.
+
+    Args:
+        guesses:
+            The list of guesses which were still useful for a larger list of
+            answers
+        answers:
+            The list of all remaining possible answers
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        use_cache:
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+
+    Returns:
+        A new list with only the guesses that split the answers into at least
+        two groups. In liar mode, or if there are less than two answers, the
+        guesses are returned unchanged.
+    """
+    if mode is None:
+        mode = GameMode()
+    if mode.liar or len(answers) < 2:
+        return list(guesses)
+    useful = []
+    step = max(1, 2**20 // len(answers))
+    for start in range(0, len(guesses), step):
+        chunk = guesses[start:start + step]
+        codes = get_response_codes(chunk, answers, mode, use_cache=use_cache)
+        split = codes.min(axis=1) != codes.max(axis=1)
+        useful += [guess for guess, keep in zip(chunk, split) if keep]
+    return useful
+
+
+def _lower_bound(num_answers: int, mode: GameMode) -> int:
+    """Returns the smallest worst-case count any guess could possibly have.
+
+    Every guess splits the answers into at most one group per response, so at
+    least one group must hold `ceil(num_answers / responses)` answers. Master
+    mode only has one response for every pair of RIGHT and CLOSE counts.
+    """
+    responses = _MASTER_RESPONSES if mode.master else NUM_RESPONSES
+    return max(1, -(-num_answers // responses))
+
+
+def _rank_guesses(guesses: list[str], answers: list[str]) -> np.ndarray:
+    """Orders the guesses best-first using letter frequencies in `answers`.
+
+    Each guess scores the number of answers with the same letter in each
+    position, plus the number of answers containing each of its distinct
+    letters. This is only a heuristic used to find a good bound early.
+
+    Returns:
+        An array of indices into `guesses`, starting with the highest score.
+    """
+    guess_letters = np.sort(_word_array(list(guesses)), axis=1)
+    answer_letters = _word_array(list(answers))
+    positional = np.stack([np.bincount(answer_letters[:, i], minlength=256)
+                           for i in range(5)])
+    contains = np.zeros((len(answer_letters), 256), dtype=bool)
+    contains[np.arange(len(answer_letters))[:, None], answer_letters] = True
+    present = contains.sum(axis=0)
+    distinct = np.ones(guess_letters.shape, dtype=bool)
+    distinct[:, 1:] = guess_letters[:, 1:] != guess_letters[:, :-1]
+    scores = (positional[np.arange(5), _word_array(list(guesses))].sum(axis=1)
+              + np.where(distinct, present[guess_letters], 0).sum(axis=1))
+    return np.argsort(-scores, kind='stable')
+
+
+def _bounded_worst_case(guesses: list[str], answers: list[str],
+                        mode: GameMode, max_limit: int, shrink: bool, *,
+                        show: bool = False, use_cache: bool = True
+                        ) -> np.ndarray:
+    """Helper function for `best_guesses` which skips hopeless guesses early.
+
+    The guesses are ordered with `_rank_guesses`. If `shrink` is set, the
+    best-ranked guesses are scored first to lower `max_limit`, stopping once
+    it reaches `_lower_bound`. Every other guess is then counted against one
+    block of answers at a time. Counts can only grow as more answers are
+    added, so a guess is dropped as soon as any count exceeds `max_limit`.
+
+    Returns:
+        An array with the worst-case count for each guess, where any count
+        greater than the original `max_limit` is replaced by `max_limit + 1`.
+    """
+    worst = np.full(len(guesses), max_limit + 1, dtype=np.int64)
+    order = _rank_guesses(guesses, answers)
+    lower = _lower_bound(len(answers), mode)
+    start = 0
+    with progress_bar(total=len(guesses), leave=False, ascii=PROGRESS,
+                      disable=not show) as progress:
+        while (shrink and max_limit > lower
+               and start < min(len(order), _RANKED_GUESSES)):
+            batch = order[start:start + _RANKED_BATCH]
+            sizes = get_partition_sizes([guesses[i] for i in batch], answers,
+                                        mode, use_cache=use_cache)
+            worst[batch] = np.minimum(sizes.max(axis=1), worst[batch])
+            max_limit = min(max_limit, int(worst[batch].min()))
+            start += len(batch)
+            progress.update(len(batch))
+        active = order[start:]
+        counts = np.zeros((len(active), _num_codes(mode.master)),
+                          dtype=np.int64)
+        for begin in range(0, len(answers), _ANSWER_BLOCK):
+            if len(active) == 0:
+                break
+            counts += get_partition_sizes([guesses[i] for i in active],
+                                          answers[begin:begin + _ANSWER_BLOCK],
+                                          mode, use_cache=use_cache)
+            keep = counts.max(axis=1) <= max_limit
+            progress.update(len(keep) - int(keep.sum()))
+            active, counts = active[keep], counts[keep]
+        worst[active] = counts.max(axis=1)
+        progress.update(len(active))
+    return worst
+
+
+def _init_worker(name: str, guesses: list[str], answers: list[str],
+                 master: bool, limit, bound, cancel, context) -> None:
+    """Attaches a worker process to the shared ResponseMatrix and values."""
+    global _response_matrix, _worker_limit, _worker_bound, _worker_cancel
+    global _worker_context, _workers
+    _response_matrix = ResponseMatrix.attach(name, guesses, answers, master)
+    _worker_limit = limit
+    _worker_bound = bound
+    _worker_cancel = cancel
+    _worker_context = context
+    _workers = 1  # worker processes cannot start pools of their own
+
+
+def _close_pool() -> None:
+    """Shuts down the worker processes, if any."""
+    global _pool
+    if _pool is not None:
+        _pool[1].terminate()
+        _pool[1].join()
+        _pool = None
+
+
+def _get_pool(workers: int, matrix: ResponseMatrix, context=None) -> tuple:
+    """Returns a process pool attached to `matrix` and its shared values.
+
+    The pool is reused until it is needed with a different number of workers,
+    a different matrix, or a `context` other than the object its workers were
+    started with (see `map_workers`). Along with the pool, this returns the
+    shared `max_limit` used by `best_guesses`, the bound shared by the tasks of
+    `map_workers`, and the flag used to cancel the remaining work of
+    `map_workers` and `rec_build_best_tree`. The two bounds are kept apart,
+    so scoring guesses never changes the bound of other tasks.
+    """
+    global _pool
+    key = (workers, matrix.share())
+    if (_pool is None or _pool[0] != key
+            or (context is not None and _pool[5] is not context)):
+        _close_pool()
+        limit = multiprocessing.Value('q', 0)
+        bound = multiprocessing.Value('q', 0)
+        cancel = multiprocessing.Value('b', 0)
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_worker,
+            initargs=(key[1], matrix.guesses, matrix.answers, matrix.master,
+                      limit, bound, cancel, context))
+        _pool = (key, pool, limit, bound, cancel, context)
+    return _pool[1:5]
+
+
+def map_workers(func: Callable, tasks: Iterator, workers: int,
+                bound: Optional[int] = None, context=None) -> Iterator:
+    """Runs `func` on every task using the shared pool of worker processes.
+
+    At most two tasks per worker are queued at a time, so `tasks` can be a
+    lazy generator of any length. If the caller stops early, the tasks that
+    were already queued see `worker_cancelled` return True and are drained
+    before this returns. The current ResponseMatrix must already be set.
+
+    Args:
+        func:
+            A module-level function which takes a single task
+        tasks:
+            An iterable of tasks to run
+        workers:
+            The number of worker processes to use
+        bound:
+            The starting value of the bound shared by the tasks through
+            `shared_bound` and `raise_shared_bound`, or None if the tasks do
+            not use it (default: None)
+        context:
+            Any value needed by every task, such as the arguments shared by a
+            whole simulation, which is sent to each worker process once when
+            it starts instead of with every task; the tasks read it with
+            `worker_context` (default: None)
+
+    Yields:
+        The result of `func` for each task, in the same order as `tasks`.
+    """
+    pool, _, shared, cancel = _get_pool(workers, _response_matrix, context)
+    cancel.value = 0
+    if bound is not None:
+        shared.value = bound
+    pending = deque()
+    try:
+        for task in tasks:
+            pending.append(pool.apply_async(func, (task,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while len(pending) > 0:
+            yield pending.popleft().get()
+    finally:
+        cancel.value = 1
+        for result in pending:
+            result.wait()
+        cancel.value = 0
+
+
+def worker_cancelled() -> bool:
+    """Returns True if the work given to this worker process was cancelled."""
+    return _worker_cancel is not None and bool(_worker_cancel.value)
+
+
+def worker_context():
+    """Returns the context given to `map_workers`, or None if this is not a
+    worker process."""
+    return _worker_context
+
+
+def shared_bound() -> Optional[int]:
+    """Returns the bound given to `map_workers`, as raised by every worker
+    so far, or None if this is not a worker process."""
+    return None if _worker_bound is None else int(_worker_bound.value)
+
+
+def raise_shared_bound(value: int) -> None:
+    """Raises the bound shared by every worker process to `value`, unless it
+    is already higher. This does nothing outside of a worker process."""
+    if _worker_bound is not None:
+        with _worker_bound.get_lock():
+            _worker_bound.value = max(_worker_bound.value, value)
+
+
+def _worst_case_shard(task: tuple) -> np.ndarray:
+    """Finds the worst-case counts for one shard of guesses in a worker."""
+    guesses, answers, mode, max_limit, shared = task
+    if shared:  # other shards may have already lowered the bound
+        max_limit = min(max_limit, _worker_limit.value)
+    worst = _bounded_worst_case(guesses, answers, mode, max_limit, shared)
+    if shared and len(worst) > 0:
+        with _worker_limit.get_lock():
+            _worker_limit.value = min(_worker_limit.value, int(worst.min()))
+    return worst
+
+
+def _parallel_worst_case(guesses: list[str], answers: list[str],
+                         mode: GameMode, max_limit: int, shared: bool,
+                         workers: int, show: bool) -> np.ndarray:
+    """Helper function for `best_guesses` which shards the guess list."""
+    pool, limit, _, _ = _get_pool(workers, _response_matrix)
+    limit.value = max_limit
+    answers = list(answers)
+    # deal out the ranked guesses so every shard starts with strong ones
+    order = _rank_guesses(guesses, answers)
+    shards = [order[i::workers * 4] for i in range(workers * 4)]
+    tasks = [([guesses[i] for i in shard], answers, mode, max_limit, shared)
+             for shard in shards]
+    worst = np.zeros(len(guesses), dtype=np.int64)
+    with progress_bar(total=len(guesses), leave=False, ascii=PROGRESS,
+                      disable=not show) as progress:
+        for shard, result in zip(shards, pool.imap(_worst_case_shard, tasks)):
+            worst[shard] = np.minimum(result, max_limit + 1)
+            progress.update(len(shard))
+    return worst
 
 
 def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
                  mode: Optional[GameMode] = None, *,
                  max_limit: Optional[int] = None, show: bool = False,
-                 return_all: bool = False, use_cache: bool = True
+                 return_all: bool = False, use_cache: bool = True,
+                 workers: Optional[int] = None, rng: Optional[Random] = None
                  ) -> Union[list[str], dict[str, int]]:
     """Finds the best guesses to narrow down the remaining possible answers.
 
     This function minimizes the worst-case scenario for every legal guess.
-    It will iterate through each possible guess, then for each guess, it will
-    iterate through every remaining possible answer. For each guess-answer
-    pair, the expected response is found, then that response is used to filter
-    the remaining answers. Whichever response results in the largest number of
-    remaining answers is recorded as the worst-case result for that guess. The
+    For each guess, the remaining answers are split into groups based on the
+    response each answer would give (see `get_partition_sizes`). The size of
+    the largest group is recorded as the worst-case result for that guess. The
     function will then return either a list of all guesses with the smallest
     worst-case result or a dict containing the worst-case for every guess.
 
@@ -492,8 +1716,17 @@ def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
             A boolean value representing whether to return the worst-case count
             for all guesses as a dict (default: False)
         use_cache:
-            A boolean value representing whether to use previously-calculated
-            response data being stored by the program (default: True)
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+        workers:
+            The number of processes used to score the guesses; each process
+            reads the ResponseMatrix from shared memory and the current best
+            worst-case count is shared between them. This is ignored in liar
+            mode or when no matrix is used. If not set, the value given to
+            `set_workers` is used instead (default: None)
+        rng:
+            The random number generator used to choose the lies in liar mode,
+            or None to use the random module (default: None)
 
     Returns:
         A list of all guesses which minimize the worst-case number of remaining
@@ -506,21 +1739,37 @@ def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
         guesses = answers
     if max_limit is None:
         max_limit = len(answers)
-    worst_case = dict([(x, 0) for x in guesses])
-    score = dict([(x, {}) for x in guesses])
-    for guess in tqdm(guesses, leave=False, ascii=PROGRESS, disable=not show):
-        for answer in answers:
-            response = get_response(guess, answer, mode, use_cache=use_cache)
-            if response not in score[guess]:
-                score[guess][response] = count_remaining(answers, guess,
-                                                         response, mode,
-                                                         limit=max_limit,
-                                                         use_cache=use_cache)
-            worst_case[guess] = max(worst_case[guess], score[guess][response])
-            if worst_case[guess] > max_limit:
-                break
-        if not return_all:
-            max_limit = min(max_limit, worst_case[guess])
+    if workers is None:
+        workers = _workers
+    if mode.liar:
+        codes = get_response_codes(guesses, answers, mode, use_cache=use_cache)
+        lies = np.random.default_rng((getrandbits if rng is None
+                                      else rng.getrandbits)(64))
+        worst = np.zeros(len(guesses), dtype=np.int64)
+        for start in progress_bar(range(0, len(guesses), _RANKED_BATCH),
+                                  leave=False, ascii=PROGRESS,
+                                  disable=not show):
+            end = start + _RANKED_BATCH
+            worst[start:end] = _liar_scores(codes[start:end], lies).max(
+                axis=1, initial=0)
+        worst = np.minimum(worst, max_limit + 1).tolist()
+        worst_case = dict(zip(guesses, worst))
+        if not return_all and len(worst) > 0:
+            max_limit = min(max_limit, min(worst))
+    else:
+        if (workers > 1 and use_cache and _response_matrix is not None
+                and _response_matrix.master == mode.master
+                and len(guesses) >= _MIN_PARALLEL_GUESSES):
+            worst = _parallel_worst_case(guesses, answers, mode, max_limit,
+                                         not return_all, workers, show)
+        else:
+            worst = _bounded_worst_case(guesses, answers, mode, max_limit,
+                                        not return_all, show=show,
+                                        use_cache=use_cache)
+        worst = worst.tolist()
+        worst_case = dict(zip(guesses, worst))
+        if not return_all and len(worst) > 0:
+            max_limit = min(max_limit, min(worst))
     if return_all:
         return worst_case
     best = [x for x in guesses if worst_case[x] == max_limit]
@@ -532,18 +1781,17 @@ def best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
 
 def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
                      mode: Optional[GameMode] = None, *, show: bool = False,
-                     return_all: bool = False, use_cache: bool = True
-                     ) -> list[str]:
+                     return_all: bool = False, use_cache: bool = True,
+                     rng: Optional[Random] = None) -> list[str]:
     """Finds the best guesses to narrow down the remaining possible answers.
 
-    This function minimizes the average result for every legal guess. It will
-    iterate through each possible guess, then for each guess, it will iterate
-    through every remaining possible answer. For each guess-answer pair, the
-    expected response is found, then that response is used to filter the
-    remaining answers. The number of answers remaining is added to the total at
-    each step to determine the average. The function will then return either a
-    list of all guesses with the smallest average result or a dict containing
-    the average for every guess.
+    This function minimizes the average result for every legal guess. For each
+    guess, the remaining answers are split into groups based on the response
+    each answer would give (see `get_partition_sizes`). Every answer leaves
+    behind the other answers in its own group, so the average is the sum of the
+    squared group sizes divided by the number of answers. The function will
+    then return either a list of all guesses with the smallest average result
+    or a dict containing the average for every guess.
 
     Args:
         answers:
@@ -563,8 +1811,11 @@ def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
             A boolean value representing whether to return the worst-case count
             for all guesses as a dict (default: False)
         use_cache:
-            A boolean value representing whether to use previously-calculated
-            response data being stored by the program (default: True)
+            A boolean value representing whether to read the responses from
+            the current ResponseMatrix (default: True)
+        rng:
+            The random number generator used to choose the lies in liar mode,
+            or None to use the random module (default: None)
 
     Returns:
         A list of all guesses which minimize the average number of remaining
@@ -576,19 +1827,26 @@ def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
     if mode.hard or guesses is None or len(guesses) == 0:
         guesses = answers
     average = dict([(x, 0.0) for x in guesses])
-    count = dict([(x, {}) for x in guesses])
     best_avg = len(answers)
-    for guess in tqdm(guesses, leave=False, ascii=PROGRESS, disable=not show):
-        for answer in answers:
-            response = get_response(guess, answer, mode, use_cache=use_cache)
-            if response not in count[guess]:
-                count[guess][response] = count_remaining(answers, guess,
-                                                         response, mode,
-                                                         use_cache=use_cache)
-            average[guess] += count[guess][response]
-        average[guess] /= len(answers)
-        if average[guess] < best_avg:
-            best_avg = average[guess]
+    if mode.liar:
+        codes = get_response_codes(guesses, answers, mode, use_cache=use_cache)
+        lies = np.random.default_rng((getrandbits if rng is None
+                                      else rng.getrandbits)(64))
+        totals = np.zeros(len(guesses), dtype=np.int64)
+        for start in progress_bar(range(0, len(guesses), _RANKED_BATCH),
+                                  leave=False, ascii=PROGRESS,
+                                  disable=not show):
+            end = start + _RANKED_BATCH
+            totals[start:end] = _liar_scores(codes[start:end], lies).sum(axis=1)
+        average = dict((x, t / len(answers))
+                       for x, t in zip(guesses, totals.tolist()))
+    else:
+        sizes = get_partition_sizes(guesses, answers, mode, show=show,
+                                    use_cache=use_cache)
+        totals = (sizes * sizes).sum(axis=1).tolist()
+        average = dict((x, t / len(answers)) for x, t in zip(guesses, totals))
+    if len(average) > 0:
+        best_avg = min(best_avg, min(average.values()))
     if return_all:
         return average
     best = [x for x in guesses if average[x] == best_avg]
@@ -598,9 +1856,89 @@ def best_avg_guesses(answers: list[str], guesses: Optional[list[str]] = None,
     return best
 
 
+def cached_best_guesses(answers: list[str], guesses: Optional[list[str]] = None,
+                        mode: Optional[GameMode] = None, *,
+                        strategy: str = 'worst', show: bool = False,
+                        return_all: bool = False,
+                        refine: Optional[Callable[[], list[str]]] = None,
+                        rng: Optional[Random] = None,
+                        ranked: Optional[int] = None
+                        ) -> Union[list[str], dict[str, Union[int, float]]]:
+    """Finds the best guesses, reusing the result from the GuessCache if set.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses; if not set, the answer list will be
+            used instead (default: None)
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        strategy:
+            Either 'worst' to use `best_guesses` or 'average' to use
+            `best_avg_guesses` (default: 'worst')
+        show:
+            A boolean value representing whether a progress bar should be shown
+            (default: False)
+        return_all:
+            A boolean value representing whether to return the score for all
+            guesses as a dict (default: False)
+        refine:
+            A function returning a smaller list of guesses with the same best
+            guesses (such as `useful_guesses`), which is only called when the
+            result is not already cached; this is ignored when `return_all` or
+            `ranked` is set (default: None)
+        rng:
+            The random number generator used to choose the lies in liar mode,
+            or None to use the random module (default: None)
+        ranked:
+            If set, the number of guesses to return, ordered from the best
+            score to the worst, instead of only the best guesses; this is
+            ignored when `return_all` is set (default: None)
+
+    Returns:
+        The same value as `best_guesses` or `best_avg_guesses`, or a list of
+        the `ranked` best guesses. Only lists of guesses are cached; results in
+        liar mode depend on randomly chosen lies, and `return_all` results are
+        too large, so neither is cached.
+    """
+    if mode is None:
+        mode = GameMode()
+    if guesses is None or len(guesses) == 0:
+        guesses = answers
+    find = best_avg_guesses if strategy == 'average' else best_guesses
+    if return_all:
+        ranked = None
+    params = {} if ranked is None else {'ranked': ranked}
+    key = None
+    if _guess_cache is not None and not mode.liar and not return_all:
+        key = GuessCache.key(answers, guesses, mode, strategy,
+                             return_all=return_all, **params)
+        result = _guess_cache.get(key)
+        if result is not None:
+            return result
+    if ranked is not None:
+        scores = find(answers, guesses, mode, show=show, return_all=True,
+                      rng=rng)
+        result = sorted(scores, key=scores.get)[:ranked]
+    else:
+        if refine is not None and not return_all:
+            guesses = refine()
+        result = find(answers, guesses, mode, show=show,
+                      return_all=return_all, rng=rng)
+    if key is not None:
+        _guess_cache.put(key, result)
+    return result
+
+
 def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
                         mode: Optional[GameMode] = None, depth: int = 0,
-                        *, show: bool = True) -> dict:
+                        *, show: bool = True,
+                        table: Optional[dict[tuple[str, int], dict]] = None,
+                        workers: Optional[int] = None) -> dict:
     """Recursively builds a minimal decision tree for the given starting guess.
 
     Args:
@@ -621,21 +1959,46 @@ def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
         show:
             A boolean value representing whether a progress bar should be shown
             (default: False)
+        table:
+            A transposition table which maps the `fingerprint` of a set of
+            remaining answers and the depth left to the subtree that solves
+            them, or to an empty dict if there is none. The same answers are
+            often reached through different guesses, so each one only has to
+            be solved once, and a subtree found with less depth is reused for
+            any greater depth. Pass the same dict to later calls with the same
+            `guesses` and `mode` to reuse their work (default: None)
+        workers:
+            The number of processes used to solve the response groups of
+            `start`; each group is solved in its own process, and the rest are
+            cancelled as soon as any group fails. The entries found by a worker
+            are only added to `table` once its whole group is solved, so a
+            journal (see `data.TreeJournal`) cannot save a group that is only
+            partly solved. This is ignored when no ResponseMatrix is used. If
+            not set, the value given to `set_workers` is used instead
+            (default: None)
 
     Returns:
         A dict which maps a str to a dict. The first key will be the starting
         guess, and this will return a dict with a key for every valid response
-        at this point in the tree. Using one of those keys will access another
-        dict with a key for each of the best guesses given that response. This
-        pattern will continue down the tree, alternating guess then response,
-        until the only remaining response is that all letters are correct.
+        code at this point in the tree. Using one of those keys will access
+        another dict with a key for each of the best guesses given that
+        response. This pattern will continue down the tree, alternating guess
+        then response, until the only remaining response is that all letters
+        are correct. Identical subtrees are shared between branches.
     """
     if depth == 0:
         return {}
     if mode is None:
         mode = GameMode()
+    if table is None:
+        table = {}
+    if workers is None:
+        workers = _workers
+    if workers > 1 and depth > 1 and _response_matrix is not None:
+        return _parallel_build_tree(answers, guesses, start, mode, depth,
+                                    table, workers, show)
     tree = {start: {}}
-    for answer in tqdm(answers, ascii=PROGRESS, disable=not show):
+    for answer in progress_bar(answers, ascii=PROGRESS, disable=not show):
         response = get_response(start, answer, mode)
         if response in tree[start]:
             continue
@@ -645,15 +2008,157 @@ def rec_build_best_tree(answers: list[str], guesses: list[str], start: str,
             # if there is only one option, then it must be the best guess
             tree[start][response] = {filtered[0]: {}}
             continue
-        info = best_guesses(filtered, guesses, return_all=True)
-        valid_path = {}
-        limit = 2 ** (depth + 3)
-        for next_guess in sorted(guesses, key=lambda x: info[x])[:limit]:
-            valid_path = rec_build_best_tree(filtered, guesses, next_guess,
-                                             mode, depth - 1, show=False)
-            if next_guess in valid_path:
-                break
-        if len(valid_path) == 0:
+        key = (fingerprint(filtered), depth - 1)
+        subtree = _known_subtree(table, key)
+        if subtree is None:
+            subtree = _rec_build_subtree(filtered, guesses, mode, depth, table)
+            table[key] = subtree
+        if len(subtree) == 0:
             return {}  # if any response has no valid paths, this guess failed
-        tree[start][response] = valid_path
+        tree[start][response] = subtree
     return tree
+
+
+def _known_subtree(table: dict[tuple[str, int], dict], key: tuple[str, int]
+                   ) -> Optional[dict]:
+    """Helper function for `rec_build_best_tree`.
+
+    A subtree which solves the answers with less depth also solves them with
+    the full depth, so those are reused as well. Returns None if the answers
+    have not been searched with this depth yet.
+    """
+    if key in table:
+        return table[key]
+    answers_id, depth = key
+    for shallower in range(depth - 1, 0, -1):
+        if len(table.get((answers_id, shallower), {})) > 0:
+            return table[(answers_id, shallower)]
+    return None
+
+
+def deepen_best_tree(answers: list[str], guesses: list[str], start: str,
+                     mode: Optional[GameMode] = None, *, min_depth: int = 2,
+                     max_depth: int = 6, show: bool = True,
+                     table: Optional[dict[tuple[str, int], dict]] = None,
+                     workers: Optional[int] = None
+                     ) -> Iterator[tuple[int, dict, float]]:
+    """Builds the shallowest decision tree for the given starting guess.
+
+    This calls `rec_build_best_tree` with a depth limit that is raised by one
+    after every failed attempt. All attempts share one transposition table, so
+    every subtree solved and every failure proven at a smaller depth is reused
+    instead of searched again.
+
+    Args:
+        answers:
+            The list of all remaining possible answers
+        guesses:
+            The list of all valid guesses
+        start:
+            The starting guess to use as the root of the decision tree
+        mode:
+            A GameMode class instance representing the current game mode
+            (default: None)
+
+    Keyword Args:
+        min_depth:
+            The first depth limit to try (default: 2)
+        max_depth:
+            The last depth limit to try (default: 6)
+        show:
+            A boolean value representing whether a progress bar should be shown
+            (default: True)
+        table:
+            The transposition table to use (see `rec_build_best_tree`)
+            (default: None)
+        workers:
+            The number of processes to use (see `rec_build_best_tree`)
+            (default: None)
+
+    Yields:
+        A 3-tuple for each depth that was tried, containing the depth, the tree
+        that was built (or an empty dict if there was none), and the number of
+        seconds spent on that depth. This stops after the first tree is found.
+    """
+    if table is None:
+        table = {}
+    for depth in range(min_depth, max_depth + 1):
+        begin = time.perf_counter()
+        tree = rec_build_best_tree(answers, guesses, start, mode, depth,
+                                   show=show, table=table, workers=workers)
+        yield depth, tree, time.perf_counter() - begin
+        if len(tree) > 0:
+            return
+
+
+def _rec_build_subtree(answers: list[str], guesses: list[str], mode: GameMode,
+                       depth: int, table: dict[tuple[str, int], dict]) -> dict:
+    """Helper function for `rec_build_best_tree`."""
+    valid_path = {}
+    limit = 2 ** (depth + 3)
+    for next_guess in cached_best_guesses(answers, guesses, ranked=limit):
+        if _worker_cancel is not None and _worker_cancel.value:
+            return {}  # another response group has already failed
+        valid_path = rec_build_best_tree(answers, guesses, next_guess, mode,
+                                         depth - 1, show=False, table=table,
+                                         workers=1)
+        if next_guess in valid_path:
+            break
+    return valid_path
+
+
+def _subtree_task(task: tuple) -> tuple[int, dict, dict]:
+    """Solves one response group for `_parallel_build_tree` in a worker, and
+    returns its transposition table along with the subtree."""
+    response, answers, guesses, mode, depth = task
+    if _worker_cancel.value:
+        return response, {}, {}
+    table = {}
+    subtree = _rec_build_subtree(answers, guesses, mode, depth, table)
+    if _worker_cancel.value:
+        return response, {}, {}  # cut short, so its failures are not proven
+    return response, subtree, table
+
+
+def _parallel_build_tree(answers: list[str], guesses: list[str], start: str,
+                         mode: GameMode, depth: int,
+                         table: dict[tuple[str, int], dict], workers: int,
+                         show: bool) -> dict:
+    """Helper function for `rec_build_best_tree` which uses a process pool."""
+    groups = {}
+    for answer in answers:
+        response = get_response(start, answer, mode)
+        if response not in groups:
+            groups[response] = filter_remaining(answers, start, response,
+                                                mode)
+    subtrees = {}
+    tasks = []
+    for response, filtered in groups.items():
+        known = _known_subtree(table, (fingerprint(filtered), depth - 1))
+        if len(filtered) == 1:
+            subtrees[response] = {filtered[0]: {}}
+        elif known is None:
+            tasks.append((response, list(filtered), guesses, mode, depth))
+        elif len(known) == 0:
+            return {}  # a known failure, so there is nothing left to solve
+        else:
+            subtrees[response] = known
+    pool, _, _, cancel = _get_pool(workers, _response_matrix)
+    cancel.value = 0
+    with progress_bar(total=len(groups), initial=len(groups) - len(tasks),
+                      ascii=PROGRESS, disable=not show) as progress:
+        results = pool.imap_unordered(_subtree_task, tasks)
+        for response, subtree, worker_table in results:
+            for key, known in worker_table.items():
+                if key not in table:  # also saves it if this is a journal
+                    table[key] = known
+            filtered = groups[response]
+            table[(fingerprint(filtered), depth - 1)] = subtree
+            subtrees[response] = subtree
+            progress.update()
+            if len(subtree) == 0:
+                cancel.value = 1
+                for _ in results:
+                    pass  # let the cancelled tasks finish before returning
+                return {}
+    return {start: dict((response, subtrees[response]) for response in groups)}
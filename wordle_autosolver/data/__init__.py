@@ -1,11 +1,55 @@
 import os
-from json import load, dump
+import time
+import struct
+from hashlib import sha256
+from json import load, dump, loads, dumps
+from typing import Optional, Union
+
+import numpy as np
+
+try:  # pragma: no cover
+    from common import ResponseMatrix, encode_response, decode_response
+    from common import GuessCache, GameMode, fingerprint, PackedTree
+    from common import LazyTree
+except ModuleNotFoundError:  # this is only here to help pytest find the module
+    from wordle_autosolver.common import ResponseMatrix, encode_response
+    from wordle_autosolver.common import decode_response, GuessCache
+    from wordle_autosolver.common import GameMode, fingerprint, PackedTree
+    from wordle_autosolver.common import LazyTree
 
 
 DATA_PATH = os.path.relpath(__file__)
 DATA_PATH = '/'.join(DATA_PATH.split('/' if '/' in DATA_PATH else '\\')[:-1])
 DATA_PATH += '/'
 
+# binary layout of a response matrix file: a fixed-size header followed by the
+# raw `uint8` response codes in row-major (guess, answer) order
+MATRIX_MAGIC = b'WRSP'
+MATRIX_VERSION = 2
+MATRIX_HEADER = struct.Struct('<4sHH32sII')  # magic, version, master, checksum,
+MATRIX_OFFSET = 64                           # number of rows and columns
+GUESS_CACHE_FILE = 'guess_cache.json'
+# binary layout of a packed decision tree file: a fixed-size header followed by
+# the arrays of a PackedTree, each starting on an 8-byte boundary
+TREE_MAGIC = b'WTRE'
+TREE_VERSION = 1
+TREE_HEADER = struct.Struct('<4sHHIIII')  # magic, version, word width, number
+TREE_OFFSET = 64                          # of words, nodes, guesses, branches
+MAX_TREE_DELTAS = 4096  # new branches appended before the JSON is rewritten
+# binary layout of the word pack: a fixed-size header followed by every word
+# used by the program, their frequencies and the ids of each word list, with
+# each array starting on an 8-byte boundary
+PACK_FILE = 'words.pack'
+PACK_MAGIC = b'WPAK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sHH6I')  # magic, version, word width, number
+PACK_OFFSET = 64                        # of words, frequencies and list ids
+PACK_SOURCES = {  # the JSON file each part of the word pack is built from
+    'freq': 'freq_map.json', 'guesses': 'allowed_guesses.json',
+    'nordle': 'allowed_nordle.json', 'curated': 'curated_answers.json',
+    'nyt': 'nyt_answers.json'
+}
+
 
 def format_bytes(num_bytes: int) -> str:
     """Generates a human readable str version of the given number of bytes.
@@ -39,10 +83,505 @@ def format_bytes(num_bytes: int) -> str:
     return str(value) + suffix
 
 
+def tree_from_json(tree: dict) -> dict:
+    """Converts the response keys of a decision tree read from JSON to codes.
+
+    Args:
+        tree:
+            A dict representing a decision tree, where each response is stored
+            as a string of `RIGHT`, `CLOSE`, and `WRONG` symbols
+
+    Returns:
+        A new dict with the same structure, where each response is stored as
+        its base-3 response code.
+    """
+    return dict((guess, dict((encode_response(response), tree_from_json(sub))
+                             for response, sub in branches.items()))
+                for guess, branches in tree.items())
+
+
+def tree_to_json(tree: dict) -> dict:
+    """Converts the response codes of a decision tree back to strings.
+
+    This is the inverse of `tree_from_json`.
+    """
+    return dict((guess, dict((decode_response(response), tree_to_json(sub))
+                             for response, sub in branches.items()))
+                for guess, branches in tree.items())
+
+
+def packed_tree_from_json(tree: dict) -> PackedTree:
+    """Converts a decision tree read from JSON to a PackedTree."""
+    return PackedTree.from_dict(tree_from_json(tree))
+
+
+def packed_tree_to_json(packed: PackedTree) -> dict:
+    """Converts a PackedTree to a decision tree that can be saved as JSON.
+
+    This is the inverse of `packed_tree_from_json`.
+    """
+    return tree_to_json(packed.to_dict())
+
+
+def _tree_sections(width: int, words: int, nodes: int, guesses: int,
+                   branches: int) -> list[tuple[str, str, int, int]]:
+    """Returns the name, dtype, length and offset of every array stored in a
+    packed decision tree file with the given header values."""
+    sections, offset = [], TREE_OFFSET
+    for name, dtype, length in (('words', 'S{}'.format(width), words),
+                                ('node_start', '<u4', nodes + 1),
+                                ('guess_ids', '<u4', guesses),
+                                ('branch_start', '<u4', guesses + 1),
+                                ('children', '<u4', branches),
+                                ('codes', 'u1', branches)):
+        sections.append((name, dtype, length, offset))
+        offset += -(-np.dtype(dtype).itemsize * length // 8) * 8
+    return sections
+
+
+def save_packed_tree(packed: PackedTree, filename: str) -> None:
+    """Saves a PackedTree to a binary file in the data folder.
+
+    Args:
+        packed:
+            The PackedTree instance to save
+        filename:
+            The name of the file, relative to the data folder
+    """
+    width = packed.words.dtype.itemsize
+    header = (TREE_MAGIC, TREE_VERSION, width, len(packed.words), len(packed),
+              len(packed.guess_ids), len(packed.codes))
+    path = DATA_PATH + filename
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as file:
+        file.write(TREE_HEADER.pack(*header).ljust(TREE_OFFSET, b'\0'))
+        for name, dtype, _, offset in _tree_sections(*header[2:]):
+            file.write(b'\0' * (offset - file.tell()))
+            np.ascontiguousarray(getattr(packed, name), dtype=dtype
+                                 ).tofile(file)
+    os.replace(temp_path, path)  # other processes never see a partial file
+
+
+def load_packed_tree(filename: str) -> Optional[PackedTree]:
+    """Opens a PackedTree saved by `save_packed_tree` as a memory map.
+
+    Args:
+        filename:
+            The name of the file, relative to the data folder
+
+    Returns:
+        A PackedTree instance backed by the file on disk, or None if the file
+        does not exist or is not a packed decision tree file.
+    """
+    try:
+        with open(DATA_PATH + filename, 'rb') as file:
+            header = file.read(TREE_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != TREE_HEADER.size:
+        return None
+    header = TREE_HEADER.unpack(header)
+    if header[:2] != (TREE_MAGIC, TREE_VERSION):
+        return None
+    data = np.memmap(DATA_PATH + filename, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, dtype, length, offset in _tree_sections(*header[2:]):
+        size = np.dtype(dtype).itemsize * length
+        arrays[name] = data[offset:offset + size].view(dtype)
+    return PackedTree(**arrays)
+
+
+def load_saved_tree(filename: str) -> LazyTree:
+    """Opens a saved decision tree without reading all of it.
+
+    The first time a JSON tree is opened (or whenever it has changed), it is
+    converted to a packed tree file with the same name and a '.tree'
+    extension, which is memory-mapped from then on. Any branches appended to
+    the '.delta' file by `save_saved_tree` are then added back to the tree.
+
+    Args:
+        filename:
+            The name of the JSON file, relative to the data folder
+
+    Returns:
+        A LazyTree instance holding the saved tree.
+    """
+    base = DATA_PATH + filename[:-len('.json')]
+    packed = None
+    if (os.path.exists(base + '.tree') and os.path.getmtime(base + '.tree')
+            >= os.path.getmtime(DATA_PATH + filename)):
+        packed = load_packed_tree(filename[:-len('.json')] + '.tree')
+    if packed is None:
+        with open(DATA_PATH + filename, 'r') as bestf:
+            packed = packed_tree_from_json(load(bestf))
+        save_packed_tree(packed, filename[:-len('.json')] + '.tree')
+    tree = LazyTree(packed)
+    try:
+        with open(base + '.delta', 'r') as deltas:
+            lines = deltas.read().split('\n')
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            path = loads(line)
+        except ValueError:
+            continue  # the last line may have been cut off
+        node = tree
+        for index in range(0, len(path) - 1, 2):
+            node, _ = node.descend(path[index],
+                                   encode_response(path[index + 1]))
+        if len(path) % 2 == 1:
+            node[path[-1]] = {}
+    tree.saved = len(tree.log)
+    return tree
+
+
+def save_saved_tree(tree: Union[dict, LazyTree], filename: str,
+                    allow_print: bool = True) -> None:
+    """Saves a decision tree as JSON, or appends the branches added to it.
+
+    Branches added to a LazyTree are appended to the '.delta' file read by
+    `load_saved_tree`, so only the new parts of the tree are written. Once
+    more than `MAX_TREE_DELTAS` branches have been added (or if `tree` is a
+    dict), the whole tree is written to the JSON file instead.
+
+    Args:
+        tree:
+            A dict or LazyTree representing the decision tree to save
+        filename:
+            The name of the JSON file, relative to the data folder
+        allow_print:
+            A boolean value representing whether to allow print statements
+            (default: True)
+    """
+    base = DATA_PATH + filename[:-len('.json')]
+    if isinstance(tree, LazyTree) and len(tree.log) <= MAX_TREE_DELTAS:
+        path = base + '.delta'
+        before = format_bytes(os.path.getsize(path)
+                              if os.path.exists(path) else 0)
+        with open(path, 'a') as deltas:
+            for entry in tree.log[tree.saved:]:
+                deltas.write(dumps([decode_response(part) if index % 2 else
+                                    part for index, part in enumerate(entry)])
+                             + '\n')
+        tree.saved = len(tree.log)
+        filename = filename[:-len('.json')] + '.delta'
+    else:
+        path = DATA_PATH + filename
+        before = format_bytes(os.path.getsize(path))
+        with open(path, 'w') as bestf:
+            dump(tree_to_json(tree), bestf, sort_keys=True, indent=2)
+        for stale in (base + '.tree', base + '.delta'):
+            if os.path.exists(stale):
+                os.remove(stale)
+        if isinstance(tree, LazyTree):
+            tree.saved = len(tree.log)
+    after = format_bytes(os.path.getsize(path))
+    if allow_print:
+        print('  "{}"  {:>8} > {:<8}'.format(filename, before, after))
+
+
+class TreeJournal(dict):
+    """A transposition table for `rec_build_best_tree` saved as it grows.
+
+    Every entry added to the table is also appended to a journal file, one
+    JSON object per line, so an interrupted tree build can be resumed without
+    searching the same answers again. The first line identifies the word lists
+    and game mode that the entries belong to. New lines are written to disk at
+    most every `interval` seconds, and when `flush` or `close` is called.
+    Unless `resume` is set, a journal which already holds entries is never
+    overwritten, and a FileExistsError is raised instead.
+    """
+
+    def __init__(self, path: str, build_id: str, resume: bool = False,
+                 interval: float = 60.0) -> None:
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self._pending = []
+        if not resume and TreeJournal.has_entries(path):
+            raise FileExistsError(path)
+        saved = self._read(build_id) if resume else []
+        with open(path + '.tmp', 'w') as journal:  # drop any cut-off line
+            journal.write(''.join(line + '\n' for line
+                                  in [dumps({'build': build_id})] + saved))
+        os.replace(path + '.tmp', path)
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def has_entries(path: str) -> bool:
+        """Returns True if the journal at `path` holds at least one entry."""
+        try:
+            with open(path, 'r') as journal:
+                journal.readline()  # skip the header
+                return journal.readline() != ''
+        except OSError:
+            return False
+
+    def _read(self, build_id: str) -> list[str]:
+        """Adds every complete entry from an existing journal to the table,
+        and returns the lines holding them."""
+        try:
+            with open(self.path, 'r') as journal:
+                lines = journal.read().split('\n')
+        except OSError:
+            return []
+        try:
+            if loads(lines[0]) != {'build': build_id}:
+                return []  # this journal belongs to a different build
+        except ValueError:
+            return []
+        saved = []
+        for line in lines[1:]:
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue  # the last line may have been cut off
+            super().__setitem__((entry['answers'], entry['depth']),
+                                tree_from_json(entry['tree']))
+            saved.append(line)
+        return saved
+
+    def __setitem__(self, key: tuple[str, int], subtree: dict) -> None:
+        super().__setitem__(key, subtree)
+        self._pending.append(dumps({'answers': key[0], 'depth': key[1],
+                                    'tree': tree_to_json(subtree)}))
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends every entry added since the last flush to the journal."""
+        if len(self._pending) > 0:
+            with open(self.path, 'a') as journal:
+                journal.write('\n'.join(self._pending) + '\n')
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flushes any remaining entries to the journal."""
+        self.flush()
+
+
+def open_tree_journal(start: str, answers: list[str], guesses: list[str],
+                      mode: GameMode, resume: bool = False) -> TreeJournal:
+    """Opens the journal used to checkpoint the tree for a starting guess.
+
+    Args:
+        start:
+            The starting guess used as the root of the decision tree
+        answers:
+            The list of all possible answers
+        guesses:
+            The list of all valid guesses
+        mode:
+            A GameMode class instance representing the current game mode
+        resume:
+            A boolean value representing whether to keep the entries from an
+            earlier build with the same arguments; if the journal belongs to a
+            different build, it is started over, and if this is not set, a
+            FileExistsError is raised when the journal holds any entries
+            (default: False)
+
+    Returns:
+        A TreeJournal instance stored in "data/<start>_<mode>.journal", where
+        `mode` is the value of the game mode flags, so builds in other game
+        modes keep their own journals.
+    """
+    mode_value = mode.value & GameMode.MODE_MASK
+    build_id = fingerprint([start, str(mode_value), fingerprint(answers),
+                            fingerprint(guesses)])
+    return TreeJournal(DATA_PATH + '{}_{}.journal'.format(start, mode_value),
+                       build_id, resume)
+
+
+def _pack_sections(width: int, words: int, freq: int, guesses: int,
+                   nordle: int, curated: int, nyt: int
+                   ) -> list[tuple[str, str, int, int]]:
+    """Returns the name, dtype, length and offset of every array stored in the
+    word pack with the given header values."""
+    sections, offset = [], PACK_OFFSET
+    for name, dtype, length in (('words', 'S{}'.format(width), words),
+                                ('freq', '<f4', freq),
+                                ('guesses', '<u4', guesses),
+                                ('nordle', '<u4', nordle),
+                                ('curated', '<u4', curated),
+                                ('nyt', '<u4', nyt)):
+        sections.append((name, dtype, length, offset))
+        offset += -(-np.dtype(dtype).itemsize * length // 8) * 8
+    return sections
+
+
+def build_word_pack(allow_print: bool = True) -> None:
+    """Rebuilds the word pack from the JSON word lists in the data folder.
+
+    Every distinct word is stored once, in a fixed-width byte array, and each
+    word list is stored as an array of ids into it. The words with a known
+    frequency come first, so the `float32` frequencies line up with the
+    start of the word array.
+
+    Args:
+        allow_print:
+            A boolean value representing whether to allow print statements
+            (default: True)
+    """
+    if allow_print:  # pragma: no cover
+        print('Building word pack from the JSON word lists...')
+    sources = {}
+    for name, filename in PACK_SOURCES.items():
+        with open(DATA_PATH + filename, 'r') as source:
+            sources[name] = load(source)
+    words = list(sources['freq'])
+    for name in list(PACK_SOURCES)[1:]:
+        words += sources[name]
+    words = list(dict.fromkeys(words))
+    ids = dict((w, i) for i, w in enumerate(words))
+    width = max([1] + [len(w) for w in words])
+    header = (PACK_MAGIC, PACK_VERSION, width, len(words),
+              len(sources['freq'])) + tuple(
+                  len(sources[name]) for name in list(PACK_SOURCES)[1:])
+    arrays = dict((name, [ids[w] for w in sources[name]])
+                  for name in list(PACK_SOURCES)[1:])
+    arrays['words'] = np.array([w.encode('ascii') for w in words],
+                               dtype='S{}'.format(width))
+    arrays['freq'] = list(sources['freq'].values())
+    path = DATA_PATH + PACK_FILE
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as file:
+        file.write(PACK_HEADER.pack(*header).ljust(PACK_OFFSET, b'\0'))
+        for name, dtype, _, offset in _pack_sections(*header[2:]):
+            file.write(b'\0' * (offset - file.tell()))
+            np.asarray(arrays[name], dtype=dtype).tofile(file)
+    os.replace(temp_path, path)  # other processes never see a partial file
+
+
+def _read_word_pack() -> Optional[dict[str, np.ndarray]]:
+    """Opens the arrays of the word pack as views of one memory map, or
+    returns None if the file does not exist or is not a word pack."""
+    try:
+        with open(DATA_PATH + PACK_FILE, 'rb') as file:
+            header = file.read(PACK_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != PACK_HEADER.size:
+        return None
+    header = PACK_HEADER.unpack(header)
+    if header[:2] != (PACK_MAGIC, PACK_VERSION):
+        return None
+    data = np.memmap(DATA_PATH + PACK_FILE, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, dtype, length, offset in _pack_sections(*header[2:]):
+        size = np.dtype(dtype).itemsize * length
+        arrays[name] = data[offset:offset + size].view(dtype)
+    return arrays
+
+
+def load_word_pack(allow_print: bool = True) -> dict[str, np.ndarray]:
+    """Opens the word pack, rebuilding it first if it is missing or older
+    than any of its JSON sources.
+
+    Args:
+        allow_print:
+            A boolean value representing whether to allow print statements
+            (default: True)
+
+    Returns:
+        A dict mapping 'words' to the array of every word, 'freq' to the
+        frequency of each of the first words, and 'guesses', 'nordle',
+        'curated' and 'nyt' to the ids of the words in each list. Every array
+        is a read-only view of the file on disk.
+    """
+    path = DATA_PATH + PACK_FILE
+    arrays = None
+    if os.path.exists(path) and os.path.getmtime(path) >= max(
+            os.path.getmtime(DATA_PATH + filename)
+            for filename in PACK_SOURCES.values()):
+        arrays = _read_word_pack()
+    if arrays is None:
+        build_word_pack(allow_print)
+        arrays = _read_word_pack()
+    return arrays
+
+
+def _matrix_filename(master: bool, nyt: bool) -> str:
+    """Returns the name of the response matrix file for the given mode."""
+    return ('responses' + ('_nyt' if nyt else '')
+            + ('_master' if master else '') + '.bin')
+
+
+def _word_list_checksum(guesses: list[str], answers: list[str],
+                        master: bool) -> bytes:
+    """Returns a digest which changes whenever the word lists change."""
+    digest = sha256(b'master' if master else b'default')
+    digest.update('\n'.join(guesses).encode('ascii') + b'\0')
+    digest.update('\n'.join(answers).encode('ascii'))
+    return digest.digest()
+
+
+def _read_matrix_header(path: str) -> tuple:
+    """Reads the header of a response matrix file, or returns an empty tuple
+    if the file does not exist or is not a response matrix file."""
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(MATRIX_HEADER.size)
+    except FileNotFoundError:
+        return ()
+    if len(header) != MATRIX_HEADER.size:
+        return ()
+    return MATRIX_HEADER.unpack(header)
+
+
+def load_response_matrix(guesses: list[str], answers: list[str],
+                         master: bool = False, nyt: bool = False,
+                         allow_print: bool = True) -> ResponseMatrix:
+    """Opens the response matrix for the given word lists as a memory map.
+
+    The file is only read as pages are needed, and these pages are shared
+    through the OS page cache by every process which opens the same file. If
+    the file is missing, uses an older version, or was built from different
+    word lists, the entire matrix is calculated and the file is rewritten.
+
+    Args:
+        guesses:
+            The list of all valid guesses
+        answers:
+            The list of all possible answers
+        master:
+            A boolean value representing whether the game mode is Wordzy Master
+            (default: False)
+        nyt:
+            A boolean value representing whether `answers` is the New York
+            Times word list (default: False)
+        allow_print:
+            A boolean value representing whether to allow print statements
+            (default: True)
+
+    Returns:
+        A ResponseMatrix instance backed by the file on disk.
+    """
+    matrix = ResponseMatrix(guesses, answers, master)
+    shape = (len(matrix.guesses), len(matrix.answers))
+    checksum = _word_list_checksum(matrix.guesses, matrix.answers, master)
+    path = DATA_PATH + _matrix_filename(master, nyt)
+    expected = (MATRIX_MAGIC, MATRIX_VERSION, int(master), checksum) + shape
+    if _read_matrix_header(path) != expected:
+        if allow_print:  # pragma: no cover
+            print('Building response matrix (this only happens once)...')
+        matrix.fill(np.arange(shape[0]))
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as file:
+            file.write(MATRIX_HEADER.pack(*expected).ljust(MATRIX_OFFSET,
+                                                           b'\0'))
+            matrix.data.tofile(file)
+        os.replace(temp_path, path)  # other processes never see a partial file
+    matrix.set_data(np.memmap(path, dtype=np.uint8, mode='r',
+                              offset=MATRIX_OFFSET, shape=shape))
+    return matrix
+
+
 def load_all_data(hard: bool, master: bool, liar: bool, nyt=False,
                   allow_print=True
                   ) -> tuple[list[str], list[str], list[str],
-                             dict[str, float], dict, dict[str, str]]:
+                             dict[str, float], LazyTree, ResponseMatrix]:
     """Loads all data related to the current game mode.
 
     Args:
@@ -63,28 +602,21 @@ def load_all_data(hard: bool, master: bool, liar: bool, nyt=False,
         A 6-tuple containing the following items, in order: list of all
         possible answers, list of all valid guesses, list of all valid guesses
         specifically for nordle, dict mapping all valid guesses to their
-        frequency of use, dict representing the tree of best guesses, and dict
-        holding all precalculated response data.
+        frequency of use, LazyTree representing the tree of best guesses,
+        and a memory-mapped ResponseMatrix covering every valid guess and
+        possible answer.
     """
     if allow_print:  # pragma: no cover
         print('Loading precalculated data...')
-    freq_data = {}
-    with open(DATA_PATH + 'freq_map.json', 'r') as data:
-        freq_data = load(data)
-    ans_file = 'nyt_answers.json' if nyt else 'curated_answers.json'
-    answers = []
-    with open(DATA_PATH + ans_file, 'r') as curated:
-        answers = load(curated)
-    guesses = []
-    with open(DATA_PATH + 'allowed_guesses.json', 'r') as allowed:
-        guesses = load(allowed)
-    nordle_guesses = []
-    with open(DATA_PATH + 'allowed_nordle.json', 'r') as allowed:
-        nordle_guesses = load(allowed)
-    resp_file = 'responses' + ('_master' if master else '') + '.json'
-    resp_data = {}
-    with open(DATA_PATH + resp_file, 'r') as responses:
-        resp_data = load(responses)
+    pack = load_word_pack(allow_print)
+    width = pack['words'].dtype.itemsize
+    text = pack['words'].tobytes().decode('ascii')
+    words = [text[i:i + width] for i in range(0, len(text), width)]
+    freq_data = dict(zip(words, pack['freq'].tolist()))
+    answers = [words[i] for i in pack['nyt' if nyt else 'curated'].tolist()]
+    guesses = [words[i] for i in pack['guesses'].tolist()]
+    nordle_guesses = [words[i] for i in pack['nordle'].tolist()]
+    matrix = load_response_matrix(guesses, answers, master, nyt, allow_print)
     best_guess_file = 'best_guess.json'
     if nyt:
         best_guess_file = 'best_guess_nyt.json'
@@ -94,17 +626,15 @@ def load_all_data(hard: bool, master: bool, liar: bool, nyt=False,
         best_guess_file = 'best_guess_master.json'
     elif liar:
         best_guess_file = 'best_guess_liar.json'
-    saved_best = {}
-    with open(DATA_PATH + best_guess_file, 'r') as bestf:
-        saved_best = load(bestf)
+    saved_best = load_saved_tree(best_guess_file)
     if allow_print:  # pragma: no cover
         print('Finished loading.')
-    return answers, guesses, nordle_guesses, freq_data, saved_best, resp_data
+    return answers, guesses, nordle_guesses, freq_data, saved_best, matrix
 
 
 def save_all_data(hard: bool, master: bool, liar: bool,
-                  best_guess_updated: bool, saved_best: dict,
-                  response_data_updated: bool, response_data: dict,
+                  best_guess_updated: bool,
+                  saved_best: Union[dict, LazyTree],
                   nyt=False, allow_print=True) -> None:
     """Saves all data related to the current game mode.
 
@@ -119,12 +649,8 @@ def save_all_data(hard: bool, master: bool, liar: bool,
             A boolean value representing whether `saved_best` contains new
             information
         saved_best:
-            A dict representing the decision tree used to find best guesses
-        response_data_updated:
-            A boolean value representing whether `response_data` contains new
-            information
-        response_data:
-            A dict holding all precalculated responses
+            A dict or LazyTree representing the decision tree used to find
+            best guesses
         nyt:
             A boolean value representing whether to use the New York Times word
             list or the extended word list which works on all sites (default:
@@ -143,39 +669,74 @@ def save_all_data(hard: bool, master: bool, liar: bool,
     elif liar:
         filename = 'best_guess_liar.json'
     if best_guess_updated:
-        before = format_bytes(os.path.getsize(DATA_PATH + filename))
-        with open(DATA_PATH + filename, 'w') as bestf:
-            dump(saved_best, bestf, sort_keys=True, indent=2)
-        after = format_bytes(os.path.getsize(DATA_PATH + filename))
-        if allow_print:
-            print('  "{}"  {:>8} > {:<8}'.format(filename, before, after))
-    resp_file = 'responses' + ('_master' if master else '') + '.json'
-    if response_data_updated:
-        before = format_bytes(os.path.getsize(DATA_PATH + resp_file))
-        with open(DATA_PATH + resp_file, 'w') as responses:
-            dump(response_data, responses, sort_keys=True)
-        after = format_bytes(os.path.getsize(DATA_PATH + resp_file))
-        if allow_print:
-            print('  "{}"  {:>8} > {:<8}'.format(resp_file, before, after))
+        save_saved_tree(saved_best, filename, allow_print)
     if allow_print:  # pragma: no cover
         print('Save complete.')
 
 
+def load_guess_cache(max_size: int = 4096, persist: bool = False
+                     ) -> GuessCache:
+    """Creates a GuessCache, optionally filled with results from past runs.
+
+    Args:
+        max_size:
+            The maximum number of results to keep in the cache (default: 4096)
+        persist:
+            A boolean value representing whether to read the results saved by
+            `save_guess_cache` (default: False)
+
+    Returns:
+        A new GuessCache instance. If the saved file is missing or cannot be
+        read, the cache starts out empty.
+    """
+    entries = {}
+    if persist:
+        try:
+            with open(DATA_PATH + GUESS_CACHE_FILE, 'r') as cache_file:
+                entries = load(cache_file)
+        except (OSError, ValueError):
+            entries = {}
+    return GuessCache(max_size, entries)
+
+
+def save_guess_cache(cache: GuessCache, allow_print=True) -> None:
+    """Saves every result in the given GuessCache if it has new results.
+
+    Args:
+        cache:
+            The GuessCache instance to save
+        allow_print:
+            A boolean value representing whether to allow print statements
+    """
+    if not cache.updated:
+        return
+    path = DATA_PATH + GUESS_CACHE_FILE
+    before = format_bytes(os.path.getsize(path) if os.path.exists(path) else 0)
+    with open(path + '.tmp', 'w') as cache_file:
+        dump(cache.entries(), cache_file)
+    os.replace(path + '.tmp', path)
+    cache.updated = False
+    if allow_print:  # pragma: no cover
+        print('  "{}"  {:>8} > {:<8}'.format(
+            GUESS_CACHE_FILE, before, format_bytes(os.path.getsize(path))))
+
+
 def clean_all_data() -> bool:
     """Empties the contents of local files written by the program.
 
-    Will replace all files named "data/best_guess.json", "data/responses.json",
-    and each of their variants to relieve some storage space. Additionally, if
+    Will replace all files named "data/best_guess.json" and each of its
+    variants to relieve some storage space. Additionally, if
     any of the expected files do not exist, this will create the file and write
-    an empty dict to that file.
+    an empty dict to that file. Response matrix files, the word pack, packed
+    trees and their deltas, tree journals and the saved GuessCache are
+    deleted, since they will be rebuilt the next time they are needed.
 
     Returns:
         True if any data was added or deleted successfully, else False.
     """
     filenames = [
         'best_guess.json', 'best_guess_nyt.json', 'best_guess_hard.json',
-        'best_guess_master.json', 'best_guess_liar.json', 'responses.json',
-        'responses_master.json'
+        'best_guess_master.json', 'best_guess_liar.json'
     ]
     deleted = 0
     added = 0
@@ -187,6 +748,18 @@ def clean_all_data() -> bool:
         with open(DATA_PATH + filename, 'w') as file:
             dump({}, file)
         added += os.path.getsize(DATA_PATH + filename)
+    rebuilt = [_matrix_filename(master, nyt)
+               for master in (False, True) for nyt in (False, True)]
+    rebuilt += [PACK_FILE]
+    rebuilt += [name for name in os.listdir(DATA_PATH or '.')
+                if name.endswith(('.journal', '.tree', '.delta'))]
+    for filename in rebuilt + [GUESS_CACHE_FILE]:
+        try:
+            size = os.path.getsize(DATA_PATH + filename)
+            os.remove(DATA_PATH + filename)
+            deleted += size
+        except OSError:  # missing, or still mapped by this process
+            pass
     if deleted - added == 0:
         print('Nothing to clean.')
         return False
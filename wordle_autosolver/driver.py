@@ -1,39 +1,59 @@
+import os  # pragma: no cover
 import time  # pragma: no cover
 from argparse import ArgumentParser  # pragma: no cover
 from json import load, dump  # pragma: no cover
 from traceback import print_exc  # pragma: no cover
-
-from tqdm import tqdm  # pragma: no cover
-from selenium.webdriver.common.by import By  # pragma: no cover
+from types import ModuleType  # pragma: no cover
+from typing import Optional  # pragma: no cover
 
 try:  # pragma: no cover
-    from common import set_response_data, get_response_data, GameMode
-    from common import get_best_guess_updated, get_response_data_updated
-    from common import filter_remaining, PROGRESS, rec_build_best_tree
-    from common import colored_response, best_guesses
+    from common import set_response_matrix, GameMode, set_workers
+    from common import set_guess_cache, get_guess_cache, set_show_progress
+    from common import get_best_guess_updated
+    from common import filter_remaining, deepen_best_tree
+    from common import colored_response, cached_best_guesses
     from solver import solve_wordle, manual_guess, manual_response
     from solver import simulate, simulated_response, SessionInfo
-    from auto import SITE_INFO, open_website, get_driver, quit_driver
-    from auto import auto_response_fibble, auto_read_fibble_start
+    from solver import sweep_starters
     from data import load_all_data, save_all_data, clean_all_data
+    from data import tree_to_json, load_guess_cache, save_guess_cache
+    from data import open_tree_journal, build_word_pack
 except ModuleNotFoundError:  # this is only here to help pytest find the module
-    from wordle_autosolver.common import set_response_data, get_response_data
+    from wordle_autosolver.common import set_response_matrix
+    from wordle_autosolver.common import set_workers, set_guess_cache
+    from wordle_autosolver.common import get_guess_cache, set_show_progress
     from wordle_autosolver.common import get_best_guess_updated, GameMode
-    from wordle_autosolver.common import get_response_data_updated, PROGRESS
-    from wordle_autosolver.common import filter_remaining, best_guesses
-    from wordle_autosolver.common import rec_build_best_tree, colored_response
+    from wordle_autosolver.common import filter_remaining, cached_best_guesses
+    from wordle_autosolver.common import deepen_best_tree, colored_response
     from wordle_autosolver.solver import solve_wordle, SessionInfo
     from wordle_autosolver.solver import manual_guess, manual_response
     from wordle_autosolver.solver import simulate, simulated_response
-    from wordle_autosolver.auto import SITE_INFO, open_website, get_driver
-    from wordle_autosolver.auto import quit_driver, auto_response_fibble
-    from wordle_autosolver.auto import auto_read_fibble_start
+    from wordle_autosolver.solver import sweep_starters
     from wordle_autosolver.data import load_all_data, save_all_data
-    from wordle_autosolver.data import clean_all_data
+    from wordle_autosolver.data import clean_all_data, tree_to_json
+    from wordle_autosolver.data import load_guess_cache, save_guess_cache
+    from wordle_autosolver.data import open_tree_journal, build_word_pack
+
+
+def import_auto() -> ModuleType:  # pragma: no cover
+    """Imports the `auto` module, which loads selenium and the website info.
+
+    This is only done once a website is given with the "auto" flag, so every
+    other run starts without loading selenium.
+
+    Returns:
+        The `auto` module.
+    """
+    try:
+        import auto
+    except ModuleNotFoundError:  # only here to help pytest find the module
+        from wordle_autosolver import auto
+    return auto
 
 
 def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
-                                       str, int, bool, bool, bool, bool]:
+                                       str, int, bool, bool, bool, bool, int,
+                                       int, bool, bool, Optional[int]]:
     """Parse all command line arguments using `argparse.ArgumentParser`."""
     parser = ArgumentParser(
         description=('Solve a Wordle game on one board or multiple by '
@@ -73,6 +93,9 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
     group2.add_argument('--sim', type=int, default=0, metavar='MAX_SIMS',
                         help=('set this flag to simulate MAX_SIMS unique games'
                               ' and give resulting stats'))
+    parser.add_argument('--seed', type=int, default=None, metavar='N',
+                        help=('when used with "sim", sample the same games '
+                              'every time the seed N is given'))
     parser.add_argument('--quiet', action='store_true',
                         help='set this flag to hide unneeded console output')
     group3 = parser.add_mutually_exclusive_group()
@@ -98,12 +121,22 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
                               'once completed, the program will continue as '
                               'normal using this generated tree to recommend '
                               'guesses'))
+    parser.add_argument('--resume', action='store_true',
+                        help=('when used with "best" or "sim -1", continue '
+                              'from the subtrees or starting word results '
+                              'saved by an earlier run that was interrupted '
+                              '(without it, "best" will not overwrite the '
+                              'subtrees saved by such a run)'))
     parser.add_argument('--clean', action='store_true',
-                        help=('empty the contents of "data/best_guess.json", '
-                              '"data/responses.json", and each of their '
-                              'variants to relieve some storage space (the '
-                              'program will not execute any other commands '
-                              'when this flag is set)'))
+                        help=('empty the contents of "data/best_guess.json" '
+                              'and each of its variants to relieve some '
+                              'storage space (the program will not execute '
+                              'any other commands when this flag is set)'))
+    parser.add_argument('--rebuild', action='store_true',
+                        help=('rebuild "data/words.pack" from the JSON word '
+                              'lists and word frequencies in the "data" '
+                              'folder (the program will not execute any '
+                              'other commands when this flag is set)'))
     parser.add_argument('--light', action='store_true',
                         help=('set this flag to force all websites to switch '
                               'to light mode (if available) -- when "auto" '
@@ -111,10 +144,26 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
     parser.add_argument('--start', metavar='WORD', nargs='+', default=[],
                         help=('set this flag if there are certain words you '
                               'want to start with regardless of the response'))
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help=('number of processes used to score guesses and '
+                              'simulate games in parallel (default: 1)'))
+    parser.add_argument('--cache-size', type=int, default=4096, metavar='N',
+                        dest='cache_size',
+                        help=('number of best guess results to keep in memory '
+                              '-- setting this to "0" disables the cache '
+                              '(default: 4096)'))
+    parser.add_argument('--persist-cache', action='store_true',
+                        dest='persist',
+                        help=('set this flag to reuse cached best guess '
+                              'results from previous runs and save the new '
+                              'ones in "data/guess_cache.json"'))
     args = parser.parse_args()
     if args.clean:  # pragma: no cover
         clean_all_data()
         exit()
+    if args.rebuild:  # pragma: no cover
+        build_word_pack(not args.quiet)
+        exit()
     lim = max(min(args.board_limit, 500), args.num)
     mode = GameMode()
     if args.hard:
@@ -128,18 +177,24 @@ def parse_command_line_args() -> tuple[int, bool, bool, bool, str, int, bool,
     if args.inf:
         mode.endless = True
     return (args.num, lim, mode, args.site, args.nyt, args.start, args.sim,
-            args.stro, args.best, args.quiet, not args.light)
+            args.stro, args.best, args.quiet, not args.light, args.workers,
+            args.cache_size, args.persist, args.resume, args.seed)
 
 
 def main() -> None:  # pragma: no cover
     """Main entry point into the program."""
     # main variable initializations
     (n_games, lim, mode, site, nyt, start,
-        sim, stro, best, quiet, dark) = parse_command_line_args()
+        sim, stro, best, quiet, dark, workers,
+        cache_size, persist, resume, seed) = parse_command_line_args()
     (answers, guesses, nordle_guesses, freq,
-        saved_best, resp_data) = load_all_data(mode.hard, mode.master,
-                                               mode.liar, nyt, not quiet)
-    set_response_data(resp_data)
+        saved_best, matrix) = load_all_data(mode.hard, mode.master,
+                                            mode.liar, nyt, not quiet)
+    set_response_matrix(matrix)
+    set_workers(workers)
+    set_show_progress(not quiet)
+    if cache_size > 0:
+        set_guess_cache(load_guess_cache(cache_size, persist))
 
     # setup for website auto-solve feature
     wordle_sites = {
@@ -161,22 +216,23 @@ def main() -> None:  # pragma: no cover
     auto_guess = manual_guess
     auto_response = simulated_response if mode.play else manual_response
     if site is not None:
+        auto = import_auto()
         if site == 'wordle':
             (addr, n_games, _, mode.master, mode.liar,
-                auto_guess, auto_response) = SITE_INFO[site]
+                auto_guess, auto_response) = auto.SITE_INFO[site]
         elif site == 'wordzy':
             (addr, _, mode.hard, _, mode.liar,
-                auto_guess, auto_response) = SITE_INFO[site]
+                auto_guess, auto_response) = auto.SITE_INFO[site]
         elif site == 'nordle':
             (addr, _, mode.hard, mode.master, mode.liar,
-                auto_guess, auto_response) = SITE_INFO[site]
+                auto_guess, auto_response) = auto.SITE_INFO[site]
         elif site == 'fibble':
             (addr, n_games, mode.hard, mode.master, mode.liar,
-                auto_guess, auto_response) = SITE_INFO[site]
+                auto_guess, auto_response) = auto.SITE_INFO[site]
         else:
             (addr, n_games, mode.hard, mode.master, mode.liar,
-                auto_guess, auto_response) = SITE_INFO[site]
-        n_games = open_website(addr, n_games, mode, quiet=quiet, dark=dark)
+                auto_guess, auto_response) = auto.SITE_INFO[site]
+        n_games = auto.open_website(addr, n_games, mode, quiet=quiet, dark=dark)
         lim = max(lim, n_games)
     if mode.endless:
         lim = n_games + 1
@@ -190,40 +246,54 @@ def main() -> None:  # pragma: no cover
     # main functions to call
     if best:
         tree = {}
-        max_depth = 2
-        while len(tree) == 0:
-            tree = rec_build_best_tree(answers, guesses, start[0],
-                                       mode, max_depth)
-        with open('data/{}.json'.format(start[0]), 'w') as data:
-            dump(tree, data, indent=2)
-        saved_best = tree
+        try:
+            journal = open_tree_journal(start[0], answers, guesses, mode,
+                                        resume)
+        except FileExistsError as error:
+            exit('ERROR: {} HOLDS SUBTREES FROM AN EARLIER RUN; use --resume '
+                 'to continue it or delete it to start over'
+                 .format(error.args[0]))
+        if resume and not quiet:
+            print('Resuming with {} saved subtrees...'.format(len(journal)))
+        try:
+            for depth, tree, seconds in deepen_best_tree(answers, guesses,
+                                                         start[0], mode,
+                                                         show=not quiet,
+                                                         table=journal):
+                if not quiet:
+                    print('  Depth {}: {} in {:.2f} seconds'.format(
+                        depth, 'tree found' if len(tree) > 0 else 'no tree',
+                        seconds))
+        finally:
+            journal.close()
+        if len(tree) > 0:
+            with open('data/{}.json'.format(start[0]), 'w') as data:
+                dump(tree_to_json(tree), data, indent=2)
+            os.remove(journal.path)  # the finished tree replaces it
+            saved_best = tree
+        else:
+            print('No tree found for {} within {} guesses'.format(
+                start[0].upper(), depth))
     if sim > 0:
         session = SessionInfo(n_games, answers, guesses, saved_best, freq,
                               start, mode)
-        simulate(session, sim, show=not quiet)
+        simulate(session, sim, show=not quiet, seed=seed)
     elif sim == -1:
-        best_case = -8
-        best_start = []
         worst_case = {}
         with open('data/ordered_guesses.json', 'r') as ordered:
             worst_case = load(ordered)
         modified = sorted(answers, key=lambda x: worst_case[x])
-        for starter in tqdm(modified, ascii=PROGRESS):
-            session = SessionInfo(n_games, answers, guesses, saved_best, freq,
-                                  [starter], mode)
-            _, worst = simulate(session, len(answers), best_case, show=False,
-                                return_if_worse=True)
-            if worst == best_case:
-                best_start.append(starter)
-            elif worst > best_case:
-                best_case = worst
-                best_start = [starter]
+        session = SessionInfo(n_games, answers, guesses, saved_best, freq,
+                              [], mode)
+        best_case, best_start = sweep_starters(
+            session, modified, results_path='data/starter_sweep.jsonl',
+            resume=resume)
         print(best_case, '=', best_start)
     if sim != 0:
-        save_all_data(session.hard, session.master, session.liar,
-                      get_best_guess_updated(), saved_best,
-                      get_response_data_updated(), get_response_data(), nyt,
-                      not quiet)
+        save_all_data(mode.hard, mode.master, mode.liar,
+                      get_best_guess_updated(), saved_best, nyt, not quiet)
+        if persist and get_guess_cache() is not None:
+            save_guess_cache(get_guess_cache(), not quiet)
         exit()
     solution = [], []
     while n_games <= lim:
@@ -231,11 +301,11 @@ def main() -> None:  # pragma: no cover
                               start, mode)
         if site == 'fibble':
             guess = (manual_guess(session) if auto_guess == manual_guess
-                     else auto_read_fibble_start())
+                     else auto.auto_read_fibble_start())
             session.entered.append(guess)
             session.guesses.remove(guess)
             response = (manual_response(session) if auto_guess == manual_guess
-                        else auto_response_fibble(session))[0][0]
+                        else auto.auto_response_fibble(session))[0][0]
             filtered = filter_remaining(answers, guess, response, mode)
             session.remaining[0] = filtered
             if not quiet:
@@ -245,8 +315,8 @@ def main() -> None:  # pragma: no cover
                     colored_response(guess, response, mode),
                     len(filtered)
                 ))
-            session.actual_best = best_guesses(filtered, session.guesses,
-                                               session.mode, show=True)[0]
+            session.actual_best = cached_best_guesses(
+                filtered, session.guesses, session.mode, show=True)[0]
         elif site == 'nordle':
             session.saved_best = {}
             session.guesses = nordle_guesses
@@ -267,8 +337,9 @@ def main() -> None:  # pragma: no cover
             break
         if site == 'wordzy':
             time.sleep(8)
-            dx = get_driver().find_element(By.CLASS_NAME, 'share-container')
-            for button in dx.find_elements(by=By.TAG_NAME, value='button'):
+            dx = auto.get_driver().find_element(auto.By.CLASS_NAME,
+                                                'share-container')
+            for button in dx.find_elements(by=auto.By.TAG_NAME, value='button'):
                 if button.get_attribute('color') == 'green':
                     button.click()
                     if mode.endless:
@@ -277,47 +348,49 @@ def main() -> None:  # pragma: no cover
                         n_games *= 2
         elif site == 'dordle' and mode.endless:
             time.sleep(4)
-            get_driver().find_element(value='new_game').click()
+            auto.get_driver().find_element(value='new_game').click()
             time.sleep(2)
         elif site == 'quordle' and mode.endless:
             time.sleep(4)
-            get_driver().find_element(
-                by=By.XPATH,
+            auto.get_driver().find_element(
+                by=auto.By.XPATH,
                 value='//*[@id="root"]/div/div[1]/div/button[1]'
             ).click()
             time.sleep(2)
         elif (site is not None) and not (mode.master or mode.liar):
             time.sleep(8)
-            quit_driver()
+            auto.quit_driver()
             if not mode.endless:
                 n_games *= 2
             if n_games not in wordle_sites:
                 site = 'nordle'
-                addr, _, _, _, _, auto_guess, auto_response = SITE_INFO[site]
+                (addr, _, _, _, _,
+                 auto_guess, auto_response) = auto.SITE_INFO[site]
                 session.saved_best = {}
                 session.guesses = nordle_guesses
             else:
                 site = wordle_sites[n_games]
                 if not mode.hard and site == 'wordle':
                     (addr, n_games, _, mode.master, mode.liar,
-                     auto_guess, auto_response) = SITE_INFO[site]
+                     auto_guess, auto_response) = auto.SITE_INFO[site]
                 elif site == 'wordzy':
                     (addr, _, mode.hard, _, mode.liar,
-                     auto_guess, auto_response) = SITE_INFO[site]
+                     auto_guess, auto_response) = auto.SITE_INFO[site]
                 else:
                     (addr, n_games, mode.hard, mode.master, mode.liar,
-                     auto_guess, auto_response) = SITE_INFO[site]
-            open_website(addr, n_games, mode, quiet=quiet, dark=dark)
+                     auto_guess, auto_response) = auto.SITE_INFO[site]
+            auto.open_website(addr, n_games, mode, quiet=quiet, dark=dark)
         elif site is not None and mode.liar and mode.endless:
-            get_driver().find_element(
-                By.XPATH, '//*[@id="root"]/div/div[3]/div[1]/span[2]/a'
+            auto.get_driver().find_element(
+                auto.By.XPATH, '//*[@id="root"]/div/div[3]/div[1]/span[2]/a'
             ).click()
             time.sleep(2)
         if stro:
             start = solution[0]
     save_all_data(mode.hard, mode.master, mode.liar, get_best_guess_updated(),
-                  saved_best, get_response_data_updated(), get_response_data(),
-                  nyt, not quiet)
+                  saved_best, nyt, not quiet)
+    if persist and get_guess_cache() is not None:
+        save_guess_cache(get_guess_cache(), not quiet)
     if site is not None:
         input("PRESS ENTER TO EXIT")
-        quit_driver()
+        auto.quit_driver()
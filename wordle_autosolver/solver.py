@@ -1,28 +1,47 @@
 from __future__ import annotations
 
-from random import sample, shuffle, choice
+import os
+from random import sample, choice, randrange, Random
+from functools import partial
 from itertools import combinations
-from typing import Callable, Optional
-from math import factorial as fac
+from typing import Callable, Iterator, Optional
+from math import comb
+from json import dumps, loads
 
-from tqdm import tqdm
+import numpy as np
 
 try:  # pragma: no cover
-    from common import GameMode
-    from common import RIGHT, CLOSE, WRONG, PROGRESS, SYM_ALTS
-    from common import get_response, filter_remaining
-    from common import colored_response, count_remaining
-    from common import best_guesses, set_best_guess_updated
+    from common import GameMode, ALL_RIGHT
+    from common import RIGHT, CLOSE, WRONG, PROGRESS
+    from common import get_response, filter_remaining, encode_response
+    from common import colored_response, decode_response
+    from common import best_guesses, set_best_guess_updated, useful_guesses
+    from common import get_partition_sizes, cached_best_guesses
+    from common import get_guess_cache, descend_tree, TreeView
+    from common import liar_alternatives, AnswerSet, get_response_matrix
+    from common import get_workers, map_workers, worker_cancelled
+    from common import shared_bound, raise_shared_bound, fingerprint
+    from common import worker_context
+    from common import count_liar_alternatives, progress_bar
 except ModuleNotFoundError:  # this is only here to help pytest find the module
-    from wordle_autosolver.common import GameMode, SYM_ALTS
+    from wordle_autosolver.common import GameMode, ALL_RIGHT
     from wordle_autosolver.common import RIGHT, CLOSE, WRONG, PROGRESS
     from wordle_autosolver.common import get_response, filter_remaining
-    from wordle_autosolver.common import colored_response, count_remaining
+    from wordle_autosolver.common import colored_response
     from wordle_autosolver.common import best_guesses, set_best_guess_updated
+    from wordle_autosolver.common import encode_response, decode_response
+    from wordle_autosolver.common import liar_alternatives, AnswerSet
+    from wordle_autosolver.common import get_response_matrix, useful_guesses
+    from wordle_autosolver.common import get_partition_sizes, get_guess_cache
+    from wordle_autosolver.common import cached_best_guesses, descend_tree
+    from wordle_autosolver.common import TreeView, get_workers, map_workers
+    from wordle_autosolver.common import worker_cancelled, shared_bound
+    from wordle_autosolver.common import raise_shared_bound, fingerprint
+    from wordle_autosolver.common import worker_context
+    from wordle_autosolver.common import progress_bar
+    from wordle_autosolver.common import count_liar_alternatives
 
 
-simulated_answers: list[str] = []
-
 WORST_ANSWERS = [
     'fuzzy', 'epoxy', 'nymph', 'cynic', 'boozy', 'vivid', 'depot', 'movie',
     'their', 'aroma', 'allow', 'tacit', 'swill', 'ferry', 'forgo', 'fewer',
@@ -58,7 +77,8 @@ class SessionInfo:
     def __init__(self, num_boards: int, answers: list[str], guesses: list[str],
                  saved_best: dict, freq: dict[str, float],
                  starters: Optional[list[str]] = None,
-                 mode: Optional[GameMode] = None) -> None:
+                 mode: Optional[GameMode] = None, *,
+                 rng: Optional[Random] = None) -> None:
         self.entered = []
         self.unentered_answers = set()
         self.solve_count = 0
@@ -69,14 +89,24 @@ class SessionInfo:
         self.freq = freq
         self.starters = [] if starters is None else starters[:]
         self.mode = GameMode() if mode is None else mode
+        self.rng = rng  # uses the random module if not set
         self.expected = list(range(num_boards))
-        self.remaining = [answers[:] for _ in range(num_boards)]
+        bitset = AnswerSet.from_words(get_response_matrix(), answers)
+        if bitset is None or bitset.matrix.master != self.mode.master:
+            self.remaining = [answers[:] for _ in range(num_boards)]
+        else:  # boards share the same matrix, so they can share the same set
+            self.remaining = [bitset for _ in range(num_boards)]
+        # the guesses which can still split each board's answers; this only
+        # prunes guesses, and no partitions are kept between turns
+        self.candidates = [self.guesses for _ in range(num_boards)]
         self.solved = ['*****' for _ in range(num_boards)]
         self.subtree = [saved_best for _ in range(num_boards)]
         self.best = [[] for _ in range(num_boards)]
-        self.actual_best = (choice(BEST_STARTERS)
+        pick = choice if rng is None else rng.choice
+        self.actual_best = (pick(BEST_STARTERS)
                             if len(starters) == 0
                             else starters[0])
+        self.simulated: list[str] = []  # the answers used by `simulate`
 
     def copy(self, *,
              num_boards: Optional[int] = None,
@@ -86,16 +116,21 @@ class SessionInfo:
              freq: Optional[dict[str, float]] = None,
              starters: Optional[list[str]] = None,
              mode: Optional[GameMode] = None,
+             simulated: Optional[list[str]] = None,
              ) -> SessionInfo:
-        return SessionInfo(
+        session = SessionInfo(
             self.num_boards if num_boards is None else num_boards,
             self.answers if answers is None else answers,
             self.guesses if guesses is None else guesses,
             self.saved_best if saved_best is None else saved_best,
             self.freq if freq is None else freq,
             self.starters if starters is None else starters,
-            self.mode if mode is None else mode
+            self.mode if mode is None else mode,
+            rng=self.rng
         )
+        session.simulated = (self.simulated if simulated is None
+                             else simulated)[:]
+        return session
 
     def __str__(self):
         PADDING, MAX_LENGTH = 24, 20
@@ -163,7 +198,8 @@ class SessionInfo:
                 )
 
 
-def get_worst_liar_response(guess: str, answer: str, remaining: list[str]):
+def get_worst_liar_response(guess: str, answer: str, remaining: list[str]
+                            ) -> int:
     """Finds a valid liar response which results in the most remaining answers.
 
     Args:
@@ -175,21 +211,19 @@ def get_worst_liar_response(guess: str, answer: str, remaining: list[str]):
             The list of remaining possible answers
 
     Returns:
-        The response which results in the most remaining possible answers.
+        The response code which results in the most remaining possible answers,
+        or `ALL_RIGHT` if the guess is the answer. A ValueError is raised if
+        no valid liar response keeps any remaining answer, which can only
+        happen when `answer` is not one of them.
     """
-    mode = GameMode()
-    response = get_response(guess, answer, mode)
-    mode.liar = True
-    worst_response = ''
-    worst_count = 0
-    for sym_idx in range(len(response)):
-        for alt in SYM_ALTS[response[sym_idx]]:
-            response = response[:sym_idx] + alt + response[sym_idx + 1:]
-            count = count_remaining(remaining, guess, response, mode)
-            if count > worst_count:
-                worst_response = response
-                worst_count = count
-    return worst_response
+    response = get_response(guess, answer)
+    if response == ALL_RIGHT:  # the game always ends once the answer is found
+        return response
+    counts = count_liar_alternatives(remaining, guess, response)
+    if counts.max() == 0:
+        raise ValueError('no liar response for {} keeps any remaining answer'
+                         .format(answer))
+    return liar_alternatives(response)[int(counts.argmax())]
 
 
 ###############################################################################
@@ -213,7 +247,7 @@ def manual_guess(session: SessionInfo, help: bool = False) -> str:
     """
     guesses = session.guesses
     if session.mode.hard:
-        guesses = set(sum(session.remaining, []))
+        guesses = set().union(*session.remaining)
     if help:
         print("\n  Best guess is {}\n".format(session.actual_best.upper()))
     guess = input("  What is your next guess?\n    (Enter '!help' to see "
@@ -230,7 +264,7 @@ def manual_guess(session: SessionInfo, help: bool = False) -> str:
     return guess
 
 
-def manual_response(session: SessionInfo) -> list[tuple[str, int]]:
+def manual_response(session: SessionInfo) -> list[tuple[int, int]]:
     """Prompts the user to enter the response(s) given by the game.
 
     Args:
@@ -239,8 +273,8 @@ def manual_response(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
     guess = session.entered[-1]
     for board in range(session.num_boards):
@@ -251,8 +285,6 @@ def manual_response(session: SessionInfo) -> list[tuple[str, int]]:
                     " on board {}".format(board + 1)
                 ) + "?\n  >>> "
             ).strip().upper()
-            rem = filter_remaining(session.remaining[board], guess, response,
-                                   session.mode)
             while True:
                 err_message = None
                 if len(response) != len(guess):
@@ -263,16 +295,16 @@ def manual_response(session: SessionInfo) -> list[tuple[str, int]]:
                                    'Expected one of: "{}", "{}", or "{}". '
                                    'Try again.\n>>> '
                                    ).format(RIGHT, CLOSE, WRONG)
-                elif len(rem) == 0:
+                elif len(filter_remaining(session.remaining[board], guess,
+                                          encode_response(response),
+                                          session.mode)) == 0:
                     err_message = ('The given response eliminates all possible'
                                    ' answers remaining. Are you sure you '
                                    'entered it correctly? Try again.\n>>>')
                 if err_message is None:
                     break
                 response = input(err_message).strip().upper()
-                rem = filter_remaining(session.remaining[board], guess,
-                                       response, session.mode)
-            yield response, board
+            yield encode_response(response), board
 
 
 def simulated_guess(session: SessionInfo) -> str:
@@ -280,7 +312,7 @@ def simulated_guess(session: SessionInfo) -> str:
     return session.actual_best
 
 
-def simulated_response(session: SessionInfo) -> list[tuple[str, int]]:
+def simulated_response(session: SessionInfo) -> list[tuple[int, int]]:
     """Prompts the program to give response(s) based on the simulated answers.
 
     Args:
@@ -289,26 +321,26 @@ def simulated_response(session: SessionInfo) -> list[tuple[str, int]]:
             set of games being solved
 
     Returns:
-        A list of 2-tuples where the first element is the response and the
-        second element is the index of the board that gave that response.
+        A list of 2-tuples where the first element is the response code and
+        the second element is the index of the board that gave that response.
     """
-    global simulated_answers
     if (len(session.entered) == 1
-            and len(simulated_answers) != session.num_boards):
-        simulated_answers = sample(session.remaining[0],
-                                   session.num_boards)  # pragma: no cover
+            and len(session.simulated) != session.num_boards):
+        pick = sample if session.rng is None else session.rng.sample
+        session.simulated = pick(session.remaining[0],
+                                 session.num_boards)  # pragma: no cover
     responses = []
     for board in session.expected:
         if session.mode.liar:
             responses.append(
                 (get_worst_liar_response(session.entered[-1],
-                                         simulated_answers[board],
+                                         session.simulated[board],
                                          session.remaining[board]),
                  board)
             )
         else:
             responses.append(
-                (get_response(session.entered[-1], simulated_answers[board],
+                (get_response(session.entered[-1], session.simulated[board],
                               session.mode), board)
             )
     return responses
@@ -321,7 +353,7 @@ def simulated_response(session: SessionInfo) -> list[tuple[str, int]]:
 
 def solve_wordle(session: SessionInfo,
                  auto_guess: Callable[[SessionInfo], str],
-                 auto_response: Callable[[SessionInfo], list[tuple[str, int]]],
+                 auto_response: Callable[[SessionInfo], list[tuple[int, int]]],
                  allow_print=False) -> SessionInfo:
     """PRIMARY SOLVE FUNCTION - Solves Wordle(s) based on the given parameters.
 
@@ -387,7 +419,7 @@ def solve_wordle(session: SessionInfo,
         # parse the response for each board and find the best guess(es)
         session.best = [[] for _ in range(session.num_boards)]
         for response, board in auto_response(session):
-            if all(x == RIGHT for x in response) and board in session.expected:
+            if response == ALL_RIGHT and board in session.expected:
                 session.expected.remove(board)
                 session.solve_count += 1
             session.best[board], session.remaining[board] = _parse_response(
@@ -428,7 +460,7 @@ def solve_wordle(session: SessionInfo,
     return session
 
 
-def _parse_response(response: str, board: int, auto_response: Callable,
+def _parse_response(response: int, board: int, auto_response: Callable,
                     session: SessionInfo, allow_print: bool
                     ) -> tuple[list[str], list[str]]:
     """Helper function for `solve_wordle`."""
@@ -449,6 +481,7 @@ def _parse_response(response: str, board: int, auto_response: Callable,
         if allow_print:
             print("\n\nBOARD {} USES A NEW WORD\n\n".format(board + 1))
         answers = session.guesses  # create a new list using ALL words
+        session.candidates[board] = session.guesses
         # valid_answer only holds true up to the previous guess
         for entry in session.entered[:-1]:
             resp = get_response(entry, valid_answer, session.mode)
@@ -457,28 +490,24 @@ def _parse_response(response: str, board: int, auto_response: Callable,
         answers = filter_remaining(answers, guess, response, session.mode)
     if len(answers) == 0:  # response STILL does not match
         exit('ERROR: BAD RESPONSE ON BOARD {}: {}'
-             .format(board + 1, response))
+             .format(board + 1, decode_response(response)))
     if session.num_boards > 1:
-        for index in range(len(response)):
+        for index in range(len(guess)):
             if all(r[index] == answers[0][index] for r in answers):
                 pattern = session.solved[board]
                 session.solved[board] = (pattern[:index] + answers[0][index]
                                          + pattern[index + 1:])
     # update subtree (and by extension, also saved_best)
-    if guess not in session.subtree:
-        session.subtree[board][guess] = {}
-        set_best_guess_updated()
-    if response not in session.subtree[board][guess]:
-        session.subtree[board][guess][response] = {}
+    session.subtree[board], updated = descend_tree(session.subtree[board],
+                                                   guess, response)
+    if updated:
         set_best_guess_updated()
-    session.subtree[board] = session.subtree[board][guess][response]
     # print best guesses (or the answer) to the console
     best = []
     if len(answers) == 1:
         solution = answers[0]
         session.solved[board] = solution
-        if allow_print and (not session.mode.play or
-                            response == ''.join([RIGHT for _ in response])):
+        if allow_print and (not session.mode.play or response == ALL_RIGHT):
             print("\n    The answer{} is {}\n".format(
                     '' if session.num_boards == 1 else
                     (' on board ' + str(board + 1)), solution.upper()))
@@ -487,17 +516,24 @@ def _parse_response(response: str, board: int, auto_response: Callable,
             all(guess in session.entered for guess in session.starters)):
         # update tree with best guesses if the game is still unsolved
         subset = list(session.subtree[board].keys())  # use any saved answers
+        refine = None
         if len(subset) == 0:
             subset = session.guesses  # default to the entire allowed word list
+            if not session.mode.liar:  # liar mode can rule out no guesses
+                refine = partial(_refine_candidates, session, board, answers)
         if session.mode.hard:
+            refine = None
             for entry in session.entered:
                 resp = get_response(entry, answers[0], session.mode)
                 subset = filter_remaining(subset, entry, resp, session.mode)
         best = sorted(
-            best_guesses(answers, subset, session.mode, show=allow_print),
+            cached_best_guesses(answers, subset, session.mode,
+                                show=allow_print, refine=refine,
+                                rng=session.rng),
             key=lambda x: session.freq[x], reverse=True)[:16]
         for best_guess in best:
-            if best_guess not in session.subtree[board]:
+            if (not isinstance(session.subtree[board], TreeView)
+                    and best_guess not in session.subtree[board]):
                 session.subtree[board][best_guess] = {}
                 set_best_guess_updated()
         if allow_print and not session.mode.play:
@@ -513,6 +549,25 @@ def _parse_response(response: str, board: int, auto_response: Callable,
     return best, answers
 
 
+def _refine_candidates(session: SessionInfo, board: int, answers: list[str]
+                       ) -> list[str]:
+    """Helper function for `_parse_response`."""
+    # guesses which could not split the answers before never will
+    session.candidates[board] = useful_guesses(session.candidates[board],
+                                               answers, session.mode)
+    return session.candidates[board]
+
+
+def _worst_cases(guesses: list[str], answers: list[str], mode: GameMode,
+                 rng: Optional[Random] = None) -> np.ndarray:
+    """Helper function for `_find_best_overall_guess`."""
+    if mode.liar:
+        worst_case = best_guesses(answers, guesses, mode, return_all=True,
+                                  rng=rng)
+        return np.array([worst_case[guess] for guess in guesses])
+    return get_partition_sizes(guesses, answers, mode).max(axis=1)
+
+
 def _find_best_overall_guess(session: SessionInfo, allow_print: bool
                              ) -> tuple[str, set]:
     """Helper function for `solve_wordle`."""
@@ -528,33 +583,36 @@ def _find_best_overall_guess(session: SessionInfo, allow_print: bool
             session.actual_best = sorted(
                 list(options), key=lambda x: session.freq[x], reverse=True
             )[0]
-        else:
-            best_score = len(session.guesses) * session.num_boards
-            for next_guess in tqdm(options, ascii=PROGRESS, leave=False,
-                                   disable=not allow_print):
-                worst = []
-                for board in range(session.num_boards):
-                    found = set()
-                    worst_case = 1
-                    if len(session.remaining[board]) == 1:
-                        continue  # ignore any solved boards
-                    for answer in session.remaining[board]:
-                        response = get_response(next_guess, answer,
-                                                session.mode)
-                        if response in found:
-                            continue
-                        found.add(response)
-                        count = count_remaining(session.remaining[board],
-                                                next_guess, response,
-                                                session.mode)
-                        if count > worst_case:
-                            worst_case = count
-                    worst.append(worst_case)
-                total = sum(worst)
-                if total < best_score:
-                    best_score = total
-                    session.actual_best = next_guess
-                elif total == best_score and session.freq[
+        elif len(options) > 2:
+            options = list(options)
+            # score the biggest boards first so that bad guesses stop early
+            boards = sorted([board for board in range(session.num_boards)
+                             if len(session.remaining[board]) > 1],
+                            key=lambda x: len(session.remaining[x]),
+                            reverse=True)
+            totals = np.zeros(len(options), dtype=np.int64)
+            active = np.arange(len(options))
+            seed, bound = None, None
+            for index, board in enumerate(progress_bar(
+                    boards, ascii=PROGRESS, leave=False,
+                    disable=not allow_print)):
+                totals[active] += _worst_cases([options[i] for i in active],
+                                               session.remaining[board],
+                                               session.mode, session.rng)
+                if seed is None:
+                    # the current leader is fully scored to bound the others
+                    seed = active[np.argmin(totals[active])]
+                    bound = int(totals[seed]) + sum(
+                        int(_worst_cases([options[seed]],
+                                         session.remaining[other],
+                                         session.mode, session.rng)[0])
+                        for other in boards[index + 1:])
+                active = active[(totals[active] <= bound) | (active == seed)]
+            best_score = totals[active].min()
+            session.actual_best = None
+            for next_guess in (options[i] for i in active
+                               if totals[i] == best_score):
+                if session.actual_best is None or session.freq[
                     session.actual_best
                 ] < session.freq[next_guess]:
                     session.actual_best = next_guess
@@ -568,9 +626,92 @@ def _find_best_overall_guess(session: SessionInfo, allow_print: bool
             ))
 
 
+def generate_games(answers: list[str], num_boards: int = 1,
+                   total_sims: int = 0, *, seed: Optional[int] = None,
+                   stratified: bool = False, chunk_size: int = 64
+                   ) -> Iterator[list[list[str]]]:
+    """Lazily generates unique games for `simulate`, in chunks.
+
+    When every possible game is simulated, the games are enumerated in order
+    (starting with `WORST_ANSWERS` when there is only one board), so nothing
+    needs to be stored. Otherwise, games are sampled at random and only the
+    hash of each one is kept to skip repeats.
+
+    Args:
+        answers:
+            The list of all possible answers
+        num_boards:
+            The number of boards in each game (default: 1)
+        total_sims:
+            The maximum number of games to generate; when not set, this will
+            generate every possible game (default: 0)
+
+    Keyword Args:
+        seed:
+            The seed used when sampling games, or None to use a random seed
+            (default: None)
+        stratified:
+            A boolean value representing whether the first board of sampled
+            games should cycle through every answer before repeating one
+            (default: False)
+        chunk_size:
+            The maximum number of games in each chunk (default: 64)
+
+    Yields:
+        A list of up to `chunk_size` games, where each game is a list holding
+        the answer for every board.
+    """
+    rng = Random(seed)
+    max_sims = comb(len(answers), num_boards)
+    if total_sims <= 0 or total_sims >= max_sims:
+        if num_boards == 1:
+            games = ([ans] for ans in [ans for ans in WORST_ANSWERS
+                                       if ans in answers] +
+                     [ans for ans in answers if ans not in WORST_ANSWERS])
+        else:
+            games = (list(game) for game in combinations(answers, num_boards))
+    elif num_boards == 1:
+        games = ([ans] for ans in rng.sample(answers, total_sims))
+    else:
+        games = _sample_games(answers, num_boards, total_sims, rng, stratified)
+    chunk = []
+    for game in games:
+        chunk.append(game)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def _sample_games(answers: list[str], num_boards: int, total_sims: int,
+                  rng: Random, stratified: bool) -> Iterator[list[str]]:
+    """Helper function for `generate_games`."""
+    seen = set()
+    order = list(range(len(answers)))
+    rng.shuffle(order)
+    stratum, repeats = 0, 0
+    while len(seen) < total_sims:
+        ids = rng.sample(range(len(answers)), num_boards)
+        if stratified:
+            first = order[stratum % len(order)]
+            ids = [first] + [i for i in ids if i != first][:num_boards - 1]
+        key = hash(tuple(sorted(ids)))
+        if key not in seen:
+            seen.add(key)
+            stratum, repeats = stratum + 1, 0
+            yield [answers[i] for i in ids]
+        else:  # move on if every game in this stratum might be used up
+            repeats += 1
+            if repeats > len(answers):
+                stratum, repeats = stratum + 1, 0
+
+
 def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
              *, show: bool = True, return_if_worse: bool = False,
-             ) -> tuple[float, int]:
+             seed: Optional[int] = None, stratified: bool = False,
+             workers: Optional[int] = None, return_failures: bool = False
+             ) -> tuple:
     """Runs a simulation to collect data about the given parameters.
 
     Args:
@@ -586,61 +727,73 @@ def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
         show:
             A boolean value representing whether to show PROGRESS bars and more
             detailed results (default: True)
+        return_if_worse:
+            A boolean value representing whether to stop as soon as a game
+            scores worse than `best` (default: False)
+        seed:
+            The seed used to sample games when not every game is simulated, or
+            None to use a random seed (default: None)
+        stratified:
+            A boolean value representing whether sampled games should cycle
+            through every answer on the first board (default: False)
+        workers:
+            The number of processes used to play games in parallel, or None
+            to use the value of `get_workers` (default: None)
+        return_failures:
+            A boolean value representing whether to also return every game
+            that was not solved (default: False)
 
     Returns:
         A 2-tuple where the first element is the average score and the second
         element is the worst score across all simulations. The score is
         calculated as `score = num_boards + 5 - len(entered)`, where `entered`
-        is the list of all guesses used to solve the game.
+        is the list of all guesses used to solve the game. If
+        `return_failures` is True, a third element holds the answers of every
+        failed game, joined by commas. If `return_if_worse` is True and the
+        simulation is pruned by a game scoring worse than `best`, or worse
+        than the bound shared by other workers, the average is None and the
+        worst score is only that game's score.
     """
-    global simulated_answers
-    answers = session.answers
-    n, r = len(answers), session.num_boards
-    max_sims = fac(n) / (fac(r) * fac(n - r))
-    if total_sims == 0:
+    max_sims = comb(len(session.answers), session.num_boards)
+    if total_sims <= 0 or total_sims > max_sims:
         total_sims = max_sims
-    generated = []
-    if session.num_boards == 1:
-        if total_sims < len(answers):
-            generated = answers[:]
-            shuffle(generated)
-            generated = generated[:total_sims]
-        else:
-            generated += [ans for ans in WORST_ANSWERS if ans in answers]
-            generated += [ans for ans in answers if ans not in WORST_ANSWERS]
-    elif total_sims < max_sims:
-        while len(generated) < total_sims:
-            answer_list = ','.join(sample(answers, session.num_boards))
-            if answer_list not in generated:
-                generated.append(answer_list)
-    else:
-        generated = [','.join(c) for c in
-                     combinations(answers, session.num_boards)]
-    total_sims = len(generated)
+    workers = get_workers() if workers is None else workers
+    base_seed = randrange(2 ** 32) if seed is None else seed
     scores = {}
     failures = []
     starting = str(session.starters)[1:-1]
     if show:
         print("Simulating {} unique games{}...".format(
-            len(generated),
+            total_sims,
             '' if starting == '' else ' with starting word(s) ' + starting)
         )
-    for answer_list in tqdm(generated, ascii=PROGRESS,
-                            leave=False, disable=not show):
-        simulated_answers = answer_list.split(',')
-        result = solve_wordle(session.copy(), simulated_guess,
-                              simulated_response)
-        score = -8
-        if result.solved == simulated_answers:
-            score = session.num_boards + 5
-            score -= len(result.entered) + len(result.unentered_answers)
-        if score < best and return_if_worse:
-            return score, score
-        if score not in scores:
-            scores[score] = 0
-        if score < 0:
-            failures.append(answer_list)
-        scores[score] += 1
+    template = (session.num_boards, session.answers, session.guesses,
+                session.saved_best, session.freq, session.starters,
+                session.mode)
+    tasks = ((chunk, base_seed + index, best, return_if_worse)
+             for index, chunk in enumerate(generate_games(
+                 session.answers, session.num_boards, total_sims, seed=seed,
+                 stratified=stratified)))
+    if workers > 1 and get_response_matrix() is not None:
+        results = map_workers(_simulate_chunk, tasks, workers, best, template)
+    else:  # play every chunk in this process
+        results = (_simulate_chunk(task, template) for task in tasks)
+    progress = progress_bar(total=total_sims, ascii=PROGRESS, leave=False,
+                            disable=not show)
+    for chunk_scores, chunk_failures, pruned in results:
+        progress.update(sum(chunk_scores.values()))
+        failures += chunk_failures
+        if return_if_worse and shared_bound() is not None:
+            best = max(best, shared_bound())  # found by any other worker
+        if pruned or (return_if_worse and min(chunk_scores) < best):
+            progress.close()
+            results.close()
+            worst = min(chunk_scores)
+            return ((None, worst, failures) if return_failures
+                    else (None, worst))
+        for score, count in chunk_scores.items():
+            scores[score] = scores.get(score, 0) + count
+    progress.close()
     avg = sum(score * count for score, count in scores.items()) / total_sims
     worst = min(scores.keys())
     if show:
@@ -651,7 +804,191 @@ def simulate(session: SessionInfo, total_sims: int = 0, best: int = -8,
                 print('{:^7d}|{:^7d}| {:<.4f}'.format(score, count, 100 *
                                                       count / total_sims))
         print("\nAVERAGE = {:.2f}".format(avg))
+        cache = get_guess_cache()
+        if cache is not None:
+            print("CACHE = {} hits, {} misses".format(cache.hits,
+                                                      cache.misses))
         if len(failures) < 64:
             print("FAILURES = {}".format(str(failures)))
         print()
-    return avg, worst
+    return (avg, worst, failures) if return_failures else (avg, worst)
+
+
+def sweep_starters(session: SessionInfo, starters: list[str], *,
+                   workers: Optional[int] = None,
+                   results_path: Optional[str] = None, resume: bool = False,
+                   show: bool = True) -> tuple[int, list[str]]:
+    """Finds the starting words with the best worst-case score.
+
+    Every starter is simulated against every possible answer, but each
+    simulation stops as soon as it scores worse than the best worst-case
+    score found so far. With more than one worker, starters are simulated at
+    the same time, and this best score is shared by every worker process.
+
+    Args:
+        session:
+            A SessionInfo instance holding the answers, guesses, and game mode
+            to use for every simulation
+        starters:
+            The list of starting words to test, ideally with the most
+            promising ones first
+
+    Keyword Args:
+        workers:
+            The number of processes used to test starters in parallel, or None
+            to use the value of `get_workers` (default: None)
+        results_path:
+            The path of a file where the result of each starter is saved as a
+            line of JSON as soon as it is known, or None to skip this
+            (default: None)
+        resume:
+            A boolean value representing whether to keep the results already
+            saved in `results_path` by an earlier sweep with the same answers,
+            guesses, number of boards, and game mode, and skip those starters
+            (default: False)
+        show:
+            A boolean value representing whether to show a PROGRESS bar
+            (default: True)
+
+    Returns:
+        A 2-tuple where the first element is the best worst-case score and the
+        second element is the list of starters which achieve it.
+    """
+    workers = get_workers() if workers is None else workers
+    template = (session.num_boards, session.answers, session.guesses,
+                session.saved_best, session.freq)
+    best_case = -8
+    best_start = []
+    results_file = None
+    if results_path is not None:
+        sweep_id = fingerprint([str(session.num_boards),
+                                str(session.mode.value & GameMode.MODE_MASK),
+                                fingerprint(session.answers),
+                                fingerprint(session.guesses)])
+        saved = _read_sweep_results(results_path, sweep_id) if resume else []
+        with open(results_path + '.tmp', 'w') as tmp:  # drop any cut-off line
+            tmp.write(''.join(dumps(line) + '\n' for line
+                              in [{'sweep': sweep_id}] + saved))
+        os.replace(results_path + '.tmp', results_path)
+        for result in saved:
+            if result.get('pruned', False):
+                continue  # never the best, since a better starter pruned it
+            if result['worst'] == best_case:
+                best_start.append(result['starter'])
+            elif result['worst'] > best_case:
+                best_case = result['worst']
+                best_start = [result['starter']]
+        done = set(result['starter'] for result in saved)
+        starters = [starter for starter in starters if starter not in done]
+        results_file = open(results_path, 'a')
+    if workers > 1 and get_response_matrix() is not None:
+        results = map_workers(_sweep_task, (([starter], session.mode, None)
+                                            for starter in starters),
+                              workers, best_case, template)
+    else:  # test every starter in this process
+        results = (_sweep_task(([starter], session.mode, best_case), template)
+                   for starter in starters)
+    try:
+        for starter, avg, worst, failures in progress_bar(
+                results, total=len(starters), ascii=PROGRESS,
+                disable=not show):
+            if results_file is not None:
+                if avg is None:  # only an upper bound of its worst is known
+                    result = {'starter': starter, 'worst': worst,
+                              'pruned': True}
+                else:
+                    result = {'starter': starter, 'average': avg,
+                              'worst': worst, 'failures': failures}
+                results_file.write(dumps(result) + '\n')
+                results_file.flush()
+                os.fsync(results_file.fileno())
+            if avg is None:
+                continue  # pruned by a starter with a better worst case
+            if worst == best_case:
+                best_start.append(starter)
+            elif worst > best_case:
+                best_case = worst
+                best_start = [starter]
+    finally:
+        if results_file is not None:
+            results_file.close()
+    return best_case, best_start
+
+
+def _read_sweep_results(path: str, sweep_id: str) -> list[dict]:
+    """Helper function for `sweep_starters` which reads every complete result
+    saved by an earlier sweep with the same `sweep_id`."""
+    try:
+        with open(path, 'r') as file:
+            lines = file.read().split('\n')
+    except FileNotFoundError:
+        return []
+    try:
+        if loads(lines[0]) != {'sweep': sweep_id}:
+            return []  # these results belong to a different sweep
+    except ValueError:
+        return []
+    results = []
+    for line in lines[1:]:
+        try:
+            results.append(loads(line))
+        except ValueError:
+            continue  # the last line may have been cut off
+    return results
+
+
+def _sweep_task(task: tuple, template: Optional[tuple] = None
+                ) -> tuple[str, Optional[float], int, list[str]]:
+    """Helper function for `sweep_starters` which tests one starter. The
+    average is None if the starter was pruned. In a worker process, the
+    `template` is the context given to `map_workers`."""
+    starters, mode, best = task
+    if template is None:
+        template = worker_context()
+    if best is None:  # use the best score found by any worker so far
+        best = shared_bound()
+    session = SessionInfo(*template, starters, mode)
+    avg, worst, failures = simulate(session, len(session.answers), best,
+                                    show=False, return_if_worse=True,
+                                    workers=1, return_failures=True)
+    if avg is not None:  # a pruned worst case is only an upper bound
+        raise_shared_bound(worst)
+    return starters[0], avg, worst, failures
+
+
+def _simulate_chunk(task: tuple, template: Optional[tuple] = None
+                    ) -> tuple[dict[int, int], list[str], bool]:
+    """Helper function for `simulate` which plays one chunk of games.
+
+    Every chunk uses its own random number generator made from its seed, so
+    the results do not depend on which process plays the chunk.
+    The last element returned is True if the chunk was pruned by a game
+    scoring worse than `best`. In a worker process, the `template` of every
+    session is the context given to `map_workers`, so it is only sent once.
+    """
+    games, seed, best, return_if_worse = task
+    if template is None:
+        template = worker_context()
+    rng = Random(seed)
+    scores = {}
+    failures = []
+    pruned = False
+    for answers in games:
+        if worker_cancelled():
+            break
+        if return_if_worse and shared_bound() is not None:
+            best = max(best, shared_bound())  # found by any other worker
+        session = SessionInfo(*template, rng=rng)
+        session.simulated = answers[:]
+        result = solve_wordle(session, simulated_guess, simulated_response)
+        score = -8
+        if result.solved == answers:
+            score = session.num_boards + 5
+            score -= len(result.entered) + len(result.unentered_answers)
+        scores[score] = scores.get(score, 0) + 1
+        if score < 0:
+            failures.append(','.join(answers))
+        if score < best and return_if_worse:
+            pruned = True
+            break
+    return scores, failures, pruned